@@ -9,26 +9,82 @@ of being relevant outside of this module.
 """
 
 
+import warnings
+
 import dash_html_components as html
 from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 from dash_building_blocks.util import (
-    generate_random_string,
-    decamelify
+    content_hash, generate_random_string,
+    decamelify, sessions_enabled
 )
 
 from dash_building_blocks.error import (
     ProhibitedParameterError
 )
+from dash_building_blocks.static import mark_static
+from dash_building_blocks import cancel
+from dash_building_blocks import debounce as _debounce
+from dash_building_blocks import dedup as _dedup
+from dash_building_blocks import memory as _memory
 
 class Data:
     r"""Convenience class that wraps a :class:`dict` object so keys may be
-    accessed as attributes.
+    accessed as attributes. Instances are slotted, and the wrapped
+    dictionary is only allocated once a key is set.
 
     :param \**kwargs: Keyword arguments are set as class attributes.
     """
+    __slots__ = ('_values', '_hash')
+
     def __init__(self, **kwargs):
-        self.__dict__.update(kwargs)
-        
+        object.__setattr__(self, '_values', kwargs or None)
+        object.__setattr__(self, '_hash', None)
+
+
+    def __getattr__(self, key):
+        values = object.__getattribute__(self, '_values')
+        try:
+            return values[key]
+        except (KeyError, TypeError):
+            raise AttributeError(key) from None
+
+
+    def __setattr__(self, key, val):
+        self.to_dict()[key] = val
+        object.__setattr__(self, '_hash', None)
+
+
+    def __delattr__(self, key):
+        try:
+            del self.to_dict()[key]
+        except KeyError:
+            raise AttributeError(key) from None
+        object.__setattr__(self, '_hash', None)
+
+
+    @property
+    def __dict__(self):
+        return self.to_dict()
+
+
+    def __reduce__(self):
+        return self.__class__.from_dict, (dict(self._values or {}),)
+
+
+    def content_hash(self):
+        """Hash the data with :func:`~dash_building_blocks.util
+        .content_hash`. The hash is cached until an attribute is set, so
+        values held by the data must not be mutated in place.
+
+        :return: The hexadecimal digest.
+        :rtype: str
+        """
+        if self._hash is None:
+            object.__setattr__(self, '_hash',
+                               content_hash(self._values or {}))
+        return self._hash
+
 
     @classmethod
     def from_dict(cls, d):
@@ -48,7 +104,9 @@ class Data:
         :return: The converted dictionary.
         :rtype: dict
         """
-        return self.__dict__
+        if self._values is None:
+            object.__setattr__(self, '_values', {})
+        return self._values
         
 
     def __getitem__(self, key):
@@ -60,15 +118,109 @@ class Data:
     
 
     def __repr__(self):
-        return repr(self.to_dict())
+        return repr(self._values or {})
     
 
     def __bool__(self):
-        return bool(self.__dict__)
+        return bool(self._values)
 
         
+def _dependencies(kind, args, kwargs):
+    """Collect the dependencies of type *kind* passed to ``app.callback``,
+    whether as lists or flat arguments.
+    """
+    deps = []
+    for arg in list(args) + list(kwargs.values()):
+        for dep in (arg if isinstance(arg, (list, tuple)) else [arg]):
+            if isinstance(dep, kind):
+                deps.append(dep)
+    return deps
+
+
+def _with_state(args, kwargs, extra):
+    """Append the *extra* state dependencies to the arguments of
+    ``app.callback``, whether given as lists or flat arguments.
+    """
+    args, kwargs = list(args), dict(kwargs)
+    if 'state' in kwargs:
+        kwargs['state'] = list(kwargs['state']) + list(extra)
+    elif len(args) > 2 and isinstance(args[2], (list, tuple)):
+        args[2] = list(args[2]) + list(extra)
+    elif 'inputs' in kwargs or \
+            len(args) == 2 and isinstance(args[1], (list, tuple)):
+        kwargs['state'] = list(extra)
+    else:
+        args.extend(extra)
+    return args, kwargs
+
+
+def _hashable(component_id):
+    # pattern-matching ids are dicts
+    if isinstance(component_id, dict):
+        return tuple(sorted(component_id.items()))
+    return component_id
+
+
+class DependencyCache:
+    """Interning cache for the Dash dependency objects handed out by a
+    :class:`Block`. Dependencies are keyed by ``(global id, property, kind)``
+    where *kind* is one of :class:`dash.dependencies.Output`,
+    :class:`dash.dependencies.Input`, :class:`dash.dependencies.State` or
+    :class:`tuple`, so building callbacks for thousands of blocks allocates
+    each dependency only once.
+    """
+    __slots__ = ('_entries', '_components')
+
+    def __init__(self):
+        self._entries = {}
+        self._components = {}
+
+
+    def get(self, component_id, component_property, kind):
+        """Get the interned dependency, creating it on first access.
+
+        :param component_id: The globally unique component id, a :class:`str`\
+        or a pattern-matching :class:`dict`.
+        :param str component_property: The component property.
+        :param type kind: The dependency class, or :class:`tuple` for plain\
+        ``(component_id, component_property)`` pairs.
+        :return: The interned dependency object.
+        """
+        key = (_hashable(component_id), component_property, kind)
+        try:
+            return self._entries[key]
+        except KeyError:
+            if kind is tuple:
+                dep = (component_id, component_property)
+            else:
+                dep = kind(component_id, component_property)
+            self._entries[key] = dep
+            return dep
+
+
+    def component(self, component_id):
+        """Get the interned :class:`Component` for *component_id*.
+
+        :param str component_id: The globally unique component id.
+        :return: The interned component wrapper.
+        :rtype: Component
+        """
+        key = _hashable(component_id)
+        try:
+            return self._components[key]
+        except KeyError:
+            comp = self._components[key] = Component(component_id)
+            return comp
+
+
+    def __len__(self):
+        return len(self._entries) + len(self._components)
+
+
 class Component:
     """The Component class. """
+    __slots__ = ('id',)
+
     def __init__(self, id):
         self.id = id
         
@@ -100,11 +252,26 @@ class Block:
     :func:`~dash_building_blocks.util.generate_random_string`.
     :param \**kwargs: Extra keyword arguments are processed by\
     :meth:`parameters`.
+
+    Set the :attr:`static` class attribute (or pass ``static=True``) when the
+    layout only depends on :attr:`data`; its serialized JSON is then cached
+    by :func:`~dash_building_blocks.static.serve_static_layout`.
+
+    Set the :attr:`profile_threshold` class attribute to override, for the
+    block, the latency threshold in seconds of the profiler passed to
+    :meth:`callback`.
     """
-    sacred_attrs = ['app', 'data', 'class_id', 'ids', 'layout', '_uid']
+    static = False
+    profile_threshold = None
+    sacred_attrs = ['app', 'data', 'class_id', 'ids', 'layout', '_uid',
+                    '_dependencies', '_limits']
 
     def __init__(self, app=None, data=None, id=None, **kwargs):
 
+        tracker = _memory.active
+        if tracker is not None:
+            before = tracker.traced()
+
         if id is None:
             self._uid = generate_random_string(16)
         else:
@@ -114,9 +281,17 @@ class Block:
         self.data = Data.from_dict(data)
         self.class_id = self.class_id()
         self.ids = {'this': self._determine_this_id(self.class_id, self._uid)}
+        self._dependencies = DependencyCache()
+        self._limits = []
         
         self.parameters(**kwargs)
         self.layout = self.layout()
+        if self.static and self.layout is not None:
+            mark_static(self.layout)
+        if self._limits:
+            _debounce.apply_to_layout(self.layout, self._limits)
+        if tracker is not None:
+            tracker.track_init(self, before)
         
     @property
     def id(self):
@@ -182,10 +357,78 @@ class Block:
         raise NotImplementedError
 
 
-    def callback(self, *args, **kwargs):
+    def callback(self, *args, cache=None, latest_wins=False, dedup=False,
+                 tracer=None, profiler=None, **kwargs):
         """Convenience method that acts as an alias for :attr:`app.callback`
+        
+        :param cache: If provided, a\
+        :class:`~dash_building_blocks.cache.SharedCache` caching the results\
+        of the callback, tagged with the block :attr:`class_id` and :attr:`id`.
+        :param bool latest_wins: Whether newer invocations of the callback\
+        for the same client make older ones stale, see\
+        :mod:`~dash_building_blocks.cancel`. Warns unless\
+        :func:`~dash_building_blocks.util.enable_sessions` was called for\
+        the app, as the tabs of a browser are then the same client.
+        :param bool dedup: Whether to send ``dash.no_update`` instead of\
+        output values equal to the current values on the client, see\
+        :mod:`~dash_building_blocks.dedup`.
+        :param tracer: If provided, a\
+        :class:`~dash_building_blocks.trace.Tracer` opening a span per\
+        invocation, continuing the traces of traced store items passed as\
+        arguments.
+        :param profiler: If provided, a\
+        :class:`~dash_building_blocks.profiling.SlowProfiler` dumping\
+        profiles of the invocations slower than :attr:`profile_threshold`.
+
+        Inputs created with ``debounce`` or ``throttle`` settings (see\
+        :meth:`input`) make the callback coalesce bursts of requests.
         """
-        return self.app.callback(*args, **kwargs)
+        outputs = kwargs.get('output', args[0] if args else None)
+        multi = isinstance(outputs, (list, tuple))
+        if latest_wins and not sessions_enabled(self.app):
+            warnings.warn(
+                'latest_wins callback of block {!r} registered without '
+                'enable_sessions(app): the tabs of a browser supersede each '
+                'other.'.format(self.id), UserWarning, stacklevel=2)
+        if dedup:
+            args, kwargs = _with_state(args, kwargs, _dedup.current_state(
+                outputs if multi else [outputs]))
+        register = self.app.callback(*args, **kwargs)
+        limit = _debounce.find_limit(_dependencies(Input, args, kwargs))
+        if cache is None and not latest_wins and not dedup and \
+                tracer is None and profiler is None and limit is None and \
+                _memory.active is None:
+            return register
+
+        namespace = '{}:{}'.format(self.id, outputs)
+
+        def deco(func):
+            if cache is not None:
+                func = cache.memoize(
+                    '{}.{}'.format(self.id, func.__name__),
+                    tags=[self.class_id, self.id]
+                )(func)
+            if latest_wins:
+                func = cancel.latest_wins(namespace)(func)
+            if profiler is not None:
+                func = profiler.wrap(self.id, func.__name__,
+                                     self.profile_threshold)(func)
+            if limit is not None:
+                func = _debounce.RateLimiter(*limit).wrap(namespace)(func)
+            if _memory.active is not None:
+                func = _memory.active.wrap(self)(func)
+            if tracer is not None:
+                func = tracer.traced(
+                    '{}.{}'.format(self.id, func.__name__),
+                    attributes={'block.class_id': self.class_id,
+                                'block.id': self.id,
+                                'callback': func.__name__}
+                )(func)
+            if dedup:
+                func = _dedup.unchanged(len(outputs) if multi else None)(func)
+            return register(func)
+
+        return deco
         
         
     def callbacks(self):
@@ -215,7 +458,7 @@ class Block:
     
     
     def __getitem__(self, key):
-        return Component(self.ids[key])
+        return self._dependencies.component(self.ids[key])
     
     
     def __call__(self, component_id, property_id=None):
@@ -226,7 +469,8 @@ class Block:
         if property_id is None:
             return self.ids[component_id]
         else:
-            return self[component_id][property_id]
+            return self._dependencies.get(
+                self.ids[component_id], property_id, tuple)
     
     
     def output(self, component_id, component_property='children'):
@@ -240,10 +484,12 @@ class Block:
         :param str component_property: The component property.
         :return: The :class:`dash.dependencies.Output` dependency object.
         """
-        return self[component_id].output(component_property)
+        return self._dependencies.get(
+            self.ids[component_id], component_property, Output)
     
     
-    def input(self, component_id, component_property='children'):
+    def input(self, component_id, component_property='children',
+              debounce=None, throttle=None):
         """Create the :class:`dash.dependencies.Input` dependency with
         :attr:`component_id`
         equal to the globally unique component id mapped from the 
@@ -252,9 +498,31 @@ class Block:
         :param str component_id: The registered component id,\
         local to the block.
         :param str component_property: The component property.
-        :return: The :class:`dash.dependencies.Input` dependency object.
+        :param float debounce: If provided, the window in seconds within\
+        which bursts of changes only trigger the callback once, see\
+        :mod:`~dash_building_blocks.debounce`. Components with a\
+        ``debounce`` property are debounced by the browser instead, which\
+        for :class:`dash_core_components.Input` means on Enter or blur,\
+        regardless of the window. Windows kept on the server need a\
+        threaded server.
+        :param float throttle: If provided, the minimum time in seconds\
+        between two computations of the callback.
+        :return: The :class:`dash.dependencies.Input` dependency object,\
+        a new :class:`~dash_building_blocks.debounce.LimitedInput` with\
+        *debounce* or *throttle*.
         """
-        return self[component_id].input(component_property)
+        dep = self._dependencies.get(
+            self.ids[component_id], component_property, Input)
+        if debounce is not None:
+            dep = _debounce.limited(dep, _debounce.DEBOUNCE, debounce)
+        elif throttle is not None:
+            dep = _debounce.limited(dep, _debounce.THROTTLE, throttle)
+        else:
+            return dep
+        self._limits.append(dep)
+        if debounce is not None and 'layout' in self.__dict__:
+            _debounce.apply_to_layout(self.layout, [dep])
+        return dep
     
     
     def state(self, component_id, component_property='children'):
@@ -268,9 +536,36 @@ class Block:
         :param str component_property: The component property.
         :return: The :class:`dash.dependencies.State` dependency object.
         """
-        return self[component_id].state(component_property)
+        return self._dependencies.get(
+            self.ids[component_id], component_property, State)
     
     
+def format_version(version, digest):
+    """Format the value of the version div of a versioned
+    :class:`Store` item.
+
+    :param int version: The version.
+    :param str digest: The content hash.
+    :rtype: str
+    """
+    return '{}:{}'.format(version, digest)
+
+
+def parse_version(value):
+    """Parse the value of the version div of a versioned :class:`Store`
+    item.
+
+    :param str value: The value, as produced by :func:`format_version`.
+    :return: The ``(version, content hash)`` pair, ``(0, '')`` if *value*\
+    is empty.
+    :rtype: tuple
+    """
+    if not value:
+        return 0, ''
+    version, _, digest = value.partition(':')
+    return int(version), digest
+
+
 class Store:
     """The Store class streamlines the creation and use of hidden storage
     divs. The interface is similar to that of :class:`Block`\ s but slightly
@@ -279,30 +574,44 @@ class Store:
     :param dash.Dash app: The Dash app object.
     :param str id: The id unique to the store object.
     :param bool hide: Whether or not to hide the layout of the store object.
+    :param bool static: Whether or not the layout is static, in which case it\
+    is built and serialized only once until another item is registered.
     """
-    def __init__(self, app, id='', hide=True):
+    def __init__(self, app, id='', hide=True, static=False):
         
         self.app = app
         self._uid = id
         self.ids = {'this': self._uid}
         self.items = {}
+        self.versioned = set()
         self.hide = hide
+        self.static = static
+        self._static_layout = None
         
         
     @property
     def layout(self):
         """The layout containing divs for all registered data items.
         """
+        if self._static_layout is not None:
+            return self._static_layout
+
         style = {'display': 'none'} if self.hide else None
-        return html.Div([
+        layout = html.Div([
             html.Div([html.Div('{}: '.format(id),
                                style={'fontWeight': 'bold'}),
-                      html.Div(initially, id=self.ids[id])])
+                      html.Div(initially, id=self.ids[id])] +
+                     self._version_layout(id, initially))
             for id, initially in self.items.items()
         ], style=style)
+
+        if self.static:
+            self._static_layout = mark_static(layout)
+        return layout
         
         
     def _register(self, id):
+        self._static_layout = None
         prefix = self.ids['this']
         prefix = (prefix + '-') if prefix else prefix
         global_id = prefix + id
@@ -310,7 +619,15 @@ class Store:
         return global_id
 
     
-    def register(self, local_id, inputs=None, state=None, initially=''):
+    def _version_layout(self, local_id, initially):
+        if local_id not in self.versioned:
+            return []
+        return [html.Div(format_version(0, content_hash(initially)),
+                         id=self.ids[local_id] + '-version')]
+
+
+    def register(self, local_id, inputs=None, state=None, initially='',
+                 cache=None, versioned=False, tracer=None):
         """Register a *local_id* to be internally mapped to a globally unique
         id. If *inputs* is provided, it will return a decorator function that
         mediates the *inputs* and *state* to an :meth:`app.callback`
@@ -346,21 +663,87 @@ class Store:
         :param list(dash.dependency.State) state: The Dash state\
         dependencies to the callback that updates the div with *local_id*.
         :param initially: The initial value in the created div with *local_id*
+        :param cache: If provided, a\
+        :class:`~dash_building_blocks.cache.SharedCache` caching the results\
+        of the callback, tagged with the globally unique id.
+        :param bool versioned: Whether to keep the version and content hash\
+        of the item in a companion div, see :meth:`version`. Values whose\
+        hash is unchanged are then not sent again.
+        :param tracer: If provided, a\
+        :class:`~dash_building_blocks.trace.Tracer` opening a span per\
+        invocation. The item value then carries the trace context, see\
+        :mod:`~dash_building_blocks.trace`.
         """
         global_id = self._register(local_id)
         self.items[local_id] = initially
+        if versioned:
+            self.versioned.add(local_id)
+        else:
+            self.versioned.discard(local_id)
         if inputs is None:
             return global_id
         else:
             state = state or []
             def deco(cbfunc):
-                self.app.callback(
-                    self.output(local_id), inputs, state
-                )(cbfunc)
+                cbfunc = self._wrap_producer(global_id, cbfunc, cache=cache)
+                if versioned:
+                    cbfunc = self._wrap_versioned(cbfunc)
+                if tracer is not None:
+                    cbfunc = tracer.traced(
+                        global_id, attributes={'store.item': global_id},
+                        envelope=0 if versioned else True
+                    )(cbfunc)
+                if versioned:
+                    self.app.callback(
+                        [self.output(local_id),
+                         Output(global_id + '-version', 'children')],
+                        inputs, list(state) + [
+                            State(global_id + '-version', 'children')]
+                    )(cbfunc)
+                else:
+                    self.app.callback(
+                        self.output(local_id), inputs, state
+                    )(cbfunc)
 
             return deco
+
+
+    def _wrap_versioned(self, cbfunc):
+
+        def versioned(*args):
+            version, digest = parse_version(args[-1])
+            value = cbfunc(*args[:-1])
+            new_digest = content_hash(value)
+            if new_digest == digest:
+                raise PreventUpdate
+            return value, format_version(version + 1, new_digest)
+
+        versioned.__name__ = cbfunc.__name__
+        return versioned
     
     
+    def _wrap_producer(self, global_id, cbfunc, cache=None):
+        if cache is not None:
+            cbfunc = cache.memoize(global_id, tags=[global_id])(cbfunc)
+        return cbfunc
+
+
+    def version(self, local_id):
+        """Create the :class:`dash.dependencies.Input` dependency on the
+        version of a versioned item. Its value is a short
+        ``'<version>:<content hash>'`` string, see :func:`parse_version`,
+        whose version increases every time the value of the item changes.
+        Consumers may take it as input and the item itself as state, and key
+        their caches or early-exit checks on it instead of the value.
+
+        :param str local_id: The item id, local to the store.
+        :return: The :class:`dash.dependencies.Input` dependency object.
+        """
+        if local_id not in self.versioned:
+            raise KeyError('Store item {!r} is not versioned'.format(local_id))
+        return Input(self.ids[local_id] + '-version', 'children')
+
+
     def get(self, local_id):
         """Get the globally unique id mapped from **key**, the local id,
         tupled with the ``'children'`` string.
@@ -0,0 +1,142 @@
+"""The :mod:`~dash_building_blocks.batch` module provides the :class:`Batch`
+class, which serves many blocks subscribed to the same inputs with a single
+multi-output callback. Inputs are decoded once by an optional preamble, and
+the handlers of the subscribed blocks run concurrently in a thread pool
+within that one request.
+::
+
+    batch = Batch(app, inputs=[Input('date-filter', 'value')])
+
+    @batch.preamble
+    def parse(value):
+        return pd.Timestamp(value)
+
+    for graph in graphs:
+        batch.subscribe(graph.output('graph', 'figure'),
+                        state=[graph.state('dropdown', 'value')])(
+            graph.update_graph)
+
+    batch.callbacks()
+"""
+
+
+from concurrent.futures import ThreadPoolExecutor
+
+import dash
+import flask
+from dash.exceptions import PreventUpdate
+
+
+def _copy_request_context(func):
+    # dash.callback_context reads flask.g, which belongs to the app context
+    # that copy_current_request_context does not carry over
+    g_values = dict(vars(flask.g._get_current_object()))
+
+    @flask.copy_current_request_context
+    def contextual(*args):
+        vars(flask.g._get_current_object()).update(g_values)
+        return func(*args)
+
+    return contextual
+
+
+class Batch:
+    """Combined callback of the outputs subscribed to shared inputs.
+
+    :param dash.Dash app: The Dash app object.
+    :param list(dash.dependencies.Input) inputs: The shared inputs.
+    :param list(dash.dependencies.State) state: The shared state.
+    :param int max_workers: The size of the thread pool running the\
+    handlers. If 1, handlers run sequentially in the request thread.
+    """
+    def __init__(self, app, inputs, state=None, max_workers=8):
+        self.app = app
+        self.inputs = list(inputs)
+        self.state = list(state or [])
+        self.max_workers = max_workers
+        self.subscribers = []
+        self._preamble = None
+        self._executor = None
+
+
+    def preamble(self, func):
+        """Decorator registering the function that turns the shared input
+        and state values into the arguments of every handler. It runs once
+        per request and must return a tuple.
+        """
+        self._preamble = func
+        return func
+
+
+    def subscribe(self, output, state=None):
+        """Decorator subscribing the handler of *output*. The handler
+        receives the shared arguments followed by its own *state* values.
+
+        :param dash.dependencies.Output output: The output of the handler.
+        :param list(dash.dependencies.State) state: The state dependencies\
+        of the handler.
+        :return: The decorator.
+        """
+        def deco(func):
+            self.subscribers.append((func, output, list(state or [])))
+            return func
+
+        return deco
+
+
+    def _run(self, func, args):
+        try:
+            return func(*args)
+        except PreventUpdate:
+            return dash.no_update
+
+
+    def execute(self, *args):
+        """Run every handler for the shared and per-handler values *args*,
+        ordered like the dependencies of the combined callback.
+
+        :return: The output values, ``dash.no_update`` for the handlers that\
+        raised :class:`dash.exceptions.PreventUpdate`.
+        :rtype: list
+        """
+        n_shared = len(self.inputs) + len(self.state)
+        shared, own = args[:n_shared], args[n_shared:]
+        if self._preamble is not None:
+            shared = tuple(self._preamble(*shared))
+
+        calls = []
+        for func, _, state in self.subscribers:
+            calls.append((func, shared + own[:len(state)]))
+            own = own[len(state):]
+
+        if self.max_workers == 1 or len(calls) == 1:
+            values = [self._run(func, call_args) for func, call_args in calls]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers)
+            contextual = flask.has_request_context()
+            futures = []
+            for func, call_args in calls:
+                run = self._run
+                if contextual:
+                    run = _copy_request_context(run)
+                futures.append(self._executor.submit(run, func, call_args))
+            values = [future.result() for future in futures]
+
+        if all(value is dash.no_update for value in values):
+            raise PreventUpdate
+        return values
+
+
+    def callbacks(self):
+        """Register the combined callback. Call it once every handler has
+        subscribed.
+        """
+        if not self.subscribers:
+            return
+        self.app.callback(
+            [output for _, output, _ in self.subscribers],
+            self.inputs,
+            self.state + [dep for _, _, state in self.subscribers
+                          for dep in state]
+        )(self.execute)
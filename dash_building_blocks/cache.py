@@ -0,0 +1,230 @@
+"""The :mod:`~dash_building_blocks.cache` module provides the
+:class:`SharedCache` class, a callback result cache backed by a local
+`SQLite <https://www.sqlite.org>`_ file. Every worker process on a host that
+opens the same file shares the cached results, so a block output computed
+by one gunicorn worker is reused by the others.
+::
+
+    cache = SharedCache('/tmp/dbb-cache.sqlite', ttl=300)
+
+    @block.callback(block.output('graph', 'figure'),
+                    [block.input('dropdown', 'value')],
+                    cache=cache)
+    def update_graph(value):
+        ...
+
+    cache.invalidate(block.class_id)
+"""
+
+
+import functools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from dash_building_blocks.util import content_hash
+
+_MISSING = object()
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+);
+CREATE INDEX IF NOT EXISTS tags_key ON tags (key);
+'''
+
+
+def make_key(namespace, args, kwargs=None):
+    """Build the cache key of a call from its *namespace* and arguments.
+
+    :param str namespace: The namespace, typically naming the callback.
+    :param tuple args: The positional arguments of the call.
+    :param dict kwargs: The keyword arguments of the call.
+    :return: The cache key.
+    :rtype: str
+    """
+    return '{}:{}'.format(namespace, content_hash((args, kwargs or {})))
+
+
+class SharedCache:
+    """Cache of pickled values stored in a SQLite file shared by all the
+    processes that open it.
+
+    :param str path: The path of the SQLite file.
+    :param int max_size: The maximum total size in bytes of the cached\
+    values. Least recently used entries are evicted beyond it.
+    :param float ttl: The default time to live of entries in seconds. If\
+    None, entries do not expire.
+    """
+    def __init__(self, path, max_size=256 * 2 ** 20, ttl=None):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+
+    def _connect(self):
+        # connections must not cross threads or forked worker processes
+        pid = os.getpid()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != pid:
+            conn = sqlite3.connect(self.path, timeout=30,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = pid
+        return conn
+
+
+    def get(self, key, default=None):
+        """Get the value cached under *key*.
+
+        :param str key: The cache key.
+        :param default: The value returned on a miss or expired entry.
+        :return: The cached value.
+        """
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT value, expires FROM entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return default
+        value, expires = row
+        if expires is not None and expires <= now:
+            self.delete(key)
+            return default
+        conn.execute('UPDATE entries SET accessed = ? WHERE key = ?',
+                     (now, key))
+        return pickle.loads(value)
+
+
+    def set(self, key, value, ttl=None, tags=()):
+        """Cache *value* under *key*.
+
+        :param str key: The cache key.
+        :param value: The picklable value.
+        :param float ttl: The time to live in seconds, overriding the cache\
+        default.
+        :param list(str) tags: The tags that can later be passed to\
+        :meth:`invalidate` to drop this entry.
+        """
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else now + ttl
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        conn = self._connect()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                (key, blob, len(blob), expires, now))
+            conn.executemany('INSERT OR IGNORE INTO tags VALUES (?, ?)',
+                             [(str(tag), key) for tag in tags])
+            self._evict(conn, now)
+
+
+    def _evict(self, conn, now):
+        expired = [key for key, in conn.execute(
+            'SELECT key FROM entries WHERE expires <= ?', (now,))]
+        self._delete_keys(conn, expired)
+
+        total, = conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()
+        if total <= self.max_size:
+            return
+        evicted = []
+        for key, size in conn.execute(
+                'SELECT key, size FROM entries ORDER BY accessed'):
+            if total <= self.max_size:
+                break
+            evicted.append(key)
+            total -= size
+        self._delete_keys(conn, evicted)
+
+
+    @staticmethod
+    def _delete_keys(conn, keys):
+        rows = [(key,) for key in keys]
+        conn.executemany('DELETE FROM entries WHERE key = ?', rows)
+        conn.executemany('DELETE FROM tags WHERE key = ?', rows)
+
+
+    def delete(self, key):
+        """Drop the entry cached under *key*, if any.
+
+        :param str key: The cache key.
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            self._delete_keys(conn, [key])
+
+
+    def invalidate(self, *tags):
+        """Drop every entry tagged with any of *tags*.
+
+        :param \\*tags: The tags, e.g. a block :attr:`class_id` or the name\
+        of a data source.
+        :return: The number of dropped entries.
+        :rtype: int
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            keys = {key for tag in tags for key, in conn.execute(
+                'SELECT key FROM tags WHERE tag = ?', (str(tag),))}
+            self._delete_keys(conn, keys)
+        return len(keys)
+
+
+    def clear(self):
+        """Drop every entry."""
+        conn = self._connect()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM entries')
+            conn.execute('DELETE FROM tags')
+
+
+    def __len__(self):
+        count, = self._connect().execute(
+            'SELECT COUNT(*) FROM entries').fetchone()
+        return count
+
+
+    def memoize(self, namespace, tags=(), ttl=None):
+        """Decorator caching the results of a callback function under
+        *namespace*, keyed by its arguments.
+
+        :param str namespace: The namespace of the cached results.
+        :param list(str) tags: The tags of the cached results.
+        :param float ttl: The time to live in seconds.
+        :return: The decorator.
+        """
+        def deco(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = make_key(namespace, args, kwargs)
+                value = self.get(key, _MISSING)
+                if value is _MISSING:
+                    value = func(*args, **kwargs)
+                    self.set(key, value, ttl=ttl, tags=tags)
+                return value
+            return wrapper
+        return deco
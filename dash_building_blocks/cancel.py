@@ -0,0 +1,130 @@
+"""The :mod:`~dash_building_blocks.cancel` module implements latest-wins
+cancellation of block callbacks. Each invocation of a callback registered
+with ``latest_wins=True`` takes a new generation number for its block,
+outputs and client; older invocations still running become stale. A stale
+invocation bails out at the next :func:`checkpoint` it reaches, and its
+result is dropped instead of being serialized.
+::
+
+    @block.callback(block.output('graph', 'figure'),
+                    [block.input('slider', 'value')],
+                    latest_wins=True)
+    def update_graph(value):
+        for chunk in chunks:
+            checkpoint()
+            ...
+
+Generations are counted per worker process, so only invocations served by
+the same worker supersede each other, and are forgotten once the latest one
+finishes. Clients are told apart by
+:func:`~dash_building_blocks.util.client_key`: per browser session, or per
+tab once :func:`~dash_building_blocks.util.enable_sessions` is called.
+Without it, the tabs of a browser supersede each other and a tab may keep
+an outdated output, so registering a latest-wins callback of a
+:class:`~dash_building_blocks.base.Block` warns if the app does not enable
+sessions first.
+"""
+
+
+import functools
+import itertools
+import threading
+
+from dash_building_blocks.error import StaleCallbackError
+from dash_building_blocks.util import client_key
+
+
+class Generations:
+    """Thread-safe latest generations of arbitrary hashable keys, numbered
+    from a single counter. Only keys with a generation running are kept.
+    """
+
+    def __init__(self):
+        self._latest = {}
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+
+    def __len__(self):
+        return len(self._latest)
+
+
+    def next(self, key):
+        """Start a new generation for *key*, superseding older ones.
+
+        :return: The new generation number.
+        :rtype: int
+        """
+        with self._lock:
+            generation = next(self._counter)
+            self._latest[key] = generation
+            return generation
+
+
+    def is_current(self, key, generation):
+        """Whether *generation* is still the latest one of *key*."""
+        return self._latest.get(key) == generation
+
+
+    def finish(self, key, generation):
+        """End *generation* of *key*, forgetting the key if it was the
+        latest one.
+
+        :return: Whether *generation* was the latest one.
+        :rtype: bool
+        """
+        with self._lock:
+            if self._latest.get(key) != generation:
+                return False
+            del self._latest[key]
+            return True
+
+
+generations = Generations()
+
+_local = threading.local()
+
+
+def is_stale():
+    """Whether the callback invocation running in this thread was superseded
+    by a newer one. Always False outside of latest-wins callbacks.
+    """
+    current = getattr(_local, 'current', None)
+    return current is not None and not generations.is_current(*current)
+
+
+def checkpoint():
+    """Bail out of the running callback invocation if it is stale.
+
+    :raises StaleCallbackError: If the invocation was superseded. It is a\
+    :class:`dash.exceptions.PreventUpdate`, so no response is sent.
+    """
+    if is_stale():
+        raise StaleCallbackError('Callback invocation was superseded')
+
+
+def latest_wins(namespace):
+    """Decorator making invocations of a callback function supersede the
+    older ones of the same *namespace* and client.
+
+    :param str namespace: The namespace, typically naming the block and\
+    the outputs of the callback.
+    :return: The decorator.
+    """
+    def deco(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (namespace, client_key())
+            generation = generations.next(key)
+            previous = getattr(_local, 'current', None)
+            _local.current = (key, generation)
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                _local.current = previous
+                current = generations.finish(key, generation)
+            if not current:
+                raise StaleCallbackError('Callback invocation was superseded')
+            return result
+        return wrapper
+    return deco
@@ -0,0 +1,234 @@
+"""The :mod:`~dash_building_blocks.container` module lets callbacks add and
+remove blocks without resending the layout of the blocks already shown,
+with Dash 2.9 or later. Pattern-matching ids require Dash 1.11 or later.
+
+A :class:`PatternBlock` registers pattern-matching ids, so the callbacks of
+its class serve every instance, including instances created by a callback
+long after the app started. A :class:`Container` builds the partial
+updates of its ``children`` that append, insert or remove one such block.
+::
+
+    class Panel(PatternBlock):
+
+        def layout(self):
+            return html.Div([dcc.Dropdown(id=self.register('dropdown')),
+                             dcc.Graph(id=self.register('graph'))])
+
+        def callbacks(self):
+            @self.callback(self.output('graph', 'figure'),
+                           [self.input('dropdown', 'value')])
+            def update_graph(value):
+                ...
+
+    first = Panel(app, id='0')
+    first.callbacks()
+    container = Container(app, children=[first])
+
+    @app.callback(container.output('children'),
+                  [Input('add', 'n_clicks')],
+                  [container.state('children')])
+    def add_panel(n_clicks, children):
+        return container.append(Panel(app, id=str(n_clicks)), children)
+"""
+
+
+import functools
+
+import dash
+import dash_html_components as html
+from dash.dependencies import MATCH, Input, Output, State
+
+from dash_building_blocks.base import Block
+
+
+def _once_per_app(callbacks):
+    @functools.wraps(callbacks)
+    def wrapper(self):
+        registered = PatternBlock._registered.setdefault(type(self), set())
+        if self.app is None or id(self.app) in registered:
+            return None
+        registered.add(id(self.app))
+        return callbacks(self)
+    return wrapper
+
+
+class PatternBlock(Block):
+    """Block whose registered ids are the pattern-matching ids
+    ``{'type': '<class_id>-<local_id>', 'index': <block uid>}``.
+
+    Its :meth:`output`, :meth:`input` and :meth:`state` dependencies match
+    the same component in every instance of the class, so the callbacks of
+    the class are registered once per app: calling :meth:`callbacks` on
+    further instances does nothing.
+    """
+    _registered = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'callbacks' in cls.__dict__:
+            cls.callbacks = _once_per_app(cls.__dict__['callbacks'])
+
+
+    def register(self, local_id, global_id=None, ext=''):
+        """Register a *local_id* to be mapped to *global_id*. If global_id
+        is not provided, it is the pattern-matching id
+        ``{'type': '<class_id>-<local_id>', 'index': <block uid>}``, with
+        ``'-<ext>'`` appended to the type if *ext* is not empty.
+
+        :param str local_id: The localized id that is unique in the scope of\
+        the block.
+        :param global_id: The globally unique id.
+        :param str ext: An extension to be appended to the type.
+        :return: The globally unique id.
+        """
+        if global_id is None:
+            if ext:
+                ext = '-' + str(ext)
+            global_id = {'type': '{}-{}{}'.format(self.class_id, local_id, ext),
+                         'index': self._uid}
+        self.ids.update({local_id: global_id})
+        return global_id
+
+
+    def _match(self, component_id):
+        global_id = self.ids[component_id]
+        if isinstance(global_id, dict):
+            return dict(global_id, index=MATCH)
+        return global_id
+
+
+    def output(self, component_id, component_property='children'):
+        """Create the :class:`dash.dependencies.Output` dependency matching
+        the component registered as *component_id* in every instance.
+        """
+        return self._dependencies.get(
+            self._match(component_id), component_property, Output)
+
+
+    # pylint: disable=W0221
+    def input(self, component_id, component_property='children'):
+        """Create the :class:`dash.dependencies.Input` dependency matching
+        the component registered as *component_id* in every instance.
+        """
+        return self._dependencies.get(
+            self._match(component_id), component_property, Input)
+
+
+    def state(self, component_id, component_property='children'):
+        """Create the :class:`dash.dependencies.State` dependency matching
+        the component registered as *component_id* in every instance.
+        """
+        return self._dependencies.get(
+            self._match(component_id), component_property, State)
+
+
+class Container(Block):
+    """Block holding a list of blocks, registered as ``'children'``, whose
+    updates only carry the block that is added or removed.
+
+    With Dash versions providing :class:`dash.Patch` (2.9 and later),
+    :meth:`append`, :meth:`insert` and :meth:`remove` return a patch of the
+    ``children`` property, and only the added block travels. Older versions
+    have no partial updates: the methods return the updated list, built
+    from the current children passed as state, so the whole ``children``
+    is uploaded with the request and sent back. Only the layouts of the
+    other blocks are not rebuilt on the server.
+
+    :param list(Block) children: The initial blocks.
+    """
+    # pylint: disable=W0221
+    def parameters(self, children=None):
+        self.blocks = list(children or [])
+        self.patch = getattr(dash, 'Patch', None)
+
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div([self.item(block) for block in self.blocks],
+                        id=self.register('children'))
+
+
+    def item(self, block):
+        """Wrap the layout of *block* into the container item identified by
+        the block uid.
+
+        :param Block block: The block.
+        :rtype: dash_html_components.Div
+        """
+        return html.Div(block.layout,
+                        id={'type': self.id + '-item', 'index': block._uid})
+
+
+    def _update(self, children, edit):
+        if self.patch is not None:
+            patch = self.patch()
+            edit(patch)
+            return patch
+        if children is None:
+            raise ValueError('The current children must be passed as state '
+                             'when dash.Patch is not available')
+        children = list(children)
+        edit(children)
+        return children
+
+
+    def append(self, block, children=None):
+        """Build the update appending *block*.
+
+        :param Block block: The block to add.
+        :param list children: The current children, from\
+        ``container.state('children')``. Not needed with :class:`dash.Patch`.
+        :return: The update of the ``children`` property.
+        """
+        return self._update(children, lambda items: items.append(
+            self.item(block)))
+
+
+    def insert(self, index, block, children=None):
+        """Build the update inserting *block* at *index*.
+
+        :param int index: The position of the new block.
+        :param Block block: The block to add.
+        :param list children: The current children.
+        :return: The update of the ``children`` property.
+        """
+        return self._update(children, lambda items: items.insert(
+            index, self.item(block)))
+
+
+    def remove(self, block, children=None):
+        """Build the update removing *block*, given as a block, a block uid
+        or a position.
+
+        :param block: The block to remove.
+        :param list children: The current children. Required to find the\
+        position of a block or uid.
+        :return: The update of the ``children`` property.
+        """
+        if isinstance(block, int):
+            index = block
+        else:
+            uid = block._uid if isinstance(block, Block) else block
+            index = self.index(uid, children)
+
+        def edit(items):
+            del items[index]
+
+        return self._update(children, edit)
+
+
+    def index(self, uid, children):
+        """Find the position of the block with *uid* in *children*.
+
+        :param str uid: The block uid.
+        :param list children: The current children.
+        :rtype: int
+        """
+        for index, child in enumerate(children or []):
+            if isinstance(child, dict):
+                child_id = child.get('props', {}).get('id')
+            else:
+                child_id = getattr(child, 'id', None)
+            if isinstance(child_id, dict) and child_id.get('index') == uid:
+                return index
+        raise ValueError('No block with uid {!r} in the container'.format(uid))
@@ -0,0 +1,342 @@
+"""The :mod:`~dash_building_blocks.dataset` module provides the
+:class:`DatasetBlock` virtual class for blocks browsing datasets larger than
+memory. A :class:`Dataset` is a directory of ``.npy`` column files opened as
+memory maps, so the rows a callback slices out of a :class:`DatasetView` are
+the only ones paged in from disk. :class:`ColumnIndex`\\ es, built once and
+stored next to the columns, answer range and equality filters without
+scanning the column. Building an index sorts its column in memory once; every
+later lookup only reads the pages it needs.
+::
+
+    Dataset.write('/data/trades', time=times, price=prices)
+
+    class Trades(DatasetBlock):
+
+        def layout(self):
+            return dcc.Graph(id=self.register('graph'))
+
+        def callbacks(self):
+            @self.app.callback(self.output('graph', 'figure'),
+                               [self.input('range', 'value')])
+            def update_graph(value):
+                view = self.view().where('time', *value)[::10]
+                return {'data': [{'x': view['time'], 'y': view['price']}]}
+
+    trades = Trades(app, {'dataset': '/data/trades'})
+
+Requires NumPy, installed with the ``data`` extra.
+"""
+
+
+import json
+import os
+import threading
+import uuid
+
+import numpy as np
+
+from dash_building_blocks.base import Block
+
+
+_INDEX_SUFFIXES = ('.perm.npy', '.sorted.npy', '.index.json')
+
+
+def _save_atomic(path, array):
+    # concurrent workers must never map a half-written file
+    temp = '{}.{}.tmp'.format(path, uuid.uuid4().hex)
+    try:
+        with open(temp, 'wb') as f:
+            np.save(f, array)
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class ColumnIndex:
+    """Sorted index over one column of a :class:`Dataset`, stored as two
+    memory-mapped files: the sort permutation and the sorted values. The
+    files are rebuilt if the column file changed since they were built.
+
+    Building the index sorts the whole column in memory, so the column
+    must fit in memory once, when the index is first built.
+
+    :param Dataset dataset: The dataset.
+    :param str column: The indexed column.
+    """
+    def __init__(self, dataset, column):
+        self.column = column
+        perm_path = dataset.path_of(column, '.perm.npy')
+        sorted_path = dataset.path_of(column, '.sorted.npy')
+        stamp_path = dataset.path_of(column, '.index.json')
+        stamp = _stamp(dataset.path_of(column))
+
+        try:
+            with open(stamp_path) as f:
+                valid = json.load(f) == stamp and \
+                    os.path.exists(perm_path) and os.path.exists(sorted_path)
+        except (OSError, ValueError):
+            valid = False
+
+        if not valid:
+            values = np.asarray(dataset.column(column))
+            perm = np.argsort(values, kind='stable')
+            _save_atomic(perm_path, perm)
+            _save_atomic(sorted_path, values[perm])
+            temp = '{}.{}.tmp'.format(stamp_path, uuid.uuid4().hex)
+            with open(temp, 'w') as f:
+                json.dump(stamp, f)
+            os.replace(temp, stamp_path)
+
+        self.permutation = np.load(perm_path, mmap_mode='r')
+        self.sorted = np.load(sorted_path, mmap_mode='r')
+
+
+    def bounds(self, low=None, high=None, inclusive=(True, True)):
+        """Find the positions in :attr:`sorted` of the values between
+        *low* and *high*.
+
+        :param low: The lower bound, unbounded if None.
+        :param high: The upper bound, unbounded if None.
+        :param tuple(bool) inclusive: Whether each bound is inclusive.
+        :return: The ``(start, stop)`` positions.
+        """
+        start = 0 if low is None else np.searchsorted(
+            self.sorted, low, side='left' if inclusive[0] else 'right')
+        stop = len(self.sorted) if high is None else np.searchsorted(
+            self.sorted, high, side='right' if inclusive[1] else 'left')
+        return int(start), int(max(start, stop))
+
+
+    def range(self, low=None, high=None, inclusive=(True, True)):
+        """Find the rows with ``low <= value <= high``.
+
+        :param low: The lower bound, unbounded if None.
+        :param high: The upper bound, unbounded if None.
+        :param tuple(bool) inclusive: Whether each bound is inclusive.
+        :return: The sorted row numbers.
+        :rtype: numpy.ndarray
+        """
+        start, stop = self.bounds(low, high, inclusive)
+        return np.sort(self.permutation[start:stop])
+
+
+    def equal(self, value):
+        """Find the rows with ``value``.
+
+        :param value: The value.
+        :return: The sorted row numbers.
+        :rtype: numpy.ndarray
+        """
+        return self.range(value, value)
+
+
+class Dataset:
+    """Columnar dataset stored as a directory of ``<column>.npy`` files,
+    each opened as a read-only memory map.
+
+    Use :meth:`open` rather than the constructor to share the memory maps
+    and indexes between all the blocks reading the same directory.
+
+    :param str path: The dataset directory.
+    """
+    _opened = {}
+    _lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        self.columns = sorted(
+            name[:-len('.npy')] for name in os.listdir(path)
+            if name.endswith('.npy') and name.count('.') == 1
+        )
+        self._columns = {}
+        self._indexes = {}
+        lengths = {len(self.column(name)) for name in self.columns}
+        if len(lengths) > 1:
+            raise ValueError(
+                'Columns of dataset "{}" have different lengths: {}'
+                .format(path, sorted(lengths)))
+        self.length = lengths.pop() if lengths else 0
+
+
+    @classmethod
+    def open(cls, path):
+        """Open the dataset at *path*, reusing an already opened one.
+
+        :param str path: The dataset directory.
+        :rtype: Dataset
+        """
+        path = os.path.abspath(path)
+        with cls._lock:
+            if path not in cls._opened:
+                cls._opened[path] = cls(path)
+            return cls._opened[path]
+
+
+    @staticmethod
+    def write(path, **columns):
+        """Write *columns* as a dataset directory at *path*, replacing the
+        indexes of the rewritten columns. Datasets already opened at *path*
+        with :meth:`open` are reopened on their next :meth:`open`.
+
+        :param str path: The dataset directory, created if missing.
+        :param \\**columns: The column arrays, keyed by column name.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name, values in columns.items():
+            for suffix in _INDEX_SUFFIXES:
+                try:
+                    os.remove(os.path.join(path, name + suffix))
+                except FileNotFoundError:
+                    pass
+            _save_atomic(os.path.join(path, name + '.npy'), np.asarray(values))
+        with Dataset._lock:
+            Dataset._opened.pop(os.path.abspath(path), None)
+
+
+    def path_of(self, column, suffix='.npy'):
+        """The path of the file storing *column* with *suffix*."""
+        return os.path.join(self.path, column + suffix)
+
+
+    def column(self, name):
+        """Get the memory map of the column *name*.
+
+        :param str name: The column name.
+        :rtype: numpy.memmap
+        """
+        if name not in self._columns:
+            self._columns[name] = np.load(self.path_of(name), mmap_mode='r')
+        return self._columns[name]
+
+
+    def index(self, column):
+        """Get the :class:`ColumnIndex` of *column*, building it on first
+        access.
+
+        :param str column: The column name.
+        :rtype: ColumnIndex
+        """
+        with self._lock:
+            if column not in self._indexes:
+                self._indexes[column] = ColumnIndex(self, column)
+            return self._indexes[column]
+
+
+    def view(self):
+        """Get a :class:`DatasetView` of all the rows.
+
+        :rtype: DatasetView
+        """
+        return DatasetView(self, slice(0, self.length))
+
+
+    def __len__(self):
+        return self.length
+
+
+class DatasetView:
+    """Lazy selection of rows of a :class:`Dataset`. Slicing and filtering
+    only compose row selections; column data is read when a column is
+    accessed with ``view[column]``.
+
+    :param Dataset dataset: The dataset.
+    :param rows: The selected rows, as a :class:`slice` or an array of row\
+    numbers.
+    """
+    def __init__(self, dataset, rows):
+        self.dataset = dataset
+        self.rows = rows
+
+
+    def _row_numbers(self):
+        if isinstance(self.rows, slice):
+            return np.arange(*self.rows.indices(self.dataset.length))
+        return self.rows
+
+
+    def __len__(self):
+        if isinstance(self.rows, slice):
+            return len(range(*self.rows.indices(self.dataset.length)))
+        return len(self.rows)
+
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.dataset.column(key)[self.rows]
+        if isinstance(self.rows, slice) and isinstance(key, slice):
+            rows = range(*self.rows.indices(self.dataset.length))[key]
+            stop = rows.stop if rows.stop >= 0 else None
+            return DatasetView(self.dataset,
+                               slice(rows.start, stop, rows.step))
+        return DatasetView(self.dataset, self._row_numbers()[key])
+
+
+    def _select(self, rows):
+        if isinstance(self.rows, slice):
+            start, stop, step = self.rows.indices(self.dataset.length)
+            if step > 0:
+                mask = (rows >= start) & (rows < stop) & \
+                    ((rows - start) % step == 0)
+                return DatasetView(self.dataset, rows[mask])
+        return DatasetView(self.dataset, np.intersect1d(
+            self._row_numbers(), rows, assume_unique=True))
+
+
+    def where(self, column, low=None, high=None):
+        """Keep the rows with ``low <= column <= high``, using the index of
+        *column*.
+
+        :param str column: The column name.
+        :param low: The inclusive lower bound, unbounded if None.
+        :param high: The inclusive upper bound, unbounded if None.
+        :rtype: DatasetView
+        """
+        return self._select(self.dataset.index(column).range(low, high))
+
+
+    def equals(self, column, value):
+        """Keep the rows where *column* equals *value*, using the index of
+        *column*.
+
+        :param str column: The column name.
+        :param value: The value.
+        :rtype: DatasetView
+        """
+        return self._select(self.dataset.index(column).equal(value))
+
+
+    def to_dict(self, columns=None):
+        """Read the selected rows of *columns* into memory.
+
+        :param list(str) columns: The column names, all columns if None.
+        :return: The arrays, keyed by column name.
+        :rtype: dict
+        """
+        columns = self.dataset.columns if columns is None else columns
+        return {column: np.asarray(self[column]) for column in columns}
+
+
+class DatasetBlock(Block):
+    """The DatasetBlock virtual class. Its :attr:`data` must hold the
+    directory of the dataset under the ``dataset`` key, which is opened
+    with :meth:`Dataset.open` the first time :attr:`dataset` is accessed.
+    """
+
+    @property
+    def dataset(self):
+        """The opened :class:`Dataset` referenced by ``data.dataset``."""
+        return Dataset.open(self.data.dataset)
+
+
+    def view(self):
+        """Get a lazy :class:`DatasetView` of all the rows of the dataset.
+
+        :rtype: DatasetView
+        """
+        return self.dataset.view()
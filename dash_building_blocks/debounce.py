@@ -0,0 +1,196 @@
+"""The :mod:`~dash_building_blocks.debounce` module implements the
+``debounce`` and ``throttle`` settings of
+:meth:`~dash_building_blocks.base.Block.input` dependencies.
+::
+
+    @block.callback(block.output('results'),
+                    [block.input('query', 'value', debounce=0.3)])
+    def search(query):
+        ...
+
+A debounced input whose component has a ``debounce`` property, such as
+:class:`dash_core_components.Input`, gets it switched on, so the browser only
+sends the value once the user is done typing. For
+:class:`dash_core_components.Input` this means on Enter or when the input
+loses focus, whatever the window: a :class:`UserWarning` says so, and
+``throttle`` keeps a time window instead. For other components, bursts of
+requests from a client are coalesced on the server: every request waits for
+the end of its window and only the last one of the burst is computed, the
+others raising :class:`dash.exceptions.PreventUpdate`. Throttled inputs are
+computed at most once per window, always including the last value.
+
+Rate-limited inputs are :class:`LimitedInput` dependencies of their own,
+distinct from the shared dependency a block returns for the same property
+without a limit, and are kept by the block that created them, so creating
+blocks never scans other blocks.
+
+Server-side debounce and throttle wait in the request thread, so that the
+requests of a burst overlap and all but the last are dropped. They need a
+threaded server, such as the Flask development server or gunicorn with
+``--threads`` or the ``gthread`` worker class: on sync workers the requests
+of a burst are served one after the other, none is coalesced and each one
+holds a worker for the whole window.
+"""
+
+
+import functools
+import threading
+import time
+import warnings
+from collections import OrderedDict
+
+from dash.dependencies import Input
+from dash.exceptions import PreventUpdate
+
+from dash_building_blocks.cancel import Generations
+from dash_building_blocks.util import client_key
+
+
+DEBOUNCE = 'debounce'
+THROTTLE = 'throttle'
+
+class LimitedInput(Input):
+    """Input dependency with a rate limit.
+
+    :param component_id: The component id.
+    :param str component_property: The component property.
+    :param str mode: Either ``'debounce'`` or ``'throttle'``.
+    :param float window: The window in seconds.
+    """
+    def __init__(self, component_id, component_property, mode, window):
+        if mode not in (DEBOUNCE, THROTTLE):
+            raise ValueError('Unknown rate limit mode: {}'.format(mode))
+        super().__init__(component_id, component_property)
+        self.rate_limit = (mode, window)
+
+
+def limited(dep, mode, window):
+    """Create a rate-limited copy of an input dependency. *dep* itself is
+    left as it is, as it may be shared by other callbacks.
+
+    :param dash.dependencies.Input dep: The input dependency.
+    :param str mode: Either ``'debounce'`` or ``'throttle'``.
+    :param float window: The window in seconds.
+    :rtype: LimitedInput
+    """
+    return LimitedInput(dep.component_id, dep.component_property,
+                        mode, window)
+
+
+def get_limit(dep):
+    """Get the ``(mode, window)`` rate limit of an input dependency, or
+    None.
+    """
+    return getattr(dep, 'rate_limit', None)
+
+
+def find_limit(inputs):
+    """Find the rate limit applying to a callback with *inputs*. Debounced
+    inputs take precedence over throttled ones, then the widest window wins.
+
+    :param list(dash.dependencies.Input) inputs: The callback inputs.
+    :return: The ``(mode, window)`` pair, or None.
+    """
+    found = [limit for limit in map(get_limit, inputs) if limit is not None]
+    if not found:
+        return None
+    return max(found, key=lambda limit: (limit[0] == DEBOUNCE, limit[1]))
+
+
+def apply_to_layout(layout, deps):
+    """Switch on the ``debounce`` property of the components of *layout*
+    with debounced inputs among *deps*, where the component supports it.
+    Their inputs are then no longer coalesced on the server.
+
+    :param layout: The Dash layout.
+    :param deps: The rate-limited input dependencies of the block.
+    :return: The global ids of the components debounced client-side.
+    :rtype: set
+    """
+    debounced = set()
+    by_id = {}
+    for dep in deps:
+        limit = get_limit(dep)
+        if limit is not None and limit[0] == DEBOUNCE:
+            by_id.setdefault(dep.component_id, []).append(dep)
+    if not by_id or layout is None or not hasattr(layout, '_traverse'):
+        return debounced
+    for component in [layout] + list(layout._traverse()):
+        component_id = getattr(component, 'id', None)
+        if not isinstance(component_id, str) or component_id not in by_id or \
+                'debounce' not in getattr(component, '_prop_names', []):
+            continue
+        # the browser debounces, the server need not coalesce
+        component.debounce = True
+        debounced.add(component_id)
+        for dep in by_id.pop(component_id):
+            warnings.warn(
+                'Input {!r} of {} is debounced by the browser, which sends '
+                'its value on Enter or blur; the {}s window is ignored. Use '
+                'throttle for a time window.'.format(
+                    component_id, type(component).__name__,
+                    get_limit(dep)[1]), stacklevel=3)
+            dep.rate_limit = None
+    return debounced
+
+
+class RateLimiter:
+    """Server-side coalescing of the requests of each client.
+
+    :param str mode: Either ``'debounce'`` or ``'throttle'``.
+    :param float window: The window in seconds.
+    """
+    def __init__(self, mode, window):
+        self.mode = mode
+        self.window = window
+        self._generations = Generations()
+        self._last_run = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def _wait_turn(self, key):
+        if self.mode == DEBOUNCE:
+            time.sleep(self.window)
+            return
+        with self._lock:
+            last = self._last_run.get(key)
+        if last is not None:
+            time.sleep(max(0.0, last + self.window - time.monotonic()))
+
+
+    def _ran(self, key):
+        # called with the lock held; runs older than the window no longer
+        # delay anything, and are the first ones in order
+        now = time.monotonic()
+        self._last_run.pop(key, None)
+        self._last_run[key] = now
+        while True:
+            oldest, last = next(iter(self._last_run.items()))
+            if last + self.window > now:
+                break
+            del self._last_run[oldest]
+
+
+    def wrap(self, namespace):
+        """Decorator coalescing the calls of a callback function per
+        *namespace* and client.
+
+        :param str namespace: The namespace of the callback.
+        :return: The decorator.
+        """
+        def deco(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = (namespace, client_key())
+                generation = self._generations.next(key)
+                self._wait_turn(key)
+                with self._lock:
+                    if not self._generations.is_current(key, generation):
+                        raise PreventUpdate
+                    self._ran(key)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._generations.finish(key, generation)
+            return wrapper
+        return deco
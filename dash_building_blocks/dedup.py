@@ -0,0 +1,101 @@
+"""The :mod:`~dash_building_blocks.dedup` module implements the ``dedup``
+option of :meth:`~dash_building_blocks.base.Block.callback`. The current
+value of every output is passed to the callback as extra state, and a
+returned value equal to it is replaced by ``dash.no_update``, so it is
+neither sent back nor propagated to the callbacks depending on the output.
+::
+
+    @block.callback(block.output('content', 'style'),
+                    [block.input('tabs', 'value')],
+                    dedup=True)
+    def toggle(value):
+        return {'display': 'block' if value == 'a' else 'none'}
+
+The comparison is made against what the client currently shows, so it is
+correct for every client and tab without any state on the server. The cost
+is the upload of the current values with each request: dedup suits small
+outputs that often stay the same, such as styles, classes and labels.
+Store items, whose values can be large, are better registered with
+``versioned=True`` (see :meth:`~dash_building_blocks.base.Store.register`),
+which compares a content hash held by the client instead.
+The initial call of a callback, made when a page is loaded, always sends its
+values.
+"""
+
+
+import functools
+import json
+
+import dash
+from dash.dependencies import State
+from dash.exceptions import PreventUpdate
+from plotly.utils import PlotlyJSONEncoder
+
+from dash_building_blocks.trace import unwrap
+
+
+def current_state(outputs):
+    """Create the :class:`dash.dependencies.State` dependencies on the
+    current values of *outputs*, to pass after the other state of a
+    callback wrapped with :func:`unchanged`.
+
+    :param list(dash.dependencies.Output) outputs: The callback outputs.
+    :rtype: list(dash.dependencies.State)
+    """
+    return [State(output.component_id, output.component_property)
+            for output in outputs]
+
+
+def _initial_call():
+    import flask
+
+    if not flask.has_request_context():
+        return False
+    triggered = dash.callback_context.triggered
+    return not triggered or triggered[0]['prop_id'] == '.'
+
+
+def _same(value, current):
+    # values of traced store items are compared without their envelope
+    value, current = unwrap(value)[1], unwrap(current)[1]
+    if isinstance(value, (str, int, float, list, dict, type(None))) and \
+            value == current:
+        return True
+    try:
+        # the client holds the JSON form of what was sent
+        plain = json.loads(json.dumps(value, cls=PlotlyJSONEncoder))
+    except (TypeError, ValueError):
+        return False
+    return plain == current
+
+
+def unchanged(n_outputs=None):
+    """Decorator replacing the values of a callback function equal to the
+    current values of their outputs by ``dash.no_update``. The wrapped
+    function takes the current values, from :func:`current_state`, after
+    the arguments of the decorated function.
+
+    :param int n_outputs: The number of outputs of a callback with a list\
+    of outputs, or None for a single output.
+    :return: The decorator.
+    """
+    multi = n_outputs is not None
+    n_current = n_outputs if multi else 1
+
+    def deco(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            split = len(args) - n_current
+            result = func(*args[:split], **kwargs)
+            if _initial_call():
+                return result
+            values = list(result) if multi else [result]
+            deduped = [dash.no_update
+                       if value is not dash.no_update and _same(value, old)
+                       else value
+                       for value, old in zip(values, args[split:])]
+            if all(value is dash.no_update for value in deduped):
+                raise PreventUpdate
+            return deduped if multi else deduped[0]
+        return wrapper
+    return deco
@@ -0,0 +1,454 @@
+"""The :mod:`~dash_building_blocks.downsample` module reduces long series to
+about as many points as the graph has pixels, keeping their visual shape,
+and provides the :class:`DownsampledGraph` block, which resamples the
+visible range of its traces whenever the user zooms or pans.
+::
+
+    graph = DownsampledGraph(app, traces=[
+        {'x': df.index.values, 'y': df.Last.values, 'name': 'Last'}
+    ], width=800, figure_layout={'title': 'Prices'})
+    graph.callbacks()
+
+Two algorithms are available: :func:`lttb`, the Largest-Triangle-Three-
+Buckets algorithm, and :func:`minmax`, which keeps the extremes of every
+bucket. Above *webgl_threshold* points, traces are sent as ``scattergl``.
+
+Series too long to scan on every zoom are better served by a
+:class:`PyramidGraph`, which reads the min/max/mean aggregates of a
+:class:`Pyramid` built once per series, in memory or memory-mapped::
+
+    pyramid = Pyramid.open('/data/prices.pyramid', times, prices)
+    graph = PyramidGraph(app, traces=[{'pyramid': pyramid, 'name': 'Last'}])
+
+A pyramid on disk records a stamp of its series, and is rebuilt when opened
+with a series that changed since. Its files are replaced atomically, and
+its ``pyramid.json`` marker is written last, so workers opening it
+concurrently never map a half-written file.
+
+Requires NumPy, installed with the ``data`` extra.
+"""
+
+
+import json
+import os
+import uuid
+
+import dash_core_components as dcc
+import numpy as np
+from dash.exceptions import PreventUpdate
+
+from dash_building_blocks.base import Block
+from dash_building_blocks.dataset import _save_atomic
+from dash_building_blocks.util import content_hash
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype('int64').astype('float64')
+    return x.astype('float64')
+
+
+def _bucket_edges(n, n_buckets):
+    return np.linspace(1, n - 1, n_buckets + 1).astype('int64')
+
+
+def lttb(x, y, n_out):
+    """Select *n_out* points of a series with the Largest-Triangle-Three-
+    Buckets algorithm. The first and last points are always kept; every
+    bucket in between contributes the point forming the largest triangle
+    with the point kept in the previous bucket and the mean of the next.
+
+    :param x: The sorted x values, numeric or ``datetime64``.
+    :param y: The y values.
+    :param int n_out: The number of points kept, at least 3.
+    :return: The indices of the kept points.
+    :rtype: numpy.ndarray
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    xf, yf = _as_float(x), np.asarray(y, dtype='float64')
+    edges = _bucket_edges(n, n_out - 2)
+    # mean of every bucket, plus the last point as the bucket after the last
+    sums_x = np.add.reduceat(xf[:n - 1], edges[:-1])
+    sums_y = np.add.reduceat(yf[:n - 1], edges[:-1])
+    counts = np.diff(edges)
+    mean_x = np.append(sums_x / counts, xf[-1])
+    mean_y = np.append(sums_y / counts, yf[-1])
+
+    selected = np.empty(n_out, dtype='int64')
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        bx, by = xf[start:stop], yf[start:stop]
+        cx, cy = mean_x[bucket + 1], mean_y[bucket + 1]
+        area = np.abs((xf[a] - cx) * (by - yf[a]) -
+                      (xf[a] - bx) * (cy - yf[a]))
+        a = start + int(np.argmax(area))
+        selected[bucket + 1] = a
+    return selected
+
+
+def minmax(x, y, n_out):
+    """Select about *n_out* points of a series by keeping the minimum and
+    the maximum of every bucket, in x order, plus the first and last points.
+
+    :param x: The sorted x values.
+    :param y: The y values.
+    :param int n_out: The maximum number of points kept.
+    :return: The indices of the kept points.
+    :rtype: numpy.ndarray
+    """
+    n = len(y)
+    n_buckets = (n_out - 2) // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+    yf = np.asarray(y, dtype='float64')
+    size = (n - 2) // n_buckets
+    body = yf[1:1 + size * n_buckets].reshape(n_buckets, size)
+    offsets = 1 + np.arange(n_buckets) * size
+    lows = offsets + np.argmin(body, axis=1)
+    highs = offsets + np.argmax(body, axis=1)
+    # the points left over by the reshape join the last bucket
+    rest = 1 + size * n_buckets
+    if rest < n - 1:
+        tail = yf[rest:n - 1]
+        last = n_buckets - 1
+        if tail.min() < yf[lows[last]]:
+            lows[last] = rest + int(np.argmin(tail))
+        if tail.max() > yf[highs[last]]:
+            highs[last] = rest + int(np.argmax(tail))
+    return np.unique(np.concatenate(([0, n - 1], lows, highs)))
+
+
+#: The downsampling algorithms, by name.
+ALGORITHMS = {'lttb': lttb, 'minmax': minmax}
+
+
+def visible_range(relayout_data):
+    """Read the x range shown by a graph from its ``relayoutData``.
+
+    :param dict relayout_data: The ``relayoutData`` of the graph.
+    :return: The ``(low, high)`` bounds, None for an autoranged axis, or\
+    False if the x axis did not change.
+    """
+    if not relayout_data or relayout_data.get('xaxis.autorange') or \
+            relayout_data.get('autosize'):
+        return None
+    if 'xaxis.range[0]' in relayout_data:
+        return (relayout_data['xaxis.range[0]'],
+                relayout_data['xaxis.range[1]'])
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'])
+    return False
+
+
+def _bound(x, value):
+    if np.issubdtype(np.asarray(x).dtype, np.datetime64) and \
+            isinstance(value, str):
+        return np.datetime64(value.replace(' ', 'T'))
+    return value
+
+
+class DownsampledGraph(Block):
+    """Graph block showing long series downsampled to its width.
+
+    :param list(dict) traces: The traces, with sorted ``x`` and ``y``\
+    arrays and any other trace attributes.
+    :param int width: The number of points sent per trace, typically the\
+    width of the graph in pixels.
+    :param str method: The downsampling algorithm, ``'lttb'`` or\
+    ``'minmax'``.
+    :param int webgl_threshold: The number of points sent in a figure above\
+    which traces are rendered with WebGL.
+    :param dict figure_layout: The layout of the figure.
+    """
+    # pylint: disable=W0221
+    def parameters(self, traces=None, width=1000, method='lttb',
+                   webgl_threshold=5000, figure_layout=None):
+        self.traces = [dict(trace, x=np.asarray(trace['x']),
+                            y=np.asarray(trace['y']))
+                       for trace in traces or []]
+        self.width = width
+        self.method = method
+        self.webgl_threshold = webgl_threshold
+        # keep the zoom of the user across figure updates
+        self.figure_layout = dict(figure_layout or {}, uirevision=True)
+
+
+    # pylint: disable=E0202
+    def layout(self):
+        return dcc.Graph(id=self.register('graph'), figure=self.figure())
+
+
+    def resample(self, trace, low=None, high=None):
+        """Downsample the points of *trace* between *low* and *high*.
+
+        :param dict trace: The trace.
+        :param low: The lower x bound, unbounded if None.
+        :param high: The upper x bound, unbounded if None.
+        :return: The ``(x, y)`` arrays.
+        """
+        x, y = trace['x'], trace['y']
+        start = 0 if low is None else \
+            max(0, np.searchsorted(x, _bound(x, low), side='left') - 1)
+        stop = len(x) if high is None else \
+            np.searchsorted(x, _bound(x, high), side='right') + 1
+        x, y = x[start:stop], y[start:stop]
+        selected = ALGORITHMS[self.method](x, y, self.width)
+        return x[selected], y[selected]
+
+
+    def figure(self, low=None, high=None):
+        """Build the figure of the traces between *low* and *high*.
+
+        :rtype: dict
+        """
+        data = []
+        for trace in self.traces:
+            x, y = self.resample(trace, low, high)
+            data.append(dict(trace, x=x, y=y))
+        webgl = sum(len(trace['x']) for trace in data) > self.webgl_threshold
+        for trace in data:
+            if trace.get('type', 'scatter') in ('scatter', 'scattergl'):
+                trace['type'] = 'scattergl' if webgl else 'scatter'
+        return {'data': data, 'layout': self.figure_layout}
+
+
+    def update(self, relayout_data):
+        """The callback resampling the figure to the visible range."""
+        bounds = visible_range(relayout_data)
+        if bounds is False:
+            raise PreventUpdate
+        return self.figure(*(bounds or ()))
+
+
+    def callbacks(self):
+        self.callback(self.output('graph', 'figure'),
+                      [self.input('graph', 'relayoutData')])(self.update)
+
+
+class Pyramid:
+    """Multi-resolution aggregates of a series, built once: level 0 holds
+    the points themselves and every level above holds the ``min``, ``max``
+    and ``mean`` of *factor* consecutive buckets of the level below, at the
+    ``x`` of their first point. :meth:`window` picks the coarsest level
+    resolving a range to a given width and slices it, so its cost does not
+    depend on the length of the series.
+
+    Use :meth:`build` or :meth:`open` rather than the constructor.
+
+    :param list(dict) levels: The ``x``, ``min``, ``max`` and ``mean``\
+    arrays of every level.
+    :param int factor: The number of buckets aggregated per level.
+    """
+    _AGGREGATES = ('x', 'min', 'max', 'mean')
+
+    def __init__(self, levels, factor):
+        self.levels = levels
+        self.factor = factor
+
+
+    def __len__(self):
+        return len(self.levels[0]['x'])
+
+
+    @property
+    def x(self):
+        """The x values of the series."""
+        return self.levels[0]['x']
+
+
+    @property
+    def y(self):
+        """The y values of the series."""
+        return self.levels[0]['mean']
+
+
+    @classmethod
+    def build(cls, x, y, factor=4):
+        """Build the pyramid of a series in memory.
+
+        :param x: The sorted x values.
+        :param y: The y values.
+        :param int factor: The number of buckets aggregated per level.
+        :rtype: Pyramid
+        """
+        x, y = np.asarray(x), np.asarray(y)
+        levels = [{'x': x, 'min': y, 'max': y, 'mean': y}]
+        sums, size = y.astype('float64'), 1
+        while len(sums) > 1:
+            previous = levels[-1]
+            edges = np.arange(0, len(sums), factor)
+            size *= factor
+            sums = np.add.reduceat(sums, edges)
+            counts = np.minimum(size, len(y) - np.arange(len(sums)) * size)
+            levels.append({
+                'x': previous['x'][edges],
+                'min': np.minimum.reduceat(previous['min'], edges),
+                'max': np.maximum.reduceat(previous['max'], edges),
+                'mean': sums / counts
+            })
+        return cls(levels, factor)
+
+
+    @staticmethod
+    def stamp(x, y, factor=4):
+        """Compute the stamp identifying the pyramid of a series.
+
+        :param x: The sorted x values.
+        :param y: The y values.
+        :param int factor: The number of buckets aggregated per level.
+        :rtype: dict
+        """
+        return {'length': len(x), 'factor': factor,
+                'hash': content_hash((np.asarray(x), np.asarray(y)))}
+
+
+    def save(self, path, stamp=None):
+        """Write the pyramid as a directory of ``.npy`` files at *path*.
+        Every file is replaced atomically, and the ``pyramid.json`` marker
+        last.
+
+        :param str path: The directory, created if missing.
+        :param dict stamp: The :meth:`stamp` of the series, recorded in the\
+        marker.
+        """
+        os.makedirs(path, exist_ok=True)
+        for number, level in enumerate(self.levels):
+            for name in ('x', 'mean') if number == 0 else self._AGGREGATES:
+                _save_atomic(
+                    os.path.join(path, '{}.{}.npy'.format(number, name)),
+                    np.asarray(level[name]))
+        marker = os.path.join(path, 'pyramid.json')
+        temp = '{}.{}.tmp'.format(marker, uuid.uuid4().hex)
+        with open(temp, 'w') as f:
+            json.dump({'factor': self.factor, 'levels': len(self.levels),
+                       'stamp': stamp}, f)
+        os.replace(temp, marker)
+
+
+    @classmethod
+    def load(cls, path):
+        """Open the pyramid saved at *path*, with every level memory-mapped.
+
+        :param str path: The directory.
+        :rtype: Pyramid
+        """
+        with open(os.path.join(path, 'pyramid.json')) as f:
+            meta = json.load(f)
+        levels = []
+        for number in range(meta['levels']):
+            level = {}
+            for name in ('x', 'mean') if number == 0 else cls._AGGREGATES:
+                level[name] = np.load(
+                    os.path.join(path, '{}.{}.npy'.format(number, name)),
+                    mmap_mode='r')
+            if number == 0:
+                level['min'] = level['max'] = level['mean']
+            levels.append(level)
+        return cls(levels, meta['factor'])
+
+
+    @classmethod
+    def open(cls, path, x=None, y=None, factor=4):
+        """Open the pyramid saved at *path*, first building it from *x* and
+        *y* and saving it if missing, or if its stamp shows it was built
+        from another series or factor.
+
+        :param str path: The directory.
+        :param x: The sorted x values. If None, the saved pyramid is opened\
+        as it is.
+        :param y: The y values.
+        :param int factor: The number of buckets aggregated per level.
+        :rtype: Pyramid
+        """
+        try:
+            with open(os.path.join(path, 'pyramid.json')) as f:
+                saved = json.load(f).get('stamp')
+        except FileNotFoundError:
+            saved = False
+        if x is not None:
+            stamp = cls.stamp(x, y, factor)
+            if saved != stamp:
+                cls.build(x, y, factor).save(path, stamp)
+        return cls.load(path)
+
+
+    def window(self, low=None, high=None, width=1000):
+        """Slice the finest level showing the range between *low* and
+        *high* with at most *width* buckets, plus the buckets on either
+        side of it.
+
+        :param low: The lower x bound, unbounded if None.
+        :param high: The upper x bound, unbounded if None.
+        :param int width: The maximum number of buckets in the range.
+        :return: The level number and its sliced ``x``, ``min``, ``max`` and\
+        ``mean`` arrays.
+        """
+        x = self.x
+        low, high = _bound(x, low), _bound(x, high)
+        start = 0 if low is None else np.searchsorted(x, low, side='left')
+        stop = len(x) if high is None else \
+            np.searchsorted(x, high, side='right')
+        number = 0
+        while number + 1 < len(self.levels) and \
+                (stop - start) / self.factor ** number > width:
+            number += 1
+        level = self.levels[number]
+        start = 0 if low is None else max(
+            0, np.searchsorted(level['x'], low, side='left') - 1)
+        stop = len(level['x']) if high is None else \
+            np.searchsorted(level['x'], high, side='right') + 1
+        return number, {name: np.asarray(level[name][start:stop])
+                        for name in self._AGGREGATES}
+
+
+class PyramidGraph(DownsampledGraph):
+    """Graph block over series too long to scan on every zoom, which reads
+    their :class:`Pyramid` instead: a relayout only slices the visible
+    range of the level matching the width of the graph.
+
+    :param list(dict) traces: The traces, with sorted ``x`` and ``y``\
+    arrays or a ``pyramid``, and any other trace attributes.
+    :param int width: The maximum number of points sent per trace.
+    :param str aggregate: ``'minmax'`` to draw the extremes of every\
+    bucket, or ``'mean'`` to draw their means.
+    :param int factor: The number of buckets aggregated per level of the\
+    pyramids built from ``x`` and ``y``.
+    :param int webgl_threshold: The number of points sent in a figure above\
+    which traces are rendered with WebGL.
+    :param dict figure_layout: The layout of the figure.
+    """
+    # pylint: disable=W0221
+    def parameters(self, traces=None, width=1000, aggregate='minmax',
+                   factor=4, webgl_threshold=5000, figure_layout=None):
+        pyramids = []
+        for trace in traces or []:
+            pyramid = trace.get('pyramid')
+            if pyramid is None:
+                pyramid = Pyramid.build(trace['x'], trace['y'], factor)
+            pyramids.append(dict(trace, x=pyramid.x, y=pyramid.y,
+                                 pyramid=pyramid))
+        super().parameters(pyramids, width, None, webgl_threshold,
+                           figure_layout)
+        self.aggregate = aggregate
+
+
+    def resample(self, trace, low=None, high=None):
+        buckets = self.width // 2 if self.aggregate == 'minmax' else self.width
+        number, window = trace['pyramid'].window(low, high, buckets)
+        if number == 0 or self.aggregate == 'mean':
+            return window['x'], window['mean']
+        # both extremes of a bucket, drawn as a vertical segment at its x
+        return (np.repeat(window['x'], 2),
+                np.column_stack((window['min'], window['max'])).ravel())
+
+
+    def figure(self, low=None, high=None):
+        figure = super().figure(low, high)
+        for trace in figure['data']:
+            del trace['pyramid']
+        return figure
@@ -1,5 +1,14 @@
+from dash.exceptions import PreventUpdate
+
+
 class Error(Exception):
     """Error"""
 
 class ProhibitedParameterError(Error):
-    """ProhibitedParameterError"""
\ No newline at end of file
+    """ProhibitedParameterError"""
+
+class StaleCallbackError(Error, PreventUpdate):
+    """StaleCallbackError"""
+
+class SegmentMissingError(Error, PreventUpdate):
+    """SegmentMissingError"""
@@ -2,6 +2,7 @@ from dash.dependencies import Output, Input, State
 import dash_html_components as html
 import dash_core_components as dcc
 from dash_building_blocks.base import Block, Store
+from dash_building_blocks import dedup as _dedup
 import json
 
 
@@ -160,9 +161,10 @@ class Modal(Block):
 
 class Switch(Block):
 
-    def parameters(self, input, state=None):
+    def parameters(self, input, state=None, dedup=False):
         self.inputs = input
         self.states = state or []
+        self.dedup = dedup
         
     def layout(self):
         layout = html.Div(
@@ -241,9 +243,10 @@ class Switch(Block):
         )(update_data)
 
 
-        self.app.callback(
+        self.callback(
             self.output('current'),
-            [self.input('data')]
+            [self.input('data')],
+            dedup=self.dedup
         )(update_current)
     
     
@@ -274,7 +277,8 @@ def togglable(app,
               toggle_on=None,
               toggle_off=None,
               dependency='tabs',
-              init_hidden=False):
+              init_hidden=False,
+              dedup=False):
     
     if 'tabs' in dependency:
         assert(toggle_on or toggle_off)
@@ -340,4 +344,10 @@ def togglable(app,
         raise ValueError('Unknown dependency argument: {}\nKnown values for dependency: {}'
                          .format(dependency, ['tabs', 'tabs+button', 'button']))
 
-    app.callback(dependency_output, dependency_inputs)(toggle_content_display)
\ No newline at end of file
+    if dedup:
+        toggle_content_display = _dedup.unchanged()(toggle_content_display)
+        app.callback(dependency_output, dependency_inputs,
+                     _dedup.current_state([dependency_output])
+                     )(toggle_content_display)
+    else:
+        app.callback(dependency_output, dependency_inputs)(toggle_content_display)
\ No newline at end of file
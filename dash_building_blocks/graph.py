@@ -0,0 +1,283 @@
+"""The :mod:`~dash_building_blocks.graph` module provides blocks and helpers
+that keep :class:`dash_core_components.Graph` updates small.
+
+:class:`StreamingGraph` sends live data as ``extendData`` appends instead of
+whole figures:
+::
+
+    graph = StreamingGraph(app, max_points=5000,
+                           figure_layout={'title': 'Prices'})
+
+    @graph.stream([Input('interval', 'n_intervals')])
+    def update(n_intervals):
+        last = prices[-1000:]  # any window holding the new points
+        return [{'x': last.index, 'y': last.values, 'name': 'EUR'}]
+
+:class:`FigureTemplate` declares the static parts of a figure once, so
+callbacks only send the arrays that change:
+::
+
+    template = FigureTemplate({
+        'data': [{'type': 'scattergeo', 'mode': 'markers',
+                  'marker': {'size': 8, 'color': 'red'}}],
+        'layout': {'title': 'World Map'}
+    }, keys=('lon', 'lat'))
+
+    layout = template.graph(id=block.register('map'))
+
+    @app.callback(block.output('map', template.property), [...])
+    def update_map(location):
+        return template.update({'lon': [lon], 'lat': [lat]})
+"""
+
+
+import copy
+import json
+
+import dash
+import dash_core_components as dcc
+import dash_html_components as html
+from dash.exceptions import PreventUpdate
+from plotly.utils import PlotlyJSONEncoder
+
+from dash_building_blocks.base import Block
+
+
+def _plain(value):
+    return json.loads(json.dumps(value, cls=PlotlyJSONEncoder))
+
+
+class StreamingGraph(Block):
+    """Graph block streaming its traces with ``extendData``.
+
+    The decorated update function returns, for every trace, any window of
+    its series sorted by its first key that holds the new points: the full
+    history, a bounded ``deque`` or the last few points all work. The block
+    remembers, in a hidden cursor div of the client, the last value of the
+    first key sent for each trace and only sends the points beyond it. A
+    full ``figure`` is sent on the first update, when the number of traces
+    changes, when a series goes back before what was sent or when a *reset*
+    input fires.
+
+    :param tuple(str) keys: The data keys streamed for every trace.
+    :param int max_points: The maximum number of points kept per trace.
+    :param dict figure_layout: The layout of the figure.
+    """
+    # pylint: disable=W0221
+    def parameters(self, keys=('x', 'y'), max_points=1000,
+                   figure_layout=None):
+        self.keys = tuple(keys)
+        self.max_points = max_points
+        self.figure_layout = figure_layout or {}
+
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div([
+            dcc.Graph(
+                id=self.register('graph'),
+                figure={'data': [], 'layout': self.figure_layout}
+            ),
+            html.Div('', id=self.register('cursor'),
+                     style={'display': 'none'})
+        ])
+
+
+    def figure(self, traces):
+        """Build the full figure sent on reset, keeping the last
+        :attr:`max_points` points of every trace.
+
+        :param list(dict) traces: The traces.
+        :return: The figure.
+        :rtype: dict
+        """
+        data = [
+            dict(trace, **{key: trace[key][-self.max_points:]
+                           for key in self.keys})
+            for trace in traces
+        ]
+        return {'data': data, 'layout': self.figure_layout}
+
+
+    def _new_from(self, values, sent):
+        # position of the first value beyond *sent*, compared as JSON
+        # values so that dates match their serialized form in the cursor
+        low, high = 0, len(values)
+        if sent is None:
+            return low
+        while low < high:
+            middle = (low + high) // 2
+            if _plain(values[middle]) <= sent:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+    def extension(self, traces, cursor):
+        """Build the ``extendData`` update appending the points of *traces*
+        beyond *cursor*, or None if there are no new points.
+
+        :param list(dict) traces: The traces.
+        :param list cursor: The last value of the first key already sent for\
+        each trace, None for none.
+        :return: The ``[data, trace indices, max points]`` update.
+        """
+        data = {key: [] for key in self.keys}
+        indices = []
+        for index, (trace, sent) in enumerate(zip(traces, cursor)):
+            start = self._new_from(trace[self.keys[0]], sent)
+            length = len(trace[self.keys[0]])
+            if length > start:
+                indices.append(index)
+                for key in self.keys:
+                    # only the last max_points new points can be displayed
+                    data[key].append(
+                        trace[key][max(start, length - self.max_points):])
+        if not indices:
+            return None
+        return [data, indices, self.max_points]
+
+
+    def _cursor(self, traces, cursor=None):
+        cursor = cursor or [None] * len(traces)
+        return [_plain(trace[self.keys[0]][-1]) if len(trace[self.keys[0]])
+                else sent for trace, sent in zip(traces, cursor)]
+
+
+    def _needs_reset(self, traces, cursor):
+        if cursor is None or len(cursor) != len(traces):
+            return True
+        for trace, sent in zip(traces, cursor):
+            values = trace[self.keys[0]]
+            if len(values) and sent is not None and \
+                    _plain(values[-1]) < sent:
+                return True
+        return False
+
+
+    def stream(self, inputs, state=None, reset=None):
+        """Decorator registering the update function of the graph.
+
+        :param list(dash.dependencies.Input) inputs: The inputs triggering\
+        updates, typically the ``n_intervals`` of an interval component.
+        :param list(dash.dependencies.State) state: Extra state passed to\
+        the update function after the inputs.
+        :param list(dash.dependencies.Input) reset: Inputs that force a full\
+        figure update when they trigger the callback. Their values are not\
+        passed to the update function.
+        :return: The decorator.
+        """
+        state = state or []
+        reset = reset or []
+        reset_ids = {'{}.{}'.format(dep.component_id, dep.component_property)
+                     for dep in reset}
+        n_inputs = len(inputs)
+
+        def deco(func):
+
+            def update(*args):
+                cursor = json.loads(args[-1]) if args[-1] else None
+                args = args[:n_inputs] + args[n_inputs + len(reset):-1]
+                traces = func(*args)
+
+                triggered = {t['prop_id']
+                             for t in dash.callback_context.triggered}
+                if triggered & reset_ids or \
+                        self._needs_reset(traces, cursor):
+                    figure = self.figure(traces)
+                    extension = dash.no_update
+                    cursor = self._cursor(traces)
+                else:
+                    extension = self.extension(traces, cursor)
+                    if extension is None:
+                        raise PreventUpdate
+                    figure = dash.no_update
+                    cursor = self._cursor(traces, cursor)
+
+                return extension, figure, json.dumps(cursor)
+
+            self.callback(
+                [self.output('graph', 'extendData'),
+                 self.output('graph', 'figure'),
+                 self.output('cursor')],
+                list(inputs) + list(reset),
+                list(state) + [self.state('cursor')]
+            )(update)
+            return func
+
+        return deco
+
+
+class FigureTemplate:
+    """The static parts of a figure, declared once, whose data arrays are
+    updated without resending the rest of the figure.
+
+    With Dash versions providing :class:`dash.Patch`, :meth:`update` returns
+    a patch of the ``figure`` property. Otherwise it returns an
+    ``extendData`` update whose ``maxPoints`` equal the lengths of the new
+    arrays, which replaces the arrays of the updated traces in place. Use
+    :attr:`property` as the output property either way.
+
+    :param dict figure: The figure, with ``data`` holding the static\
+    attributes of every trace.
+    :param tuple(str) keys: The data keys updated by :meth:`update`.
+    """
+    def __init__(self, figure, keys=('x', 'y')):
+        self.figure = figure
+        self.keys = tuple(keys)
+        self.patch = getattr(dash, 'Patch', None)
+        self.property = 'figure' if self.patch is not None else 'extendData'
+
+
+    def render(self, *data):
+        """Build the full figure, e.g. for the initial layout.
+
+        :param \\*data: For every trace, a dict of its data arrays or None.
+        :return: The figure.
+        :rtype: dict
+        """
+        figure = copy.deepcopy(self.figure)
+        traces = figure.setdefault('data', [])
+        for index, trace in enumerate(traces):
+            update = data[index] if index < len(data) else None
+            for key in self.keys:
+                trace[key] = (update or {}).get(key, trace.get(key, []))
+        return figure
+
+
+    def graph(self, *data, **kwargs):
+        """Create the :class:`dash_core_components.Graph` showing the
+        template.
+
+        :param \\*data: Passed to :meth:`render`.
+        :param \\**kwargs: Passed to the graph component, e.g. ``id``.
+        :rtype: dash_core_components.Graph
+        """
+        return dcc.Graph(figure=self.render(*data), **kwargs)
+
+
+    def update(self, *data):
+        """Build the data-only update of :attr:`property`.
+
+        :param \\*data: For every trace, a dict of the new data arrays, or\
+        None to leave the trace unchanged.
+        :return: The update.
+        """
+        updated = [(index, values) for index, values in enumerate(data)
+                   if values is not None]
+
+        if self.patch is not None:
+            patch = self.patch()
+            for index, values in updated:
+                for key, value in values.items():
+                    patch['data'][index][key] = value
+            return patch
+
+        keys = [key for key in self.keys
+                if all(key in values for _, values in updated)]
+        extension = {key: [values[key] for _, values in updated]
+                     for key in keys}
+        max_points = {key: [len(values[key]) for _, values in updated]
+                      for key in keys}
+        return [extension, [index for index, _ in updated], max_points]
@@ -0,0 +1,270 @@
+"""The :mod:`~dash_building_blocks.loadtest` module replays the callbacks of
+an app the way the Dash renderer requests them, without a browser, to
+measure their throughput and latency.
+::
+
+    test = LoadTest(app, blocks=[graph, table], stores=[store],
+                    values={('dropdown', 'value'): ['EUR', 'USD']})
+    report = test.run(requests=1000, concurrency=8)
+    print(report)
+
+Requests go through the Flask test client of the app, or to a running
+server if a *url* is passed to :meth:`LoadTest.run`. Their input and state
+values are read from the layout of the app, unless *values* provides
+samples. Callbacks with pattern-matching dependencies are skipped.
+"""
+
+
+import itertools
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from plotly.utils import PlotlyJSONEncoder
+
+
+def _parse_outputs(output):
+    if output.startswith('..') and output.endswith('..'):
+        specs = output[2:-2].split('...')
+    else:
+        specs = [output]
+    return [tuple(spec.rsplit('.', 1)) for spec in specs]
+
+
+def layout_values(layout):
+    """Collect the property values of the components of *layout*.
+
+    :param layout: The layout, or the function returning it.
+    :return: The values keyed by ``(component id, property)``.
+    :rtype: dict
+    """
+    if callable(layout):
+        layout = layout()
+    values = {}
+    if layout is None or not hasattr(layout, '_traverse'):
+        return values
+    for component in [layout] + list(layout._traverse()):
+        component_id = getattr(component, 'id', None)
+        if not isinstance(component_id, str):
+            continue
+        for prop in getattr(component, '_prop_names', []):
+            values[(component_id, prop)] = getattr(component, prop, None)
+    return values
+
+
+class Target:
+    """A callback replayed by a :class:`LoadTest`.
+
+    :param str label: The label the statistics are reported under.
+    :param str output: The output key of the callback.
+    :param list(dict) inputs: The input dependencies.
+    :param list(dict) state: The state dependencies.
+    """
+    def __init__(self, label, output, inputs, state):
+        self.label = label
+        self.output = output
+        self.outputs = _parse_outputs(output)
+        self.inputs = inputs
+        self.state = state
+
+
+    def body(self, values):
+        """Build the request body of the callback.
+
+        :param dict values: Samples of the dependency values keyed by\
+        ``(component id, property)``: a list to pick from at random, a\
+        function called with no argument, or a value.
+        :rtype: dict
+        """
+        def resolve(dep):
+            value = values.get((dep['id'], dep['property']))
+            if isinstance(value, list):
+                value = random.choice(value) if value else None
+            elif callable(value):
+                value = value()
+            return dict(dep, value=value)
+
+        specs = [{'id': i, 'property': p} for i, p in self.outputs]
+        return {
+            'output': self.output,
+            'outputs': specs if self.output.startswith('..') else specs[0],
+            'inputs': [resolve(dep) for dep in self.inputs],
+            'state': [resolve(dep) for dep in self.state],
+            'changedPropIds': ['{id}.{property}'.format(**self.inputs[0])]
+            if self.inputs else []
+        }
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered)))
+                                      - 1))
+    return ordered[index]
+
+
+class Report:
+    """Statistics of a :meth:`LoadTest.run`, per label.
+
+    :param dict latencies: The latencies in seconds keyed by label.
+    :param dict errors: The number of failed requests keyed by label.
+    :param float elapsed: The wall time of the run in seconds.
+    """
+    def __init__(self, latencies, errors, elapsed):
+        self.latencies = latencies
+        self.errors = errors
+        self.elapsed = elapsed
+
+
+    def stats(self):
+        """Compute the statistics of every label: the number of
+        ``requests`` and ``errors``, the throughput ``rps`` and the ``mean``,
+        ``p50``, ``p90``, ``p99`` and ``max`` latencies in seconds.
+
+        :rtype: collections.OrderedDict
+        """
+        stats = OrderedDict()
+        for label, latencies in self.latencies.items():
+            ordered = sorted(latencies)
+            stats[label] = {
+                'requests': len(ordered),
+                'errors': self.errors.get(label, 0),
+                'rps': len(ordered) / self.elapsed if self.elapsed else None,
+                'mean': sum(ordered) / len(ordered) if ordered else None,
+                'p50': _percentile(ordered, 0.5),
+                'p90': _percentile(ordered, 0.9),
+                'p99': _percentile(ordered, 0.99),
+                'max': ordered[-1] if ordered else None
+            }
+        return stats
+
+
+    def __str__(self):
+        lines = ['{:<40} {:>8} {:>6} {:>9} {:>9} {:>9} {:>9}'.format(
+            'label', 'requests', 'errors', 'rps', 'p50 ms', 'p90 ms',
+            'p99 ms')]
+        for label, stat in self.stats().items():
+            lines.append('{:<40} {:>8} {:>6} {:>9.1f} {:>9.2f} {:>9.2f} '
+                         '{:>9.2f}'.format(
+                             label[:40], stat['requests'], stat['errors'],
+                             stat['rps'] or 0, (stat['p50'] or 0) * 1000,
+                             (stat['p90'] or 0) * 1000,
+                             (stat['p99'] or 0) * 1000))
+        return '\n'.join(lines)
+
+
+class LoadTest:
+    """Load test of the callbacks of a Dash app.
+
+    :param dash.Dash app: The Dash app object, with its layout set.
+    :param list(Block) blocks: The blocks whose callbacks are labeled with\
+    the block id.
+    :param list(Store) stores: The stores whose callbacks are labeled with\
+    the store item id.
+    :param dict values: Samples of the dependency values, see\
+    :meth:`Target.body`, overriding the values of the layout.
+    """
+    def __init__(self, app, blocks=(), stores=(), values=None):
+        self.app = app
+        self.values = layout_values(app.layout)
+        self.values.update(values or {})
+        self.targets = self._enumerate(blocks, stores)
+
+
+    def _label(self, component_id, blocks, stores):
+        for store in stores:
+            for local_id, global_id in store.ids.items():
+                if local_id != 'this' and global_id == component_id:
+                    return global_id
+        for block in blocks:
+            if component_id in block.ids.values():
+                return block.id
+        return None
+
+
+    def _enumerate(self, blocks, stores):
+        targets = []
+        for output, spec in self.app.callback_map.items():
+            deps = spec['inputs'] + spec['state']
+            if any(not isinstance(dep['id'], str) or dep['id'].startswith('{')
+                   for dep in deps) or '{' in output:
+                continue
+            component_id = _parse_outputs(output)[0][0]
+            label = self._label(component_id, blocks, stores)
+            if label is None:
+                if blocks or stores:
+                    continue
+                label = output
+            targets.append(Target(label, output, spec['inputs'],
+                                  spec['state']))
+        return targets
+
+
+    def _post_client(self, local, body):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = self.app.server.test_client()
+        response = client.post(
+            self.app.config.routes_pathname_prefix +
+            '_dash-update-component',
+            data=json.dumps(body, cls=PlotlyJSONEncoder),
+            content_type='application/json')
+        return response.status_code
+
+
+    def _post_url(self, url, body):
+        request = urllib.request.Request(
+            url.rstrip('/') + self.app.config.requests_pathname_prefix +
+            '_dash-update-component',
+            data=json.dumps(body, cls=PlotlyJSONEncoder).encode(),
+            headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+
+
+    def run(self, requests=100, concurrency=4, url=None):
+        """Send *requests* callback requests, cycling through the targets.
+
+        :param int requests: The total number of requests.
+        :param int concurrency: The number of concurrent clients.
+        :param str url: The root URL of a running server, to which the\
+        ``requests_pathname_prefix`` of the app is appended. If None, the\
+        Flask test client of the app is used.
+        :rtype: Report
+        """
+        local = threading.local()
+        latencies = OrderedDict((target.label, []) for target in self.targets)
+        errors = {}
+        lock = threading.Lock()
+
+        def send(target):
+            body = target.body(self.values)
+            start = time.perf_counter()
+            try:
+                if url is None:
+                    status = self._post_client(local, body)
+                else:
+                    status = self._post_url(url, body)
+            except Exception:
+                status = None
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[target.label].append(elapsed)
+                if status not in (200, 204):
+                    errors[target.label] = errors.get(target.label, 0) + 1
+
+        targets = itertools.islice(itertools.cycle(self.targets), requests) \
+            if self.targets else []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(send, targets))
+        return Report(latencies, errors, time.perf_counter() - start)
@@ -0,0 +1,226 @@
+"""The :mod:`~dash_building_blocks.memory` module attributes the memory
+retained by an app to the blocks that allocated it, using
+:mod:`tracemalloc`. Once a :class:`MemoryTracker` is installed, the memory
+retained by the initialization of every new block (layout included) and by
+every invocation of the callbacks registered through
+:meth:`~dash_building_blocks.base.Block.callback` is counted per block.
+::
+
+    tracker = MemoryTracker().install()
+    ...  # create blocks and register callbacks, serve requests
+
+    tracker.sample()
+    print(tracker.report(top=10))
+    print(tracker.growth())
+    print(tracker.leaks(app.layout))
+
+Retained memory is the growth of the memory traced while the block code
+ran, so allocations made concurrently by other threads blur it.
+"""
+
+
+import functools
+import gc
+import threading
+import time
+import tracemalloc
+import weakref
+
+
+#: The installed tracker, if any.
+active = None
+
+
+class _Record:
+    __slots__ = ('class_id', 'id', 'init', 'callbacks', 'calls', 'created',
+                 'ref')
+
+    def __init__(self, class_id, id, ref=None):
+        self.class_id = class_id
+        self.id = id
+        self.init = 0
+        self.callbacks = 0
+        self.calls = 0
+        self.created = time.time()
+        self.ref = ref
+
+
+class MemoryTracker:
+    """Per-block memory attribution.
+
+    :param int frames: The number of frames stored by :mod:`tracemalloc`\
+    for every allocation.
+    """
+    def __init__(self, frames=1):
+        self.frames = frames
+        self.records = {}
+        self.samples = []
+        self._lock = threading.Lock()
+        self._started = False
+
+
+    def install(self):
+        """Start tracing allocations, if needed, and make this the tracker
+        of new blocks and callbacks.
+
+        :return: The tracker itself.
+        """
+        global active
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+        active = self
+        return self
+
+
+    def uninstall(self):
+        """Stop tracking, and stop tracing if :meth:`install` started it."""
+        global active
+        if active is self:
+            active = None
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+
+    def traced(self):
+        """The size in bytes of the memory currently traced."""
+        return tracemalloc.get_traced_memory()[0]
+
+
+    def _record(self, block):
+        key = block.id
+        with self._lock:
+            record = self.records.get(key)
+            if record is None or record.ref is None or record.ref() is None:
+                record = self.records[key] = _Record(block.class_id, block.id)
+            return record
+
+
+    def track_init(self, block, before):
+        """Attribute the memory retained since *before* to the
+        initialization of *block*.
+
+        :param Block block: The initialized block.
+        :param int before: The traced memory before the initialization.
+        """
+        record = self._record(block)
+        record.ref = weakref.ref(block)
+        record.created = time.time()
+        record.init += self.traced() - before
+
+
+    def wrap(self, block):
+        """Decorator attributing the memory retained by the invocations of
+        a callback function to *block*.
+
+        :param Block block: The block of the callback.
+        :return: The decorator.
+        """
+        record = self._record(block)
+
+        def deco(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                before = self.traced()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    retained = self.traced() - before
+                    with self._lock:
+                        record.callbacks += retained
+                        record.calls += 1
+            return wrapper
+        return deco
+
+
+    def report(self, top=10):
+        """List the blocks retaining the most memory.
+
+        :param int top: The number of blocks listed.
+        :return: For every block, a dict with its ``class_id``, ``id``,\
+        ``init`` and ``callbacks`` bytes, ``total`` bytes, number of\
+        ``calls`` and whether it is still ``alive``.
+        :rtype: list(dict)
+        """
+        rows = []
+        with self._lock:
+            records = list(self.records.values())
+        for record in records:
+            rows.append({
+                'class_id': record.class_id, 'id': record.id,
+                'init': record.init, 'callbacks': record.callbacks,
+                'total': record.init + record.callbacks,
+                'calls': record.calls,
+                'alive': record.ref is not None and record.ref() is not None
+            })
+        rows.sort(key=lambda row: row['total'], reverse=True)
+        return rows[:top]
+
+
+    def by_class(self):
+        """Sum the retained memory of the blocks of every class.
+
+        :return: The retained bytes keyed by class id.
+        :rtype: dict
+        """
+        totals = {}
+        with self._lock:
+            records = list(self.records.values())
+        for record in records:
+            totals[record.class_id] = totals.get(record.class_id, 0) + \
+                record.init + record.callbacks
+        return totals
+
+
+    def sample(self):
+        """Record the retained memory of every class at the current time,
+        for :meth:`growth`.
+
+        :return: The ``(time, totals)`` sample.
+        """
+        sample = (time.time(), self.by_class())
+        self.samples.append(sample)
+        return sample
+
+
+    def growth(self):
+        """Compute the growth of the retained memory of every class between
+        the first and the last :meth:`sample`.
+
+        :return: The growth in bytes per second, keyed by class id, sorted\
+        by decreasing growth.
+        :rtype: list(tuple)
+        """
+        if len(self.samples) < 2:
+            return []
+        (start, first), (end, last) = self.samples[0], self.samples[-1]
+        elapsed = max(end - start, 1e-9)
+        rates = [(class_id, (total - first.get(class_id, 0)) / elapsed)
+                 for class_id, total in last.items()]
+        return sorted(rates, key=lambda rate: rate[1], reverse=True)
+
+
+    def leaks(self, layout):
+        """Flag the blocks still alive whose layout is no longer part of
+        *layout*, the layout currently served. Garbage is collected first.
+
+        :param layout: The current layout of the app.
+        :return: The ``(class_id, id)`` pairs of the flagged blocks.
+        :rtype: list(tuple)
+        """
+        gc.collect()
+        served = set()
+        if layout is not None and hasattr(layout, '_traverse'):
+            served = {id(component)
+                      for component in [layout] + list(layout._traverse())}
+        flagged = []
+        with self._lock:
+            records = list(self.records.values())
+        for record in records:
+            block = record.ref() if record.ref is not None else None
+            if block is None:
+                continue
+            if block.layout is not None and id(block.layout) not in served:
+                flagged.append((record.class_id, record.id))
+        return flagged
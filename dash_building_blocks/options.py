@@ -0,0 +1,106 @@
+"""The :mod:`~dash_building_blocks.options` module lets many dropdowns share
+one options list. The list is stored once in the layout, in a
+:class:`dash_core_components.Store`, and a single callback copies it into
+the ``options`` of every subscribed dropdown, in the browser by default.
+::
+
+    options = SharedOptions(app, instruments, id='instruments')
+
+    class Graph(Block):
+
+        def layout(self):
+            return html.Div([
+                self.data.options.dropdown(id=self.register('dropdown'),
+                                           value=self.data.value),
+                dcc.Graph(id=self.register('graph'))
+            ])
+
+    graphs = [Graph(app, {'options': options, 'value': 'EUR'})
+              for _ in range(n_graphs)]
+    app.layout = html.Div([options.layout] +
+                          [graph.layout for graph in graphs])
+    options.callbacks()
+"""
+
+
+import dash_core_components as dcc
+from dash.dependencies import Input, Output
+
+
+class SharedOptions:
+    """An options list referenced by many dropdowns.
+
+    :param dash.Dash app: The Dash app object.
+    :param list(dict) options: The options.
+    :param str id: The id of the store component holding the options.
+    :param bool clientside: Whether the options are copied into the\
+    dropdowns by a clientside callback. Otherwise a server callback sends\
+    them to every dropdown.
+    """
+    def __init__(self, app, options, id='shared-options', clientside=True):
+        self.app = app
+        self.options = options
+        self.id = id
+        self.clientside = clientside
+        self.outputs = []
+
+
+    @property
+    def layout(self):
+        """The store component holding the options."""
+        return dcc.Store(id=self.id, data=self.options)
+
+
+    def input(self):
+        """Create the :class:`dash.dependencies.Input` dependency on the
+        options.
+        """
+        return Input(self.id, 'data')
+
+
+    def subscribe(self, output):
+        """Subscribe a component property to the options.
+
+        :param dash.dependencies.Output output: The subscribed property,\
+        typically the ``options`` of a dropdown.
+        :return: The output.
+        """
+        self.outputs.append(output)
+        return output
+
+
+    def dropdown(self, **kwargs):
+        """Create a :class:`dash_core_components.Dropdown` subscribed to the
+        options, whose layout does not carry them.
+
+        :param \\**kwargs: Passed to the dropdown component; ``id`` is\
+        required.
+        :rtype: dash_core_components.Dropdown
+        """
+        self.subscribe(Output(kwargs['id'], 'options'))
+        kwargs.setdefault('options', [])
+        return dcc.Dropdown(**kwargs)
+
+
+    def _copies(self, options):
+        if len(self.outputs) == 1:
+            return options
+        return [options] * len(self.outputs)
+
+
+    def callbacks(self):
+        """Register the callback filling the subscribed properties. Call it
+        once every dropdown has subscribed.
+        """
+        if not self.outputs:
+            return
+        outputs = self.outputs if len(self.outputs) > 1 else self.outputs[0]
+        if self.clientside:
+            self.app.clientside_callback(
+                'function(options) {{ return {}; }}'.format(
+                    'options' if len(self.outputs) == 1 else
+                    'Array({}).fill(options)'.format(len(self.outputs))),
+                outputs, [self.input()]
+            )
+        else:
+            self.app.callback(outputs, [self.input()])(self._copies)
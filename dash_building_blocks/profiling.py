@@ -0,0 +1,140 @@
+"""The :mod:`~dash_building_blocks.profiling` module implements the
+``profiler`` option of :meth:`~dash_building_blocks.base.Block.callback`.
+Invocations are only timed until one exceeds the latency threshold of its
+block; the fingerprint of its arguments and its duration are then recorded,
+and the next invocations of that callback are run under :mod:`cProfile`.
+Those exceeding the threshold too are dumped with their fingerprint.
+::
+
+    profiler = SlowProfiler('/var/tmp/dbb-profiles', threshold=2.0)
+
+    @block.callback(block.output('graph', 'figure'),
+                    [block.input('dropdown', 'value')],
+                    profiler=profiler)
+    def update_graph(value):
+        ...
+
+Dumps are written to ``<directory>/<block id>/<callback name>/`` as
+``.json`` files describing the invocation, next to ``.prof`` files readable
+with :class:`pstats.Stats`. The slow invocation arming the profiler was not
+run under :mod:`cProfile`, so it only has a ``.json`` file: its profile is
+missing, and a slow call that does not happen again is known by its
+fingerprint only. Only the newest dumps of every callback are kept.
+Set the :attr:`~dash_building_blocks.base.Block.profile_threshold` class
+attribute of a block to override the threshold for it.
+"""
+
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+
+from dash_building_blocks.util import content_hash
+
+
+class SlowProfiler:
+    """Arm-on-slow profiler of callback functions.
+
+    :param str directory: The root directory of the dumps.
+    :param float threshold: The default latency threshold in seconds.
+    :param int keep: The number of dumps kept per callback.
+    :param int arm: The number of invocations profiled after a slow one.
+    """
+    def __init__(self, directory, threshold=1.0, keep=10, arm=3):
+        self.directory = directory
+        self.threshold = threshold
+        self.keep = keep
+        self.arm = arm
+        self._armed = {}
+        self._lock = threading.Lock()
+
+
+    def _take_armed(self, key):
+        with self._lock:
+            armed = self._armed.get(key, 0)
+            if armed:
+                self._armed[key] = armed - 1
+            return armed > 0
+
+
+    def _arm(self, key):
+        with self._lock:
+            self._armed[key] = self.arm
+
+
+    def dump(self, directory, profile, info):
+        """Write *profile* and its *info* to *directory*, then delete the
+        oldest dumps beyond :attr:`keep`.
+
+        :param str directory: The directory of the callback dumps.
+        :param cProfile.Profile profile: The profile, or None to only write\
+        the description of an invocation that was not profiled.
+        :param dict info: The description of the invocation.
+        :return: The path of the ``.prof`` file, or of the ``.json`` file\
+        without *profile*.
+        :rtype: str
+        """
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, '{:.6f}-{}'.format(
+            time.time(), info['fingerprint'][:12]))
+        if profile is not None:
+            profile.dump_stats(stem + '.prof')
+        with open(stem + '.json', 'w') as file:
+            json.dump(info, file)
+
+        dumps = sorted(name for name in os.listdir(directory)
+                       if name.endswith('.json'))
+        for name in dumps[:max(0, len(dumps) - self.keep)]:
+            for ext in ('.prof', '.json'):
+                try:
+                    os.remove(os.path.join(directory, name[:-5] + ext))
+                except FileNotFoundError:
+                    pass
+        return stem + ('.json' if profile is None else '.prof')
+
+
+    def wrap(self, block_id, name, threshold=None):
+        """Decorator profiling a callback function of a block.
+
+        :param str block_id: The id of the block.
+        :param str name: The name of the callback.
+        :param float threshold: The latency threshold in seconds, defaulting\
+        to :attr:`threshold`.
+        :return: The decorator.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        directory = os.path.join(self.directory, block_id, name)
+        key = (block_id, name)
+
+        def deco(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                profile = None
+                if self._take_armed(key):
+                    profile = cProfile.Profile()
+                    try:
+                        profile.enable()
+                    except ValueError:
+                        # another profiler is active in this process
+                        profile = None
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    elapsed = time.perf_counter() - start
+                    if profile is not None:
+                        profile.disable()
+                    if elapsed > threshold:
+                        if profile is None:
+                            self._arm(key)
+                        self.dump(directory, profile, {
+                            'block_id': block_id, 'callback': name,
+                            'duration': elapsed, 'threshold': threshold,
+                            'fingerprint': content_hash((args, kwargs)),
+                            'profiled': profile is not None
+                        })
+            return wrapper
+        return deco
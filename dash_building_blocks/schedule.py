@@ -0,0 +1,200 @@
+"""The :mod:`~dash_building_blocks.schedule` module provides the
+:class:`Ticker` block, a single app-level :class:`dash_core_components
+.Interval` that live blocks subscribe to instead of carrying their own. Every
+tick is served by one callback updating all the due subscribers together.
+The schedule of every client, i.e. the next due tick and the backoff of each
+subscriber, travels with its tick count in a :class:`dash_core_components
+.Store` of the client, so every tab is scheduled on its own.
+::
+
+    ticker = Ticker(app, interval=1000)
+
+    @ticker.subscribe(prices.output('graph', 'figure'), period=5000)
+    def update_prices(n_intervals):
+        ...
+
+    app.layout = html.Div([ticker.layout, prices.layout])
+    ticker.callbacks()
+"""
+
+
+import math
+import time
+
+import dash
+import dash_core_components as dcc
+import dash_html_components as html
+from dash.exceptions import PreventUpdate
+
+from dash_building_blocks.base import Block
+
+
+class Subscriber:
+    """A function subscribed to a :class:`Ticker`.
+
+    :param func: The update function.
+    :param dash.dependencies.Output output: The updated output.
+    :param list(dash.dependencies.State) state: The state passed to *func*.
+    :param int every: The number of ticks between updates.
+    """
+    def __init__(self, func, output, state, every):
+        self.func = func
+        self.output = output
+        self.state = state
+        self.every = every
+
+
+    def due(self, n_intervals, next_tick=0):
+        """Whether the subscriber should be updated at tick *n_intervals*.
+
+        :param int n_intervals: The current tick.
+        :param int next_tick: The next due tick of the client.
+        """
+        return n_intervals >= next_tick
+
+
+    def reschedule(self, n_intervals, elapsed, period, max_backoff,
+                   backoff=1):
+        """Schedule the next update, backing off while the function is
+        slower than its period.
+
+        :param int n_intervals: The current tick.
+        :param float elapsed: The duration of the update in seconds.
+        :param float period: The duration of a tick in seconds.
+        :param int max_backoff: The maximum backoff factor.
+        :param int backoff: The current backoff factor of the client.
+        :return: The ``(backoff, next tick)`` pair.
+        """
+        budget = self.every * backoff * period
+        if elapsed > budget:
+            backoff = min(backoff * 2, max_backoff)
+        elif elapsed < budget / 4 and backoff > 1:
+            backoff //= 2
+        return backoff, n_intervals + self.every * backoff
+
+
+    def run(self, n_intervals, state, period, max_backoff, backoff=1):
+        """Run the update function, then schedule the next update. A
+        :class:`dash.exceptions.PreventUpdate` raised by the function only
+        skips its output, as ``dash.no_update``.
+
+        :param int n_intervals: The current tick.
+        :param list state: The state values.
+        :param float period: The duration of a tick in seconds.
+        :param int max_backoff: The maximum backoff factor.
+        :param int backoff: The current backoff factor of the client.
+        :return: The output value, the new backoff and the next due tick.
+        """
+        start = time.perf_counter()
+        try:
+            value = self.func(n_intervals, *state)
+        except PreventUpdate:
+            value = dash.no_update
+        backoff, next_tick = self.reschedule(
+            n_intervals, time.perf_counter() - start, period, max_backoff,
+            backoff)
+        return value, backoff, next_tick
+
+
+class Ticker(Block):
+    """Block holding the single interval component that live blocks
+    subscribe to with :meth:`subscribe`.
+
+    :param int interval: The period of a tick in milliseconds. Subscriber\
+    periods are rounded up to a multiple of it.
+    :param int max_backoff: The maximum factor by which the period of a\
+    subscriber is stretched while its update is slower than its period.
+    """
+    # pylint: disable=W0221
+    def parameters(self, interval=1000, max_backoff=16):
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.subscribers = []
+
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div([
+            dcc.Interval(id=self.register('interval'),
+                         interval=self.interval),
+            dcc.Store(id=self.register('schedule'))
+        ])
+
+
+    def subscribe(self, output, period=None, state=None):
+        """Decorator subscribing an update function of *output*. The
+        function receives the tick count followed by the *state* values.
+
+        :param dash.dependencies.Output output: The updated output.
+        :param int period: The desired period in milliseconds, defaulting\
+        to the ticker interval.
+        :param list(dash.dependencies.State) state: The state dependencies.
+        :return: The decorator.
+        """
+        every = max(1, math.ceil((period or self.interval) / self.interval))
+
+        def deco(func):
+            self.subscribers.append(
+                Subscriber(func, output, list(state or []), every))
+            return func
+
+        return deco
+
+
+    def _schedule(self, n_intervals, schedule):
+        count = len(self.subscribers)
+        if not schedule or len(schedule.get('next', ())) != count or \
+                n_intervals < schedule.get('tick', 0):
+            # new client, or its interval restarted
+            return {'tick': n_intervals, 'next': [0] * count,
+                    'backoff': [1] * count}
+        return dict(schedule, tick=n_intervals,
+                    next=list(schedule['next']),
+                    backoff=list(schedule['backoff']))
+
+
+    def tick(self, n_intervals, *state):
+        """Update the due subscribers at tick *n_intervals*.
+
+        :param int n_intervals: The tick count of the client.
+        :param \\*state: The state values of all subscribers, in order,\
+        followed by the schedule of the client.
+        :return: The output values, ``dash.no_update`` for subscribers that\
+        are not due, followed by the new schedule of the client.
+        """
+        n_intervals = n_intervals or 0
+        schedule = self._schedule(n_intervals, state[-1] if state else None)
+        period = self.interval / 1000
+        values = []
+        due = False
+        offset = 0
+        for i, subscriber in enumerate(self.subscribers):
+            sub_state = state[offset:offset + len(subscriber.state)]
+            offset += len(subscriber.state)
+            if subscriber.due(n_intervals, schedule['next'][i]):
+                due = True
+                value, schedule['backoff'][i], schedule['next'][i] = \
+                    subscriber.run(n_intervals, sub_state, period,
+                                   self.max_backoff, schedule['backoff'][i])
+                values.append(value)
+            else:
+                values.append(dash.no_update)
+        if not due:
+            raise PreventUpdate
+        return values + [schedule]
+
+
+    def callbacks(self):
+        """Register the batched callback serving all the subscribers. Call
+        it once every block has subscribed.
+        """
+        if not self.subscribers:
+            return
+        self.callback(
+            [subscriber.output for subscriber in self.subscribers] +
+            [self.output('schedule', 'data')],
+            [self.input('interval', 'n_intervals')],
+            [dep for subscriber in self.subscribers
+             for dep in subscriber.state] +
+            [self.state('schedule', 'data')]
+        )(self.tick)
@@ -0,0 +1,167 @@
+"""The :mod:`~dash_building_blocks.search` module provides the
+:class:`SearchableDropdown` block, whose option universe stays on the
+server in a :class:`PrefixIndex`. The dropdown only ever holds the top
+matches of what the user is typing, sent by a ``search_value`` callback.
+::
+
+    index = PrefixIndex(instruments)  # built once, shared by all blocks
+
+    dropdown = SearchableDropdown(app, index=index, k=20,
+                                  placeholder='Instrument')
+    dropdown.callbacks()
+
+    @app.callback(Output('graph', 'figure'),
+                  [dropdown.input('dropdown', 'value')])
+    def update_graph(value):
+        ...
+"""
+
+
+import bisect
+import functools
+
+import dash_core_components as dcc
+from dash.exceptions import PreventUpdate
+
+from dash_building_blocks.base import Block
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PrefixIndex:
+    """Case-insensitive search index of dropdown options. Labels starting
+    with the query rank first, in alphabetical order, followed by labels
+    containing it, found through a trigram index, in option order. Only
+    queries of three characters or more match inside labels.
+
+    :param list(dict) options: The options, with ``label`` and ``value``.
+    :param int cache_size: The number of queries whose results are\
+    memoized.
+    """
+    def __init__(self, options, cache_size=4096):
+        self.options = list(options)
+        self.labels = [str(option['label']).lower() for option in self.options]
+        self._by_value = {option['value']: option for option in self.options}
+
+        order = sorted(range(len(self.labels)), key=self.labels.__getitem__)
+        self._sorted_labels = [self.labels[i] for i in order]
+        self._sorted_positions = order
+
+        postings = {}
+        for position, label in enumerate(self.labels):
+            for trigram in _trigrams(label):
+                postings.setdefault(trigram, []).append(position)
+        self._postings = postings
+
+        self._search = functools.lru_cache(maxsize=cache_size)(self._find)
+
+
+    def __len__(self):
+        return len(self.options)
+
+
+    def option(self, value):
+        """Get the option of *value*, or None."""
+        return self._by_value.get(value)
+
+
+    def _prefixed(self, query, k):
+        start = bisect.bisect_left(self._sorted_labels, query)
+        # U+FFFF sorts after every character that can follow the prefix
+        end = bisect.bisect_left(self._sorted_labels, query + '\uffff',
+                                 start, min(start + k,
+                                            len(self._sorted_labels)))
+        return self._sorted_positions[start:end]
+
+
+    def _containing(self, query, k, exclude):
+        trigrams = _trigrams(query)
+        if not trigrams:
+            return []
+        # the rarest trigram of the query bounds the candidates to verify
+        rarest = min((self._postings.get(trigram, []) for trigram in
+                      trigrams), key=len)
+        found = []
+        for position in rarest:
+            if position not in exclude and query in self.labels[position]:
+                found.append(position)
+                if len(found) == k:
+                    break
+        return found
+
+
+    def _find(self, query, k):
+        positions = self._prefixed(query, k)
+        if len(positions) < k:
+            positions = positions + self._containing(
+                query, k - len(positions), set(positions))
+        return tuple(positions)
+
+
+    def search(self, query, k=20):
+        """Find the top *k* options matching *query*.
+
+        :param str query: The search text.
+        :param int k: The maximum number of options.
+        :rtype: list(dict)
+        """
+        query = (query or '').lower()
+        if not query:
+            return self.options[:k]
+        return [self.options[position] for position in self._search(query, k)]
+
+
+class SearchableDropdown(Block):
+    """Dropdown block searching its options on the server.
+
+    :param options: The options, used to build the index if *index* is\
+    not given.
+    :param PrefixIndex index: The search index, shared between blocks.
+    :param int k: The number of options sent per search.
+    :param value: The initial value.
+    :param \\**dropdown_kwargs: Passed to the dropdown component.
+    """
+    # pylint: disable=W0221
+    def parameters(self, options=None, index=None, k=20, value=None,
+                   **dropdown_kwargs):
+        self.index = index if index is not None else PrefixIndex(options or [])
+        self.k = k
+        self.value = value
+        self.dropdown_kwargs = dropdown_kwargs
+
+
+    def _selected(self, value):
+        values = value if isinstance(value, list) else [value]
+        return [self.index.option(v) for v in values
+                if v is not None and self.index.option(v) is not None]
+
+
+    # pylint: disable=E0202
+    def layout(self):
+        return dcc.Dropdown(id=self.register('dropdown'),
+                            options=self._selected(self.value),
+                            value=self.value, **self.dropdown_kwargs)
+
+
+    def search(self, search_value, value):
+        """Build the options of the dropdown for *search_value*, keeping
+        the selected options.
+
+        :param str search_value: The text typed by the user.
+        :param value: The current value of the dropdown.
+        :rtype: list(dict)
+        """
+        if not search_value:
+            raise PreventUpdate
+        options = self.index.search(search_value, self.k)
+        selected = [option for option in self._selected(value)
+                    if option not in options]
+        return selected + options
+
+
+    def callbacks(self):
+        self.callback(self.output('dropdown', 'options'),
+                      [self.input('dropdown', 'search_value')],
+                      [self.state('dropdown', 'value')])(self.search)
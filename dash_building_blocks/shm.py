@@ -0,0 +1,412 @@
+"""The :mod:`~dash_building_blocks.shm` module provides the
+:class:`SharedMemoryStore` class, a :class:`~dash_building_blocks.base.Store`
+whose producer callbacks publish large NumPy arrays to named shared-memory
+segments instead of serializing them into the hidden div. Only a small JSON
+handle travels through the browser; a consumer callback served by any worker
+on the same host maps the segment and gets a zero-copy, read-only view.
+::
+
+    store = SharedMemoryStore(app, registry='/tmp/dbb-shm.sqlite')
+
+    @store.register('prices', inputs=[Input('dropdown', 'value')])
+    def load_prices(value):
+        return np.load(value)
+
+    @app.callback(Output('graph', 'figure'), [store.input('prices')])
+    def update_graph(handle):
+        prices = store.load(handle)
+        ...
+
+Segments are reference counted per process in a SQLite registry, and
+:meth:`SegmentRegistry.sweep` (or the thread started by
+:meth:`SegmentRegistry.start_sweeper`) unlinks segments nobody references.
+A client idle for longer than the ``client_ttl`` of its store no longer
+holds its segments, so the handle in its hidden div may outlive them.
+Loading it then raises :class:`~dash_building_blocks.error
+.SegmentMissingError`, a :class:`dash.exceptions.PreventUpdate`: the
+consumer output is left as it is until the producer runs again.
+
+Requires Python 3.8 or later and NumPy, installed with the ``shm`` extra.
+"""
+
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter
+
+if sys.version_info < (3, 8):
+    raise ImportError('dash_building_blocks.shm requires Python 3.8 or later')
+
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from dash_building_blocks.base import Store
+from dash_building_blocks.error import SegmentMissingError
+from dash_building_blocks.util import client_key
+
+
+HANDLE_KEY = '__shm__'
+INLINE_KEY = '__array__'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS segments (
+    name TEXT PRIMARY KEY,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    name TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (name, pid)
+);
+'''
+
+
+def _open_segment(name=None, size=0):
+    create = name is None
+    if create:
+        name = 'dbb_' + uuid.uuid4().hex[:24]
+    segment = shared_memory.SharedMemory(name, create=create, size=size)
+    # lifetime is managed by the registry, not by the exit of the process
+    # that happened to create or map the segment
+    try:
+        resource_tracker.unregister(segment._name, 'shared_memory')
+    except Exception:
+        pass
+    return segment
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def is_handle(value):
+    """Whether *value* is a JSON handle produced by
+    :meth:`SegmentRegistry.publish`.
+
+    :param value: The stored value.
+    :rtype: bool
+    """
+    return isinstance(value, str) and HANDLE_KEY in value[:16]
+
+
+def is_inline(value):
+    """Whether *value* is a small array stored inline as JSON by a
+    :class:`SharedMemoryStore`.
+
+    :param value: The stored value.
+    :rtype: bool
+    """
+    return isinstance(value, str) and INLINE_KEY in value[:16]
+
+
+def _unlink(segment):
+    # re-register the name unregistered by _open_segment, since unlink
+    # unregisters it again and the resource tracker complains otherwise
+    try:
+        resource_tracker.register(segment._name, 'shared_memory')
+    except Exception:
+        pass
+    segment.unlink()
+
+
+class SegmentRegistry:
+    """Reference counts of shared-memory segments, kept in a SQLite file
+    shared by the processes of a host.
+
+    :param str path: The path of the SQLite file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._attached = {}
+        self._closing = {}
+        self._views = Counter()
+        self._lock = threading.RLock()
+        self._sweeper = None
+        self._connect().executescript(_SCHEMA)
+
+
+    def _connect(self):
+        pid = os.getpid()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != pid:
+            conn = sqlite3.connect(self.path, timeout=30,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = pid
+        return conn
+
+
+    def publish(self, array, item=''):
+        """Copy *array* into a new shared-memory segment.
+
+        :param numpy.ndarray array: The array. Object arrays are rejected.
+        :param str item: The store item the array was produced for.
+        :return: The JSON handle to pass to :meth:`attach`.
+        :rtype: str
+        """
+        array = np.asarray(array)
+        if array.dtype.hasobject:
+            raise ValueError('Cannot publish arrays of Python objects')
+
+        segment = _open_segment(size=max(array.nbytes, 1))
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+        view[...] = array
+        del view
+        segment.close()
+
+        conn = self._connect()
+        conn.execute('INSERT INTO segments VALUES (?, ?)',
+                     (segment.name, time.time()))
+        return json.dumps({
+            HANDLE_KEY: segment.name,
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'item': item
+        })
+
+
+    def attach(self, handle):
+        """Map the segment of *handle* and reference it from this process.
+
+        :param str handle: The JSON handle returned by :meth:`publish`.
+        :return: A read-only array viewing the shared memory.
+        :rtype: numpy.ndarray
+        :raises SegmentMissingError: If the segment was swept.
+        """
+        meta = json.loads(handle)
+        name = meta[HANDLE_KEY]
+        with self._lock:
+            segment = self._attached.get(name)
+            if segment is None:
+                try:
+                    segment = _open_segment(name)
+                except FileNotFoundError:
+                    raise SegmentMissingError(
+                        'Shared-memory segment {} of item {!r} was swept'
+                        .format(name, meta.get('item'))) from None
+                self._attached[name] = segment
+                self._incref(name)
+            array = np.ndarray(meta['shape'], dtype=np.dtype(meta['dtype']),
+                               buffer=segment.buf)
+            array.flags.writeable = False
+            # slices keep *array* alive through their base, so the mapping
+            # can be closed once the finalizer of *array* has run
+            self._views[name] += 1
+            weakref.finalize(array, self._drop_view, name)
+        return array
+
+
+    def release(self, handle_or_name):
+        """Drop the reference of this process to a segment. Its mapping is
+        closed once no array views it anymore.
+
+        :param str handle_or_name: The JSON handle or the segment name.
+        """
+        name = handle_or_name
+        if is_handle(name):
+            name = json.loads(name)[HANDLE_KEY]
+        with self._lock:
+            segment = self._attached.pop(name, None)
+            if segment is None:
+                return
+            if self._views[name]:
+                self._closing[name] = segment
+            else:
+                segment.close()
+        conn = self._connect()
+        conn.execute('DELETE FROM refs WHERE name = ? AND pid = ?',
+                     (name, os.getpid()))
+
+
+    def release_all(self):
+        """Drop every reference of this process, e.g. at worker shutdown."""
+        for name in list(self._attached):
+            self.release(name)
+
+
+    def _drop_view(self, name):
+        with self._lock:
+            self._views[name] -= 1
+            if not self._views[name]:
+                del self._views[name]
+                segment = self._closing.pop(name, None)
+                if segment is not None:
+                    segment.close()
+
+
+    def _incref(self, name):
+        conn = self._connect()
+        conn.execute(
+            'INSERT INTO refs VALUES (?, ?, 1) ON CONFLICT (name, pid) '
+            'DO UPDATE SET count = count + 1', (name, os.getpid()))
+
+
+    def refcount(self, name):
+        """The number of processes referencing the segment *name*.
+
+        :param str name: The segment name.
+        :rtype: int
+        """
+        count, = self._connect().execute(
+            'SELECT COALESCE(SUM(count), 0) FROM refs WHERE name = ?',
+            (name,)).fetchone()
+        return count
+
+
+    def sweep(self, grace=60.0):
+        """Unlink the segments that no live process references and that
+        were published more than *grace* seconds ago, giving consumers time
+        to attach.
+
+        :param float grace: The minimum age in seconds of swept segments.
+        :return: The names of the unlinked segments.
+        :rtype: list(str)
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            pids = [pid for pid, in conn.execute(
+                'SELECT DISTINCT pid FROM refs')]
+            conn.executemany('DELETE FROM refs WHERE pid = ?',
+                             [(pid,) for pid in pids if not _pid_alive(pid)])
+            names = [name for name, in conn.execute(
+                'SELECT name FROM segments WHERE created <= ? AND name NOT IN'
+                ' (SELECT name FROM refs WHERE count > 0)',
+                (time.time() - grace,))]
+            conn.executemany('DELETE FROM segments WHERE name = ?',
+                             [(name,) for name in names])
+
+        for name in names:
+            try:
+                segment = _open_segment(name)
+            except FileNotFoundError:
+                continue
+            segment.close()
+            _unlink(segment)
+        return names
+
+
+    def start_sweeper(self, interval=30.0, grace=60.0):
+        """Start a daemon thread calling :meth:`sweep` every *interval*
+        seconds.
+
+        :param float interval: The period of the sweeps in seconds.
+        :param float grace: Passed to :meth:`sweep`.
+        :return: The event that stops the thread when set.
+        :rtype: threading.Event
+        """
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                self.sweep(grace)
+
+        self._sweeper = threading.Thread(target=run, daemon=True)
+        self._sweeper.start()
+        return stop
+
+
+class SharedMemoryStore(Store):
+    """Store whose producer callbacks hand large arrays over through shared
+    memory.
+
+    :param dash.Dash app: The Dash app object.
+    :param str registry: The path of the :class:`SegmentRegistry` SQLite\
+    file, shared by the workers of the host.
+    :param int threshold: The minimum size in bytes of the arrays published\
+    to shared memory. Smaller arrays are stored inline as JSON.
+    :param float client_ttl: The number of seconds after which the segments\
+    loaded by a client that stopped loading are released.
+    :param \\**kwargs: Keyword arguments passed to\
+    :class:`~dash_building_blocks.base.Store`.
+    """
+    def __init__(self, app, registry, threshold=2 ** 20, client_ttl=3600.0,
+                 **kwargs):
+        super().__init__(app, **kwargs)
+        self.registry = SegmentRegistry(registry)
+        self.threshold = threshold
+        self.client_ttl = client_ttl
+        self._loaded = {}
+        self._holders = Counter()
+        self._lock = threading.Lock()
+
+
+    def _wrap_producer(self, global_id, cbfunc, cache=None):
+        cbfunc = super()._wrap_producer(global_id, cbfunc, cache=cache)
+
+        def publish(*args):
+            value = cbfunc(*args)
+            if isinstance(value, np.ndarray):
+                if value.nbytes >= self.threshold:
+                    return self.registry.publish(value, item=global_id)
+                return json.dumps({INLINE_KEY: value.tolist(),
+                                   'dtype': value.dtype.str})
+            return value
+
+        publish.__name__ = cbfunc.__name__
+        return publish
+
+
+    def _hold(self, value, item):
+        now = time.time()
+        released = []
+        with self._lock:
+            key = (client_key(), item)
+            previous = self._loaded.get(key)
+            self._loaded[key] = (value, now)
+            if previous is None or previous[0] != value:
+                self._holders[value] += 1
+                if previous is not None:
+                    released.append(previous[0])
+            for other, (handle, loaded) in list(self._loaded.items()):
+                if now - loaded > self.client_ttl:
+                    del self._loaded[other]
+                    released.append(handle)
+            for handle in released:
+                self._holders[handle] -= 1
+            released = [handle for handle in released
+                        if self._holders[handle] <= 0]
+            for handle in released:
+                del self._holders[handle]
+        for handle in released:
+            self.registry.release(handle)
+
+
+    def load(self, value):
+        """Resolve a value read from a store item. Shared-memory handles are
+        mapped zero-copy; the segment a client loaded before for the same
+        item is released by this process once no other client holds it.
+        Small arrays stored inline are decoded. Other values are returned
+        unchanged.
+
+        :param value: The value of the store item.
+        :return: The read-only array, or *value* itself.
+        :raises SegmentMissingError: If the segment of a handle was swept,\
+        e.g. after the client was idle for longer than :attr:`client_ttl`.
+        """
+        if is_inline(value):
+            meta = json.loads(value)
+            array = np.array(meta[INLINE_KEY], dtype=np.dtype(meta['dtype']))
+            array.flags.writeable = False
+            return array
+        if not is_handle(value):
+            return value
+        array = self.registry.attach(value)
+        self._hold(value, json.loads(value).get('item', ''))
+        return array
@@ -0,0 +1,117 @@
+"""The :mod:`~dash_building_blocks.static` module caches the serialized JSON
+of layouts that never change once built, such as the layout of a
+:class:`~dash_building_blocks.base.Block` that only depends on its
+:attr:`data`. Static components are serialized once and spliced verbatim
+into the ``/_dash-layout`` response served by :func:`serve_static_layout`,
+which also tags the response with an ``ETag`` so unchanged layouts can be
+answered with ``304 Not Modified``.
+::
+
+    class Header(dbb.Block):
+        static = True
+
+        def layout(self):
+            return html.H1(self.data.title)
+
+    app.layout = html.Div([Header(app, {'title': 'Hi'}).layout, ...])
+    serve_static_layout(app)
+"""
+
+
+import hashlib
+import json
+import uuid
+
+import flask
+from plotly.utils import PlotlyJSONEncoder
+
+
+STATIC_ATTR = '_dbb_static_json'
+
+
+def mark_static(component):
+    """Mark *component* as static so its serialized JSON is computed once
+    and reused for every layout request.
+
+    :param component: The Dash component.
+    :return: The same component, for chaining.
+    """
+    if not hasattr(component, STATIC_ATTR):
+        setattr(component, STATIC_ATTR, None)
+    return component
+
+
+def is_static(component):
+    """Whether *component* was marked with :func:`mark_static`."""
+    return hasattr(component, STATIC_ATTR)
+
+
+def static_json(component):
+    """Get the cached JSON serialization of a static *component*,
+    serializing it on first access.
+
+    :param component: The Dash component marked as static.
+    :return: The serialized JSON.
+    :rtype: str
+    """
+    serialized = getattr(component, STATIC_ATTR)
+    if serialized is None:
+        serialized = json.dumps(component, cls=PlotlyJSONEncoder)
+        setattr(component, STATIC_ATTR, serialized)
+    return serialized
+
+
+class SplicingEncoder(PlotlyJSONEncoder):
+    """JSON encoder that replaces static components by placeholders while
+    encoding and splices in their cached serialization afterwards.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prefix = '__dbb_static_{}_'.format(uuid.uuid4().hex)
+        self._spliced = {}
+
+
+    def default(self, obj):
+        if is_static(obj):
+            token = '{}{}'.format(self._prefix, len(self._spliced))
+            self._spliced[json.dumps(token)] = static_json(obj)
+            return token
+        return super().default(obj)
+
+
+    def encode(self, o):
+        self._spliced = {}
+        encoded = super().encode(o)
+        for token, serialized in self._spliced.items():
+            encoded = encoded.replace(token, serialized, 1)
+        return encoded
+
+
+def layout_etag(body):
+    """Compute the ``ETag`` of a serialized layout.
+
+    :param bytes body: The serialized layout.
+    :return: The content hash.
+    :rtype: str
+    """
+    return hashlib.sha1(body).hexdigest()
+
+
+def serve_static_layout(app):
+    """Replace the ``/_dash-layout`` view of *app* with one that splices
+    the cached JSON of static components into the response and answers
+    conditional requests with ``304 Not Modified``.
+
+    :param dash.Dash app: The Dash app object.
+    :return: The new view function.
+    """
+    endpoint = app.config.routes_pathname_prefix + '_dash-layout'
+
+    def serve_layout():
+        body = SplicingEncoder().encode(app._layout_value()).encode('utf-8')
+        response = flask.Response(body, mimetype='application/json')
+        response.set_etag(layout_etag(body))
+        return response.make_conditional(flask.request)
+
+    app.server.view_functions[endpoint] = serve_layout
+    return serve_layout
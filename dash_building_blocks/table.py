@@ -0,0 +1,269 @@
+"""The :mod:`~dash_building_blocks.table` module provides the
+:class:`TableBlock`, a :class:`dash_table.DataTable` over a
+:class:`~dash_building_blocks.dataset.Dataset` that only ever sends the
+current page. Sorting and filtering run on the server with the
+:class:`~dash_building_blocks.dataset.ColumnIndex`\\ es of the dataset,
+which are built once and shared by every user and block reading it.
+::
+
+    trades = TableBlock(app, {'dataset': '/data/trades'}, page_size=50)
+    trades.callbacks()
+
+Sorting on a column, optionally filtered on a range of that same column,
+only slices the sort permutation of its index, so the cost of a request
+depends on the page size. Other filters are resolved once per filter query
+and sort order, then cached.
+
+Requires NumPy, installed with the ``data`` extra.
+"""
+
+
+import functools
+import re
+
+import dash_table
+import numpy as np
+from dash.exceptions import PreventUpdate
+
+from dash_building_blocks.dataset import DatasetBlock
+
+
+_CLAUSE = re.compile(
+    r'^\{(?P<column>[^}]+)\}\s*(?P<op>[a-z]+|[<>!=]=?)\s*(?P<value>.*)$')
+
+_OPERATORS = {
+    '=': 'eq', 'eq': 'eq', '!=': 'ne', 'ne': 'ne',
+    '>': 'gt', 'gt': 'gt', '>=': 'ge', 'ge': 'ge',
+    '<': 'lt', 'lt': 'lt', '<=': 'le', 'le': 'le',
+    'contains': 'contains'
+}
+
+_RANGES = {
+    'eq': lambda v: (v, v, (True, True)),
+    'gt': lambda v: (v, None, (False, True)),
+    'ge': lambda v: (v, None, (True, True)),
+    'lt': lambda v: (None, v, (True, False)),
+    'le': lambda v: (None, v, (True, True))
+}
+
+
+def _literal(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in '"\'`':
+        return text[1:-1]
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_filter(query):
+    """Parse a :class:`dash_table.DataTable` filter query made of
+    ``{column} operator value`` clauses joined by ``&&``.
+
+    :param str query: The filter query.
+    :return: The ``(column, operator, value)`` clauses, with operators\
+    among ``eq``, ``ne``, ``gt``, ``ge``, ``lt``, ``le`` and ``contains``.
+    :rtype: list(tuple)
+    :raises ValueError: If a clause is not supported.
+    """
+    clauses = []
+    for clause in (query or '').split('&&'):
+        clause = clause.strip()
+        if not clause:
+            continue
+        match = _CLAUSE.match(clause)
+        if match is None or match.group('op') not in _OPERATORS:
+            raise ValueError('Unsupported filter clause: {}'.format(clause))
+        clauses.append((match.group('column'),
+                        _OPERATORS[match.group('op')],
+                        _literal(match.group('value'))))
+    return clauses
+
+
+class RowOrder:
+    """The rows of a table in display order.
+
+    :param rows: The row numbers, as an array, or None for the rows of\
+    *permutation* between *start* and *stop*.
+    :param numpy.ndarray permutation: A sort permutation, or None for the\
+    natural order.
+    :param bool descending: Whether *permutation* is read backwards.
+    """
+    def __init__(self, rows=None, permutation=None, start=0, stop=0,
+                 descending=False):
+        self.rows = rows
+        self.permutation = permutation
+        self.start = start
+        self.stop = stop
+        self.descending = descending
+
+
+    def __len__(self):
+        if self.rows is not None:
+            return len(self.rows)
+        return self.stop - self.start
+
+
+    def page(self, start, stop):
+        """Get the row numbers displayed between *start* and *stop*.
+
+        :rtype: numpy.ndarray
+        """
+        stop = min(stop, len(self))
+        if self.rows is not None:
+            return np.asarray(self.rows[start:stop])
+        if self.permutation is None:
+            return np.arange(self.start + start, self.start + stop)
+        if self.descending:
+            return np.asarray(
+                self.permutation[self.stop - stop:self.stop - start][::-1])
+        return np.asarray(
+            self.permutation[self.start + start:self.start + stop])
+
+
+class TableBlock(DatasetBlock):
+    """Table block over the dataset referenced by ``data.dataset``, with
+    custom paging, sorting and filtering.
+
+    :param int page_size: The number of rows per page.
+    :param list(str) columns: The displayed columns, all if None.
+    :param int cache_size: The number of resolved filter queries and sort\
+    orders that are cached.
+    :param \\**table_kwargs: Passed to the table component.
+    """
+    # pylint: disable=W0221
+    def parameters(self, page_size=20, columns=None, cache_size=128,
+                   **table_kwargs):
+        self.page_size = page_size
+        self.columns = columns
+        self.table_kwargs = table_kwargs
+        self._resolve = functools.lru_cache(maxsize=cache_size)(self._order)
+
+
+    # pylint: disable=E0202
+    def layout(self):
+        columns = self.columns or self.dataset.columns
+        data, page_count = self.page(0, self.page_size)
+        return dash_table.DataTable(
+            id=self.register('table'),
+            columns=[{'name': column, 'id': column} for column in columns],
+            data=data,
+            page_action='custom', page_current=0, page_size=self.page_size,
+            page_count=page_count,
+            sort_action='custom', sort_mode='single', sort_by=[],
+            filter_action='custom', filter_query='',
+            **self.table_kwargs
+        )
+
+
+    def _order(self, filter_query, sort):
+        dataset = self.dataset
+        clauses = parse_filter(filter_query)
+        column, descending = sort if sort else (None, False)
+        for c in [c for c, _, _ in clauses] + [column]:
+            if c is not None and c not in dataset.columns:
+                raise KeyError(c)
+
+        if column is not None and all(
+                c == column and op in _RANGES for c, op, _ in clauses):
+            index = dataset.index(column)
+            start, stop = 0, len(dataset)
+            for _, op, value in clauses:
+                low, high, inclusive = _RANGES[op](value)
+                bounds = index.bounds(low, high, inclusive)
+                start, stop = max(start, bounds[0]), min(stop, bounds[1])
+            return RowOrder(permutation=index.permutation, start=start,
+                            stop=max(start, stop), descending=descending)
+
+        rows = None
+        for c, op, value in clauses:
+            if op in _RANGES:
+                matched = dataset.index(c).range(*_RANGES[op](value))
+            elif op == 'ne':
+                matched = np.setdiff1d(np.arange(len(dataset)),
+                                       dataset.index(c).equal(value),
+                                       assume_unique=True)
+            else:
+                candidates = np.arange(len(dataset)) if rows is None else rows
+                values = np.asarray(dataset.column(c)[candidates]).astype(str)
+                matched = candidates[np.char.find(values, str(value)) >= 0]
+            rows = matched if rows is None else np.intersect1d(
+                rows, matched, assume_unique=True)
+
+        if column is None:
+            if rows is None:
+                return RowOrder(stop=len(dataset))
+            return RowOrder(rows)
+
+        index = dataset.index(column)
+        if rows is None:
+            return RowOrder(permutation=index.permutation, stop=len(dataset),
+                            descending=descending)
+        if len(rows) * 8 < len(dataset):
+            values = np.asarray(dataset.column(column)[rows])
+            ordered = rows[np.argsort(values, kind='stable')]
+        else:
+            selected = np.zeros(len(dataset), dtype=bool)
+            selected[rows] = True
+            permutation = np.asarray(index.permutation)
+            ordered = permutation[selected[permutation]]
+        return RowOrder(ordered[::-1] if descending else ordered)
+
+
+    def rows(self, filter_query='', sort_by=None):
+        """Resolve the rows matching *filter_query* in the order of
+        *sort_by*, caching the result.
+
+        :param str filter_query: The filter query of the table.
+        :param list(dict) sort_by: The sort order of the table.
+        :rtype: RowOrder
+        """
+        sort = None
+        if sort_by:
+            sort = (sort_by[0]['column_id'],
+                    sort_by[0].get('direction') == 'desc')
+        return self._resolve(filter_query or '', sort)
+
+
+    def page(self, page_current, page_size, sort_by=None, filter_query=''):
+        """Build the records of a page and the number of pages.
+
+        :param int page_current: The page number, starting at 0.
+        :param int page_size: The number of rows per page.
+        :param list(dict) sort_by: The sort order of the table.
+        :param str filter_query: The filter query of the table.
+        :return: The ``(records, page count)`` pair.
+        """
+        order = self.rows(filter_query, sort_by)
+        page_current = page_current or 0
+        rows = order.page(page_current * page_size,
+                          (page_current + 1) * page_size)
+        columns = self.columns or self.dataset.columns
+        values = {column: np.asarray(self.dataset.column(column)[rows])
+                  .tolist() for column in columns}
+        records = [{column: values[column][i] for column in columns}
+                   for i in range(len(rows))]
+        return records, max(1, -(-len(order) // page_size))
+
+
+    def update(self, page_current, page_size, sort_by, filter_query):
+        """The callback serving the pages of the table."""
+        try:
+            return self.page(page_current, page_size or self.page_size,
+                             sort_by, filter_query)
+        except (ValueError, KeyError):
+            # unsupported filter clause or unknown column
+            raise PreventUpdate
+
+
+    def callbacks(self):
+        self.callback(
+            [self.output('table', 'data'), self.output('table', 'page_count')],
+            [self.input('table', 'page_current'),
+             self.input('table', 'page_size'),
+             self.input('table', 'sort_by'),
+             self.input('table', 'filter_query')]
+        )(self.update)
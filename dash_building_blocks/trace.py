@@ -0,0 +1,256 @@
+"""The :mod:`~dash_building_blocks.trace` module implements the ``tracer``
+option of :meth:`~dash_building_blocks.base.Block.callback` and
+:meth:`~dash_building_blocks.base.Store.register`. Every invocation of a
+traced callback opens a :class:`Span` tagged with the block class and id,
+and the trace context travels inside the values of traced store items, so
+the requests triggered by one user action end up in a single trace.
+::
+
+    tracer = Tracer(FileExporter('/tmp/dbb-spans.jsonl'))
+
+    @store.register('filtered', inputs=[form.input('data')], tracer=tracer)
+    def filter_data(data):
+        ...
+
+    @graph.callback(graph.output('graph', 'figure'),
+                    [store.input('filtered')], tracer=tracer)
+    def update_graph(filtered):
+        ...
+
+Values of traced store items are JSON envelopes holding the context and the
+value. Traced callbacks unwrap their arguments before calling the decorated
+function; other consumers should call :func:`unwrap`.
+"""
+
+
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+
+import dash
+from dash.exceptions import PreventUpdate
+from plotly.utils import PlotlyJSONEncoder
+
+
+TRACE_KEY = '__trace__'
+
+_local = threading.local()
+
+
+class Span:
+    """A timed operation of a trace.
+
+    :param str name: The name of the operation.
+    :param str trace_id: The id of the trace.
+    :param str parent_id: The id of the parent span, if any.
+    :param dict attributes: The attributes of the span.
+    """
+    def __init__(self, name, trace_id=None, parent_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.status = 'ok'
+        self.start = time.time()
+        self.end = None
+
+
+    @property
+    def duration(self):
+        """The duration of the span in seconds, or None while open."""
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+
+    @property
+    def context(self):
+        """The context propagated to child spans.
+
+        :rtype: dict
+        """
+        return {'trace_id': self.trace_id, 'span_id': self.span_id}
+
+
+    def to_dict(self):
+        """Convert the span to a JSON-serializable :class:`dict`."""
+        return {'name': self.name, 'trace_id': self.trace_id,
+                'span_id': self.span_id, 'parent_id': self.parent_id,
+                'attributes': self.attributes, 'status': self.status,
+                'start': self.start, 'end': self.end}
+
+
+class MemoryExporter:
+    """Exporter keeping finished spans in memory, e.g. for tests."""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+
+    def export(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+
+    def traces(self):
+        """Group the exported spans by trace id.
+
+        :rtype: dict
+        """
+        traces = {}
+        for span in list(self.spans):
+            traces.setdefault(span.trace_id, []).append(span)
+        return traces
+
+
+class FileExporter:
+    """Exporter appending finished spans as JSON lines to a file.
+
+    :param str path: The path of the file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), cls=PlotlyJSONEncoder)
+        with self._lock:
+            with open(self.path, 'a') as file:
+                file.write(line + '\n')
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def current_span():
+    """The innermost span open in this thread, or None."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def is_traced(value):
+    """Whether *value* is the envelope of a traced store item.
+
+    :param value: The stored value.
+    :rtype: bool
+    """
+    return isinstance(value, str) and \
+        value.startswith('{{"{}"'.format(TRACE_KEY))
+
+
+def unwrap(value):
+    """Split the value of a traced store item into its context and value.
+    Other values are returned with a None context.
+
+    :param value: The stored value.
+    :return: The ``(context, value)`` pair.
+    """
+    if not is_traced(value):
+        return None, value
+    envelope = json.loads(value)
+    return envelope[TRACE_KEY], envelope['value']
+
+
+def wrap(value, span):
+    """Wrap *value* into an envelope carrying the context of *span*.
+
+    :param value: The JSON-serializable value.
+    :param Span span: The span.
+    :return: The envelope, or *value* itself if it is ``dash.no_update``.
+    """
+    if value is dash.no_update:
+        return value
+    return json.dumps({TRACE_KEY: span.context, 'value': value},
+                      cls=PlotlyJSONEncoder)
+
+
+class Tracer:
+    """Opens spans and hands them to an exporter when they end.
+
+    :param exporter: An object with an ``export(span)`` method, such as\
+    :class:`MemoryExporter` or :class:`FileExporter`.
+    """
+    def __init__(self, exporter):
+        self.exporter = exporter
+
+
+    def start(self, name, parent=None, attributes=None):
+        """Open a span and make it the current span of the thread.
+
+        :param str name: The name of the operation.
+        :param dict parent: The context of the parent span, defaulting to\
+        the current span.
+        :param dict attributes: The attributes of the span.
+        :rtype: Span
+        """
+        if parent is None and current_span() is not None:
+            parent = current_span().context
+        parent = parent or {}
+        span = Span(name, parent.get('trace_id'), parent.get('span_id'),
+                    attributes)
+        _stack().append(span)
+        return span
+
+
+    def finish(self, span, error=None):
+        """End *span*, restore the previous current span and export it.
+
+        :param Span span: The span.
+        :param Exception error: The exception that ended the operation.
+        """
+        span.end = time.time()
+        if isinstance(error, PreventUpdate):
+            span.status = 'prevented'
+        elif error is not None:
+            span.status = 'error'
+            span.attributes['error'] = repr(error)
+        stack = _stack()
+        if span in stack:
+            del stack[stack.index(span):]
+        self.exporter.export(span)
+
+
+    def traced(self, name, attributes=None, envelope=None):
+        """Decorator running a callback function in a span. Traced store
+        values among the arguments are unwrapped, the first context found
+        being the parent of the span.
+
+        :param str name: The name of the span.
+        :param dict attributes: The attributes of the span.
+        :param envelope: If not None, the index of the returned value to\
+        wrap with the context of the span, or True to wrap the whole value.
+        :return: The decorator.
+        """
+        def deco(func):
+            @functools.wraps(func)
+            def wrapper(*args):
+                parent = None
+                unwrapped = []
+                for arg in args:
+                    context, value = unwrap(arg)
+                    parent = parent or context
+                    unwrapped.append(value)
+                span = self.start(name, parent, attributes)
+                try:
+                    result = func(*unwrapped)
+                except BaseException as error:
+                    self.finish(span, error)
+                    raise
+                self.finish(span)
+                if envelope is True:
+                    return wrap(result, span)
+                if envelope is not None:
+                    result = list(result)
+                    result[envelope] = wrap(result[envelope], span)
+                return result
+            return wrapper
+        return deco
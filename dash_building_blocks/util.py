@@ -1,3 +1,4 @@
+import json
 import random
 import string
 
@@ -61,4 +62,193 @@ def decamelify(name, delim='-'):
         else:
             chars.append(c)
             
-    return ''.join(chars)
\ No newline at end of file
+    return ''.join(chars)
+
+
+#: The field of callback request bodies holding the id of the browser tab,
+#: added by the renderer hook installed with :func:`enable_sessions`.
+SESSION_FIELD = 'dbbSession'
+
+#: The cookie holding the id of the browser session.
+SESSION_COOKIE = 'dbb_session'
+
+_RENDERER = """
+var dbbSession = Math.random().toString(36).slice(2) +
+    Date.now().toString(36);
+var renderer = new DashRenderer({
+    request_pre: function(payload) { payload.%s = dbbSession; }
+});
+""" % SESSION_FIELD
+
+
+def enable_sessions(app):
+    """Make :func:`client_key` tell the tabs of a browser apart, by adding
+    the id of the tab to every callback request. This replaces the
+    ``renderer`` script of *app*.
+
+    :param dash.Dash app: The Dash app object.
+    :return: The app.
+    """
+    app.renderer = _RENDERER
+    return app
+
+
+def sessions_enabled(app):
+    """Whether :func:`enable_sessions` was called for *app*.
+
+    :param dash.Dash app: The Dash app object.
+    :rtype: bool
+    """
+    renderer = getattr(app, 'renderer', None)
+    return isinstance(renderer, str) and SESSION_FIELD in renderer
+
+
+def client_key():
+    """Identify the client of the current request: its browser tab if
+    :func:`enable_sessions` was called, its browser session otherwise. The
+    session id is kept in a cookie, set on the first response that needs
+    it. Outside of a request, the empty string is returned.
+
+    :return: The client key.
+    """
+    import secrets
+
+    import flask
+
+    if not flask.has_request_context():
+        return ''
+    request = flask.request
+    body = request.get_json(silent=True) if request.is_json else None
+    if isinstance(body, dict) and isinstance(body.get(SESSION_FIELD), str):
+        return 'tab ' + body[SESSION_FIELD]
+
+    session = request.cookies.get(SESSION_COOKIE) or \
+        flask.g.get('dbb_session')
+    if session is None:
+        session = flask.g.dbb_session = secrets.token_hex(16)
+
+        @flask.after_this_request
+        def set_cookie(response):
+            response.set_cookie(SESSION_COOKIE, session, httponly=True,
+                                samesite='Lax')
+            return response
+    return 'session ' + session
+
+
+def _new_hash():
+    try:
+        import xxhash
+    except ImportError:
+        import hashlib
+        return hashlib.blake2b(digest_size=16)
+    return xxhash.xxh3_128()
+
+
+def _sort_key(item):
+    return (type(item[0]).__name__, str(item[0]))
+
+
+#: Marks the encoded form of values that are not plain JSON.
+_LEAF = '\x00dbb'
+
+
+def _encode_leaf(item):
+    if hasattr(item, 'to_plotly_json'):
+        return [_LEAF, type(item).__name__, item.to_plotly_json()]
+    return [_LEAF, _walk_hash(item)]
+
+
+_json_encoder = json.JSONEncoder(sort_keys=True, separators=(',', ':'),
+                                 default=_encode_leaf)
+
+
+def content_hash(value):
+    """Hash *value* from its compact JSON encoding, produced by the C
+    encoder of :mod:`json`, so values equal in JSON, such as a tuple and a
+    list, have the same hash. Values that are not plain JSON are replaced in
+    the encoding by their own hash: NumPy arrays and pandas objects are
+    hashed from their buffers; objects with a ``content_hash`` method, such
+    as :class:`~dash_building_blocks.base.Data`, through it; other objects
+    through their pickle. Dash components are encoded through their JSON
+    representation. Values the encoder rejects, such as dicts with keys of
+    mixed types, are walked iteratively instead. Uses `xxHash
+    <https://xxhash.com>`_ if the ``xxhash`` package is installed, BLAKE2
+    otherwise.
+
+    :param value: The value.
+    :return: The hexadecimal digest.
+    :rtype: str
+    """
+    try:
+        encoded = _json_encoder.encode(value)
+    except (TypeError, ValueError):
+        return _walk_hash(value)
+    digest = _new_hash()
+    digest.update(b'j')
+    digest.update(encoded.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def _walk_hash(value):
+    import pickle
+    import sys
+
+    np = sys.modules.get('numpy')
+    pd = sys.modules.get('pandas')
+
+    digest = _new_hash()
+    update = digest.update
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if item is None or isinstance(item, (bool, int, float, complex)):
+            update('{}{!r};'.format(type(item).__name__, item).encode())
+        elif isinstance(item, str):
+            data = item.encode('utf-8', 'surrogatepass')
+            update(b's%d:' % len(data))
+            update(data)
+        elif isinstance(item, (bytes, bytearray)):
+            update(b'b%d:' % len(item))
+            update(item)
+        elif isinstance(item, dict):
+            update(b'd%d:' % len(item))
+            for key, val in sorted(item.items(), key=_sort_key, reverse=True):
+                stack.append(val)
+                stack.append(key)
+        elif isinstance(item, (list, tuple)):
+            update(b'l%d:' % len(item))
+            stack.extend(reversed(item))
+        elif np is not None and isinstance(item, np.ndarray) and \
+                item.dtype != object:
+            update('a{}{};'.format(item.dtype.str, item.shape).encode())
+            update(memoryview(np.ascontiguousarray(item)).cast('B'))
+        elif np is not None and isinstance(item, np.generic):
+            update('g{};'.format(item.dtype.str).encode())
+            update(item.tobytes())
+        elif pd is not None and isinstance(item, (pd.DataFrame, pd.Series,
+                                                  pd.Index)):
+            update('p{}{};'.format(type(item).__name__, item.shape).encode())
+            if isinstance(item, pd.DataFrame):
+                stack.append([str(column) for column in item.columns])
+            elif isinstance(item, pd.Series):
+                stack.append(str(item.name))
+            hashed = pd.util.hash_pandas_object(
+                item, index=not isinstance(item, pd.Index))
+            update(memoryview(hashed.values).cast('B'))
+        elif callable(getattr(item, 'content_hash', None)):
+            update(b'h')
+            update(item.content_hash().encode())
+        elif hasattr(item, 'to_plotly_json'):
+            update('c{};'.format(type(item).__name__).encode())
+            stack.append(item.to_plotly_json())
+        elif np is not None and isinstance(item, np.ndarray):
+            update('o{};'.format(item.shape).encode())
+            stack.append(item.tolist())
+        else:
+            try:
+                data = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                data = repr(item).encode()
+            update(b'x%d:' % len(data))
+            update(data)
+    return digest.hexdigest()
@@ -33,10 +33,16 @@ configuration = {
     'license' : 'MIT',
     'packages' : ['dash_building_blocks'],
     'install_requires': [
-        'dash >= 0.22.0',
+        'dash >= 1.11.0',
         'dash-html-components',
         'dash-core-components'
     ],
+    'extras_require': {
+        # dash_building_blocks.dataset, .table and .downsample
+        'data': ['numpy'],
+        # dash_building_blocks.shm also requires Python 3.8 or later
+        'shm': ['numpy; python_version >= "3.8"'],
+    },
     'ext_modules' : [],
     'cmdclass' : {},
     'test_suite' : 'tests.test_suite',
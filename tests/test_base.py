@@ -4,8 +4,10 @@ from unittest import mock
 from dash.dependencies import Input, Output, State
 import dash_html_components as html
 from dash_building_blocks.base import (
-    Block, Store, Data, Component
+    Block, Store, Data, Component, DependencyCache, format_version,
+    parse_version
 )
+from dash.exceptions import PreventUpdate
 from dash_building_blocks.error import (
     ProhibitedParameterError
 )
@@ -79,6 +81,24 @@ class TestData(unittest.TestCase):
         self.assertEqual(data.to_dict(), self.kwargs)
 
 
+class TestDataContentHash(unittest.TestCase):
+
+    def test_cached(self):
+        data = Data(a=1, b=[1, 2])
+        with mock.patch('dash_building_blocks.base.content_hash',
+                        return_value='digest') as hasher:
+            self.assertEqual(data.content_hash(), 'digest')
+            self.assertEqual(data.content_hash(), 'digest')
+        hasher.assert_called_once()
+
+    def test_setattr_invalidates(self):
+        data = Data(a=1)
+        digest = data.content_hash()
+        self.assertEqual(digest, Data(a=1).content_hash())
+        data.a = 2
+        self.assertNotEqual(data.content_hash(), digest)
+
+
 class TestComponent(unittest.TestCase, ExtraAsserts):
 
     def setUp(self):
@@ -109,6 +129,36 @@ class TestComponent(unittest.TestCase, ExtraAsserts):
             self.comp.output('prop'), Output(self.id, 'prop'))
 
 
+class TestDependencyCache(unittest.TestCase, ExtraAsserts):
+
+    def setUp(self):
+        self.cache = DependencyCache()
+
+    def test_get_interns(self):
+        for kind in [Input, Output, State]:
+            dep = self.cache.get('comp', 'prop', kind)
+            self.assertEqualDependencies(dep, kind('comp', 'prop'))
+            self.assertIs(self.cache.get('comp', 'prop', kind), dep)
+
+    def test_get_tuple(self):
+        pair = self.cache.get('comp', 'prop', tuple)
+        self.assertEqual(pair, ('comp', 'prop'))
+        self.assertIs(self.cache.get('comp', 'prop', tuple), pair)
+
+    def test_kinds_are_distinct(self):
+        self.assertIsInstance(self.cache.get('comp', 'prop', Input), Input)
+        self.assertIsInstance(self.cache.get('comp', 'prop', State), State)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_component(self):
+        comp = self.cache.component('comp')
+        self.assertEqual(comp.id, 'comp')
+        self.assertIs(self.cache.component('comp'), comp)
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.cache, '__dict__'))
+
+
 class TestBaseBlock(unittest.TestCase):
 
     def test_death_instantiate(self):
@@ -201,6 +251,25 @@ class TestBlockMinimalGetDependencies(unittest.TestCase, ExtraAsserts):
         self.assertEqualDependencies(
             self.block.output(self.ucid, 'prop'), Output(self.cid, 'prop'))
 
+    def test_call(self):
+        self.assertEqual(self.block(self.ucid), self.cid)
+        self.assertEqual(self.block(self.ucid, 'prop'), (self.cid, 'prop'))
+
+    def test_interned(self):
+        self.assertIs(self.block[self.ucid], self.block[self.ucid])
+        self.assertIs(self.block(self.ucid, 'prop'),
+                      self.block(self.ucid, 'prop'))
+        for method in ['input', 'output', 'state']:
+            dep = getattr(self.block, method)(self.ucid, 'prop')
+            self.assertIs(getattr(self.block, method)(self.ucid, 'prop'), dep)
+
+    def test_interned_follows_reregister(self):
+        dep = self.block.output(self.ucid, 'prop')
+        self.block.register(self.ucid, global_id='other')
+        self.assertEqualDependencies(
+            self.block.output(self.ucid, 'prop'), Output('other', 'prop'))
+        self.assertIsNot(self.block.output(self.ucid, 'prop'), dep)
+
 
 class TestHelloWorld(unittest.TestCase):
 
@@ -376,5 +445,51 @@ class TestStoreGetDependencies(unittest.TestCase, ExtraAsserts):
             self.store.output(self.ucid), Output(self.cid, 'children'))
             
 
+class TestStoreVersioned(unittest.TestCase, ExtraAsserts):
+
+    def setUp(self):
+        app = mock.Mock()
+        self.store = Store(app, id='store')
+
+    def test_parse_version(self):
+        self.assertEqual(parse_version(format_version(3, 'abc')), (3, 'abc'))
+        self.assertEqual(parse_version(''), (0, ''))
+
+    def test_layout(self):
+        self.store.register('plain')
+        self.store.register('item', initially='x', versioned=True)
+        plain, item = self.store.layout.children
+        self.assertEqual(len(plain.children), 2)
+        version = item.children[2]
+        self.assertEqual(version.id, 'store-item-version')
+        self.assertEqual(parse_version(version.children)[0], 0)
+
+    def test_version_dependency(self):
+        self.store.register('item', versioned=True)
+        self.assertEqualDependencies(
+            self.store.version('item'), Input('store-item-version', 'children'))
+        self.store.register('plain')
+        self.assertRaises(KeyError, self.store.version, 'plain')
+
+    def test_register_versioned(self):
+        values = iter(['a', 'a', 'b'])
+        self.store.register('item', inputs=[Input('in', 'value')],
+                            versioned=True)(lambda value: next(values))
+
+        args, _ = self.store.app.callback.call_args
+        outputs, inputs, state = args
+        self.assertEqual([o.component_id for o in outputs],
+                         ['store-item', 'store-item-version'])
+        self.assertEqual(state[-1].component_id, 'store-item-version')
+        update = self.store.app.callback.return_value.call_args[0][0]
+
+        value, version = update(1, '')
+        self.assertEqual(value, 'a')
+        self.assertEqual(parse_version(version)[0], 1)
+        self.assertRaises(PreventUpdate, update, 2, version)
+        value, version = update(3, version)
+        self.assertEqual((value, parse_version(version)[0]), ('b', 2))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,120 @@
+import threading
+import unittest
+from unittest import mock
+
+import dash
+import dash_html_components as html
+from dash.dependencies import Input, Output
+from dash.exceptions import PreventUpdate
+from dash_building_blocks.base import Block
+from dash_building_blocks.batch import Batch
+
+from .test_graph import dispatch
+
+
+class Panel(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div([html.Div(id=self.register('out')),
+                         html.Div(id=self.register('setting'))])
+
+    def update(self, date, setting):
+        return '{} {} {}'.format(self._uid, date, setting)
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = mock.Mock()
+        self.batch = Batch(self.app, inputs=[Input('date', 'value')])
+
+    def test_callbacks(self):
+        panels = [Panel(self.app, id=str(i)) for i in range(3)]
+        for panel in panels:
+            self.batch.subscribe(panel.output('out'),
+                                 state=[panel.state('setting')])(panel.update)
+        self.batch.callbacks()
+
+        self.app.callback.assert_called_once()
+        outputs, inputs, state = self.app.callback.call_args[0]
+        self.assertEqual(len(outputs), 3)
+        self.assertEqual(inputs, self.batch.inputs)
+        self.assertEqual([s.component_id for s in state],
+                         [p('setting') for p in panels])
+
+        values = self.batch.execute('d', 's0', 's1', 's2')
+        self.assertEqual(values, ['0 d s0', '1 d s1', '2 d s2'])
+
+    def test_no_subscribers(self):
+        self.batch.callbacks()
+        self.app.callback.assert_not_called()
+
+    def test_preamble_runs_once(self):
+        preamble = mock.Mock(return_value=('parsed',))
+        self.batch.preamble(preamble)
+        for name in 'ab':
+            self.batch.subscribe(Output(name, 'children'))(lambda d: d)
+
+        self.assertEqual(self.batch.execute('raw'), ['parsed', 'parsed'])
+        preamble.assert_called_once_with('raw')
+
+    def test_concurrent(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def handler(date):
+            barrier.wait()
+            return threading.get_ident()
+
+        for name in 'abc':
+            self.batch.subscribe(Output(name, 'children'))(handler)
+        self.assertEqual(len(set(self.batch.execute('d'))), 3)
+
+    def test_sequential(self):
+        batch = Batch(self.app, [Input('date', 'value')], max_workers=1)
+        for name in 'ab':
+            batch.subscribe(Output(name, 'children'))(
+                lambda d: threading.get_ident())
+        self.assertEqual(batch.execute('d'), [threading.get_ident()] * 2)
+
+    def test_prevent_update(self):
+        def prevent(date):
+            raise PreventUpdate
+
+        self.batch.subscribe(Output('a', 'children'))(prevent)
+        self.batch.subscribe(Output('b', 'children'))(lambda d: d)
+        self.assertEqual(self.batch.execute('d'), [dash.no_update, 'd'])
+
+        self.batch.subscribers.pop()
+        with self.assertRaises(PreventUpdate):
+            self.batch.execute('d')
+
+    def test_error(self):
+        def fail(date):
+            raise ValueError(date)
+
+        self.batch.subscribe(Output('a', 'children'))(fail)
+        self.batch.subscribe(Output('b', 'children'))(lambda d: d)
+        with self.assertRaises(ValueError):
+            self.batch.execute('d')
+
+
+class TestBatchRequest(unittest.TestCase):
+
+    def test_callback_context_in_handlers(self):
+        app = dash.Dash(__name__)
+        app.layout = html.Div([html.Div(id=i) for i in ['date', 'a', 'b']])
+        batch = Batch(app, inputs=[Input('date', 'value')])
+        for name in 'ab':
+            batch.subscribe(Output(name, 'children'))(
+                lambda d: dash.callback_context.triggered[0]['prop_id'])
+        batch.callbacks()
+
+        response = dispatch(app, [('a', 'children'), ('b', 'children')],
+                            [('date', 'value', 'today')])
+        self.assertEqual(response['a']['children'], 'date.value')
+        self.assertEqual(response['b']['children'], 'date.value')
+
+
+if __name__ == '__main__':
+    unittest.main()
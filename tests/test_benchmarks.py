@@ -0,0 +1,188 @@
+import gc
+import random
+import timeit
+import tracemalloc
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from dash.dependencies import Input, Output, State
+import dash_html_components as html
+from dash_building_blocks.base import Block, Component, Data
+from dash_building_blocks.util import _walk_hash, content_hash
+
+
+N_BLOCKS = 1000
+N_PASSES = 5
+N_INSTANCES = 10000
+#: Budget in bytes of a block without layout, its ids, data and caches.
+BLOCK_FOOTPRINT = 1024
+N_TIMINGS = 7
+
+
+class Panel(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div([
+            html.Div(id=self.register('graph')),
+            html.Div(id=self.register('dropdown'))
+        ])
+
+
+class Minimal(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return None
+
+
+class DictData:
+    """Reference :class:`Data` implementation with a per-instance
+    ``__dict__``.
+    """
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class DictComponent:
+    """Reference :class:`Component` implementation with a per-instance
+    ``__dict__``.
+    """
+    def __init__(self, id):
+        self.id = id
+
+
+def build_dependencies(blocks):
+    return [
+        [block.output('graph', 'figure'),
+         block.input('dropdown', 'value'),
+         block.state('dropdown', 'options'),
+         block('graph', 'figure')]
+        for block in blocks
+    ]
+
+
+def build_dependencies_uninterned(blocks):
+    return [
+        [Output(block.ids['graph'], 'figure'),
+         Input(block.ids['dropdown'], 'value'),
+         State(block.ids['dropdown'], 'options'),
+         (block.ids['graph'], 'figure')]
+        for block in blocks
+    ]
+
+
+def measure(func, *args):
+    """Return the number of bytes retained by the results of running *func*
+    :data:`N_PASSES` times, the way registered callbacks retain their
+    dependencies.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        results = []
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(N_PASSES):
+            results.append(func(*args))
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return after - before
+
+
+def best_time(func, *args):
+    """Return the best of :data:`N_TIMINGS` timings of three calls of
+    *func*.
+    """
+    return min(timeit.repeat(lambda: func(*args), number=3,
+                             repeat=N_TIMINGS))
+
+
+def footprint(factory):
+    """Return the number of bytes retained per instance created by
+    *factory*, averaged over :data:`N_INSTANCES` instances.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        instances = [factory(str(i)) for i in range(N_INSTANCES)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del instances
+    return (after - before) / N_INSTANCES
+
+
+class TestFootprint(unittest.TestCase):
+    """Memory benchmark: apps with 10k+ blocks keep a :class:`Data` per
+    block and create a :class:`Component` per ``block[key]`` access.
+    """
+
+    def test_data(self):
+        self.assertLess(footprint(lambda i: Data()),
+                        footprint(lambda i: DictData()) / 2)
+        self.assertLessEqual(footprint(lambda i: Data(value=i)),
+                             footprint(lambda i: DictData(value=i)))
+
+    def test_component(self):
+        self.assertLess(footprint(Component),
+                        footprint(DictComponent) * 0.75)
+
+    def test_block(self):
+        self.assertLess(footprint(lambda i: Minimal(id=i)), BLOCK_FOOTPRINT)
+
+
+class TestDependencyAllocation(unittest.TestCase):
+    """Startup benchmark: building callbacks in a loop over many blocks
+    should only allocate dependency objects on the first pass.
+    """
+
+    def setUp(self):
+        self.blocks = [Panel(id=str(i)) for i in range(N_BLOCKS)]
+        # warm the interning caches, as the first callback pass would
+        build_dependencies(self.blocks)
+
+    def test_repeated_dependencies_do_not_allocate(self):
+
+        baseline = measure(build_dependencies_uninterned, self.blocks)
+        interned = measure(build_dependencies, self.blocks)
+
+        # interned passes only pay for the lists holding the references
+        self.assertLess(interned, baseline / 3)
+
+
+class TestContentHash(unittest.TestCase):
+    """Speed benchmark: figures and other plain JSON values are hashed for
+    cache keys and versions on every callback.
+    """
+
+    def setUp(self):
+        rand = random.Random(0)
+        self.figure = {
+            'data': [{'x': list(range(2000)),
+                      'y': [rand.random() for _ in range(2000)],
+                      'name': 'trace {}'.format(i), 'type': 'scatter'}
+                     for i in range(5)],
+            'layout': {'title': 'figure', 'xaxis': {'range': [0, 2000]}}
+        }
+
+    def test_json_faster_than_walk(self):
+        self.assertLess(best_time(content_hash, self.figure),
+                        best_time(_walk_hash, self.figure) / 1.5)
+
+    @unittest.skipIf(np is None, 'requires numpy')
+    def test_array_leaves_faster_than_walk(self):
+        # one array per trace must not send the whole figure to the walk
+        for trace in self.figure['data']:
+            trace['x'] = np.arange(len(trace['x']))
+        self.assertLess(best_time(content_hash, self.figure),
+                        best_time(_walk_hash, self.figure) / 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from dash.dependencies import Input
+import dash_html_components as html
+from dash_building_blocks.base import Block, Store
+from dash_building_blocks.cache import SharedCache, make_key
+
+
+class Expensive(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div(id=self.register('div'))
+
+
+def _set_from_child(path):
+    SharedCache(path).set('child', 'from child', tags=['worker'])
+
+
+class TestMakeKey(unittest.TestCase):
+
+    def test_deterministic(self):
+        self.assertEqual(make_key('ns', (1, 'a')), make_key('ns', (1, 'a')))
+
+    def test_distinct(self):
+        keys = {make_key('ns', (1,)), make_key('ns', (2,)),
+                make_key('other', (1,)), make_key('ns', (1,), {'k': 1})}
+        self.assertEqual(len(keys), 4)
+
+
+class TestSharedCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'cache.sqlite')
+        self.cache = SharedCache(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.get('key', 'default'), 'default')
+        self.cache.set('key', {'answer': [42]})
+        self.assertEqual(self.cache.get('key'), {'answer': [42]})
+        self.assertEqual(len(self.cache), 1)
+
+    def test_shared_between_instances(self):
+        self.cache.set('key', 'value')
+        self.assertEqual(SharedCache(self.path).get('key'), 'value')
+
+    def test_shared_between_processes(self):
+        proc = multiprocessing.get_context('spawn').Process(
+            target=_set_from_child, args=(self.path,))
+        proc.start()
+        proc.join()
+        self.assertEqual(self.cache.get('child'), 'from child')
+        self.assertEqual(self.cache.invalidate('worker'), 1)
+
+    def test_ttl(self):
+        self.cache.set('short', 1, ttl=0.05)
+        self.cache.set('long', 2, ttl=60)
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get('short'))
+        self.assertEqual(self.cache.get('long'), 2)
+
+    def test_default_ttl(self):
+        cache = SharedCache(self.path, ttl=0.05)
+        cache.set('key', 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('key'))
+
+    def test_size_eviction(self):
+        cache = SharedCache(self.path, max_size=3100)
+        for i in range(3):
+            cache.set(str(i), b'x' * 1000)
+            time.sleep(0.01)
+        cache.get('0')
+        cache.set('3', b'x' * 1000)
+
+        self.assertEqual(cache.get('0'), b'x' * 1000)
+        self.assertIsNone(cache.get('1'))
+        self.assertEqual(len(cache), 3)
+
+    def test_invalidate(self):
+        self.cache.set('a', 1, tags=['class-a', 'prices'])
+        self.cache.set('b', 2, tags=['class-b', 'prices'])
+        self.cache.set('c', 3, tags=['class-b'])
+
+        self.assertEqual(self.cache.invalidate('class-a'), 1)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.invalidate('prices'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('c'), 3)
+
+    def test_clear(self):
+        self.cache.set('a', 1, tags=['tag'])
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_memoize(self):
+        func = mock.Mock(return_value='result')
+        func.__name__ = 'func'
+        memoized = self.cache.memoize('ns', tags=['tag'])(func)
+
+        self.assertEqual(memoized(1, 2), 'result')
+        self.assertEqual(memoized(1, 2), 'result')
+        func.assert_called_once_with(1, 2)
+
+        memoized(3, 4)
+        self.assertEqual(func.call_count, 2)
+
+        self.cache.invalidate('tag')
+        memoized(1, 2)
+        self.assertEqual(func.call_count, 3)
+
+    def test_memoize_caches_none(self):
+        func = mock.Mock(return_value=None)
+        func.__name__ = 'func'
+        memoized = self.cache.memoize('ns')(func)
+        memoized()
+        memoized()
+        func.assert_called_once_with()
+
+
+class TestCachedCallbacks(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = SharedCache(os.path.join(self.dir, 'cache.sqlite'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_block_callback(self):
+        app = mock.Mock()
+        block = Expensive(app, id='1')
+        func = mock.Mock(return_value='out')
+        func.__name__ = 'update'
+
+        block.callback(block.output('div'), [Input('in', 'value')],
+                       cache=self.cache)(func)
+        wrapped = app.callback.return_value.call_args[0][0]
+
+        self.assertEqual(wrapped('x'), 'out')
+        self.assertEqual(wrapped('x'), 'out')
+        func.assert_called_once_with('x')
+
+        self.assertEqual(self.cache.invalidate(block.class_id), 1)
+        wrapped('x')
+        self.assertEqual(func.call_count, 2)
+
+    def test_store_register(self):
+        app = mock.Mock()
+        store = Store(app, id='store')
+        func = mock.Mock(return_value='out')
+        func.__name__ = 'update'
+
+        store.register('item', inputs=[Input('in', 'value')],
+                       cache=self.cache)(func)
+        wrapped = app.callback.return_value.call_args[0][0]
+
+        wrapped('x')
+        wrapped('x')
+        func.assert_called_once_with('x')
+        self.assertEqual(self.cache.invalidate(store.ids['item']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import threading
+import unittest
+import warnings
+from unittest import mock
+
+import flask
+from dash.dependencies import Input
+from dash.exceptions import PreventUpdate
+import dash_html_components as html
+from dash_building_blocks.base import Block
+from dash_building_blocks.cancel import (
+    Generations,
+    checkpoint,
+    is_stale,
+    latest_wins
+)
+from dash_building_blocks.error import StaleCallbackError
+from dash_building_blocks.util import SESSION_FIELD, enable_sessions
+
+
+class Slow(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div(id=self.register('out'))
+
+
+class TestGenerations(unittest.TestCase):
+
+    def test_next(self):
+        generations = Generations()
+        first = generations.next('key')
+        self.assertTrue(generations.is_current('key', first))
+        second = generations.next('key')
+        self.assertGreater(second, first)
+        self.assertFalse(generations.is_current('key', first))
+        self.assertTrue(generations.is_current('key', second))
+        self.assertEqual(generations.next('other'), second + 1)
+
+    def test_finish(self):
+        generations = Generations()
+        first = generations.next('key')
+        second = generations.next('key')
+        self.assertFalse(generations.finish('key', first))
+        self.assertEqual(len(generations), 1)
+        self.assertTrue(generations.finish('key', second))
+        self.assertEqual(len(generations), 0)
+        self.assertFalse(generations.is_current('key', second))
+        self.assertGreater(generations.next('key'), second)
+
+
+class TestLatestWins(unittest.TestCase):
+
+    def setUp(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.results = {}
+
+        @latest_wins('test:{}'.format(id(self)))
+        def work(name, wait):
+            if wait:
+                self.started.set()
+                self.release.wait(5)
+            checkpoint()
+            return name
+
+        self.work = work
+
+    def run_in_thread(self, name, wait):
+        def target():
+            try:
+                self.results[name] = self.work(name, wait)
+            except PreventUpdate as error:
+                self.results[name] = error
+        thread = threading.Thread(target=target)
+        thread.start()
+        return thread
+
+    def test_single(self):
+        self.assertEqual(self.work('only', False), 'only')
+
+    def test_stale_invocation_dropped(self):
+        old = self.run_in_thread('old', True)
+        self.started.wait(5)
+        self.assertEqual(self.work('new', False), 'new')
+        self.release.set()
+        old.join(5)
+        self.assertIsInstance(self.results['old'], StaleCallbackError)
+
+    def test_stale_result_dropped_without_checkpoint(self):
+        @latest_wins('no-checkpoint:{}'.format(id(self)))
+        def work(wait):
+            if wait:
+                self.started.set()
+                self.release.wait(5)
+            return wait
+
+        def target():
+            try:
+                self.results['old'] = work(True)
+            except PreventUpdate as error:
+                self.results['old'] = error
+
+        old = threading.Thread(target=target)
+        old.start()
+        self.started.wait(5)
+        self.assertFalse(work(False))
+        self.release.set()
+        old.join(5)
+        self.assertIsInstance(self.results['old'], StaleCallbackError)
+
+    def test_other_client_not_superseded(self):
+        app = flask.Flask(__name__)
+
+        def target():
+            with app.test_request_context(json={SESSION_FIELD: 'a'}):
+                try:
+                    self.results['a'] = self.work('a', True)
+                except PreventUpdate as error:
+                    self.results['a'] = error
+
+        first = threading.Thread(target=target)
+        first.start()
+        self.started.wait(5)
+        with app.test_request_context(json={SESSION_FIELD: 'b'}):
+            self.assertEqual(self.work('b', False), 'b')
+        self.release.set()
+        first.join(5)
+        self.assertEqual(self.results['a'], 'a')
+
+    def test_generations_forgotten(self):
+        from dash_building_blocks.cancel import generations
+        app = flask.Flask(__name__)
+        for session in 'abc':
+            with app.test_request_context(json={SESSION_FIELD: session}):
+                self.work(session, False)
+        self.assertFalse(any(key[0] == 'test:{}'.format(id(self))
+                             for key in generations._latest))
+
+    def test_outside_callbacks(self):
+        self.assertFalse(is_stale())
+        checkpoint()
+
+
+class TestBlockLatestWins(unittest.TestCase):
+
+    def test_callback_option(self):
+        app = mock.Mock()
+        block = Slow(app)
+        func = mock.Mock(return_value='out')
+        func.__name__ = 'update'
+
+        with self.assertWarnsRegex(UserWarning, 'enable_sessions'):
+            block.callback(block.output('out'), [Input('in', 'value')],
+                           latest_wins=True)(func)
+        app.callback.assert_called_once_with(
+            block.output('out'), [Input('in', 'value')])
+        wrapped = app.callback.return_value.call_args[0][0]
+        self.assertIsNot(wrapped, func)
+        self.assertEqual(wrapped('x'), 'out')
+
+    def test_no_warning_with_sessions(self):
+        app = enable_sessions(mock.Mock())
+        block = Slow(app)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            block.callback(block.output('out'), [Input('in', 'value')],
+                           latest_wins=True)
+
+    def test_stale_error_prevents_update(self):
+        self.assertTrue(issubclass(StaleCallbackError, PreventUpdate))
+
+
+if __name__ == '__main__':
+    unittest.main()
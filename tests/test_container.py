@@ -0,0 +1,89 @@
+import unittest
+
+import dash
+import dash_core_components as dcc
+import dash_html_components as html
+from dash.dependencies import MATCH
+from dash_building_blocks.container import Container, PatternBlock
+
+
+class Panel(PatternBlock):
+
+    def layout(self):
+        return html.Div([dcc.Input(id=self.register('text')),
+                         html.Div(id=self.register('echo'))])
+
+    def callbacks(self):
+        @self.callback(self.output('echo'), [self.input('text', 'value')])
+        def echo(value):
+            return value
+
+
+class TestPatternBlock(unittest.TestCase):
+
+    def setUp(self):
+        self.app = dash.Dash(__name__)
+
+    def test_register(self):
+        panel = Panel(self.app, id='a')
+        self.assertEqual(panel.ids['text'], {'type': 'panel-text',
+                                             'index': 'a'})
+        self.assertEqual(panel.layout.children[0].id, panel.ids['text'])
+
+    def test_dependencies_match(self):
+        first, second = Panel(self.app, id='a'), Panel(self.app, id='b')
+        dep = first.input('text', 'value')
+        self.assertEqual(dep.component_id, {'type': 'panel-text',
+                                            'index': MATCH})
+        self.assertEqual(dep, second.input('text', 'value'))
+        self.assertIs(dep, first.input('text', 'value'))
+
+    def test_callbacks_registered_once(self):
+        for uid in 'abc':
+            Panel(self.app, id=uid).callbacks()
+        self.assertEqual(len(self.app.callback_map), 1)
+        Panel(dash.Dash(__name__), id='a').callbacks()
+        self.assertEqual(len(self.app.callback_map), 1)
+
+
+class TestContainer(unittest.TestCase):
+
+    def setUp(self):
+        self.app = dash.Dash(__name__)
+        self.first = Panel(self.app, id='a')
+        self.container = Container(self.app, id='panels',
+                                   children=[self.first])
+        self.container.patch = None
+        self.children = [self.container.layout.children[0].to_plotly_json()]
+
+    def test_layout(self):
+        item = self.container.layout.children[0]
+        self.assertEqual(self.container.layout.id, 'container-panels-children')
+        self.assertEqual(item.id, {'type': 'container-panels-item',
+                                   'index': 'a'})
+        self.assertIs(item.children, self.first.layout)
+
+    def test_append_and_insert(self):
+        children = self.container.append(Panel(self.app, id='b'),
+                                          self.children)
+        self.assertEqual(len(children), 2)
+        self.assertIs(children[0], self.children[0])
+        self.assertEqual(children[1].id['index'], 'b')
+
+        children = self.container.insert(0, Panel(self.app, id='c'), children)
+        self.assertEqual([self.container.index(uid, children)
+                          for uid in 'cab'], [0, 1, 2])
+
+    def test_remove(self):
+        children = self.container.append(Panel(self.app, id='b'),
+                                          self.children)
+        self.assertEqual(self.container.remove(self.first, children),
+                         children[1:])
+        self.assertEqual(self.container.remove('b', children), children[:1])
+        self.assertEqual(self.container.remove(0, children), children[1:])
+        with self.assertRaises(ValueError):
+            self.container.remove('z', children)
+
+    def test_requires_children_without_patch(self):
+        with self.assertRaises(ValueError):
+            self.container.append(Panel(self.app, id='b'))
@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+    from dash_building_blocks.dataset import (
+        Dataset,
+        DatasetBlock,
+        DatasetView
+    )
+except ImportError:
+    np = None
+
+import dash_html_components as html
+
+
+if np is not None:
+
+    class Trades(DatasetBlock):
+
+        # pylint: disable=E0202
+        def layout(self):
+            return html.Div(id=self.register('graph'))
+
+
+@unittest.skipIf(np is None, 'requires numpy')
+class TestDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'trades')
+        self.time = np.arange(100, dtype='int64')
+        self.price = np.array([i % 7 for i in range(100)], dtype='float64')
+        Dataset.write(self.path, time=self.time, price=self.price)
+        self.dataset = Dataset(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_columns(self):
+        self.assertEqual(self.dataset.columns, ['price', 'time'])
+        self.assertEqual(len(self.dataset), 100)
+        self.assertIsInstance(self.dataset.column('time'), np.memmap)
+
+    def test_mismatched_lengths(self):
+        Dataset.write(self.path, short=np.zeros(3))
+        with self.assertRaises(ValueError):
+            Dataset(self.path)
+
+    def test_open_shared(self):
+        self.assertIs(Dataset.open(self.path), Dataset.open(self.path))
+
+    def test_view_slicing_is_lazy(self):
+        view = self.dataset.view()[10:50][::2]
+        self.assertIsInstance(view, DatasetView)
+        self.assertIsInstance(view.rows, slice)
+        self.assertEqual(len(view), 20)
+        np.testing.assert_array_equal(view['time'], self.time[10:50:2])
+
+    def test_view_reversed(self):
+        view = self.dataset.view()[::-1][:5]
+        np.testing.assert_array_equal(view['time'], [99, 98, 97, 96, 95])
+
+    def test_view_fancy(self):
+        view = self.dataset.view()[[1, 3, 5]]
+        np.testing.assert_array_equal(view['price'], self.price[[1, 3, 5]])
+
+    def test_index_files(self):
+        self.dataset.index('price')
+        self.assertTrue(os.path.exists(
+            os.path.join(self.path, 'price.perm.npy')))
+        self.assertEqual(Dataset(self.path).columns, ['price', 'time'])
+
+    def test_rewrite_rebuilds_index(self):
+        Dataset.open(self.path).view().where('price', 2, 3)
+        Dataset.write(self.path, price=self.price[::-1].copy())
+        view = Dataset.open(self.path).view().where('price', 2, 3)
+        expected = np.flatnonzero((self.price[::-1] >= 2) &
+                                  (self.price[::-1] <= 3))
+        np.testing.assert_array_equal(view.rows, expected)
+
+    def test_stale_index_detected(self):
+        self.dataset.index('price')
+        # replaced behind the back of Dataset.write, e.g. by another tool
+        np.save(os.path.join(self.path, 'price.npy'), self.price[::-1])
+        os.utime(os.path.join(self.path, 'price.npy'), ns=(1, 1))
+        index = Dataset(self.path).index('price')
+        np.testing.assert_array_equal(index.sorted, np.sort(self.price))
+        np.testing.assert_array_equal(
+            index.range(6, 6), np.flatnonzero(self.price[::-1] == 6))
+
+    def test_no_temporary_files(self):
+        self.dataset.index('time')
+        self.assertFalse([name for name in os.listdir(self.path)
+                          if name.endswith('.tmp')])
+
+    def test_where(self):
+        view = self.dataset.view().where('price', 2, 3)
+        expected = np.flatnonzero((self.price >= 2) & (self.price <= 3))
+        np.testing.assert_array_equal(view.rows, expected)
+        np.testing.assert_array_equal(view['time'], self.time[expected])
+
+    def test_where_unbounded(self):
+        self.assertEqual(len(self.dataset.view().where('time', low=90)), 10)
+        self.assertEqual(len(self.dataset.view().where('time', high=9)), 10)
+
+    def test_equals_composes(self):
+        view = self.dataset.view()[0:50:2].equals('price', 0)
+        expected = [t for t in range(0, 50, 2) if t % 7 == 0]
+        np.testing.assert_array_equal(view['time'], expected)
+
+        view = view.where('time', 20, 40)
+        np.testing.assert_array_equal(view['time'], [28])
+
+    def test_to_dict(self):
+        data = self.dataset.view()[:3].to_dict(['time'])
+        self.assertEqual(list(data), ['time'])
+        np.testing.assert_array_equal(data['time'], [0, 1, 2])
+
+
+@unittest.skipIf(np is None, 'requires numpy')
+class TestDatasetBlock(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        Dataset.write(self.dir, x=np.arange(10))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_shared_dataset(self):
+        first = Trades(data={'dataset': self.dir})
+        second = Trades(data={'dataset': self.dir})
+        self.assertIs(first.dataset, second.dataset)
+        np.testing.assert_array_equal(first.view()[-2:]['x'], [8, 9])
+
+
+if __name__ == '__main__':
+    unittest.main()
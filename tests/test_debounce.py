@@ -0,0 +1,180 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import dash_core_components as dcc
+import dash_html_components as html
+from dash.dependencies import Input
+from dash.exceptions import PreventUpdate
+from dash_building_blocks import debounce
+from dash_building_blocks.base import Block
+from dash_building_blocks.debounce import RateLimiter, find_limit
+
+
+class Search(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div([
+            dcc.Input(id=self.register('query'), type='text'),
+            dcc.Slider(id=self.register('slider')),
+            html.Div(id=self.register('results'))
+        ])
+
+
+class TestLimits(unittest.TestCase):
+
+    def test_find_limit(self):
+        a = debounce.limited(Input('a', 'value'), debounce.THROTTLE, 1.0)
+        b = debounce.limited(Input('b', 'value'), debounce.DEBOUNCE, 0.1)
+        c = debounce.limited(Input('c', 'value'), debounce.DEBOUNCE, 0.2)
+
+        self.assertIsNone(find_limit([Input('d', 'value')]))
+        self.assertEqual(find_limit([a]), (debounce.THROTTLE, 1.0))
+        self.assertEqual(find_limit([a, b, c]), (debounce.DEBOUNCE, 0.2))
+
+    def test_pattern_matching_id(self):
+        dep = debounce.limited(Input({'type': 'item', 'index': 1}, 'value'),
+                               debounce.THROTTLE, 1.0)
+        self.assertEqual(find_limit([dep]), (debounce.THROTTLE, 1.0))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            debounce.limited(Input('a', 'value'), 'sometimes', 1)
+
+    def test_original_unchanged(self):
+        dep = Input('a', 'value')
+        limited = debounce.limited(dep, debounce.DEBOUNCE, 0.5)
+        self.assertIsInstance(limited, Input)
+        self.assertEqual(limited, dep)
+        self.assertIsNone(find_limit([dep]))
+
+
+class TestBlockInputLimits(unittest.TestCase):
+
+    def setUp(self):
+        self.app = mock.Mock()
+        self.block = Search(self.app)
+
+    def component(self, local_id):
+        for component in self.block.layout._traverse():
+            if getattr(component, 'id', None) == self.block(local_id):
+                return component
+
+    def test_component_side_debounce(self):
+        with self.assertWarnsRegex(UserWarning, 'Enter or blur'):
+            dep = self.block.input('query', 'value', debounce=0.3)
+        self.assertTrue(self.component('query').debounce)
+        self.assertIsNone(find_limit([dep]))
+
+    def test_limits_are_per_block(self):
+        self.block.input('slider', 'value', debounce=0.3)
+        other = Search(self.app)
+        self.assertEqual(other._limits, [])
+        self.assertIsNone(find_limit([other.input('slider', 'value')]))
+        with mock.patch.object(debounce, 'apply_to_layout') as apply:
+            Search(self.app)
+        apply.assert_not_called()
+
+    def test_shared_input_not_limited(self):
+        plain = self.block.input('slider', 'value')
+        dep = self.block.input('slider', 'value', debounce=0.5)
+        self.assertIsNot(dep, plain)
+        self.assertIs(plain, self.block.input('slider', 'value'))
+        self.assertIsNone(find_limit([plain]))
+        throttled = self.block.input('slider', 'value', throttle=1)
+        self.assertEqual(find_limit([dep]), (debounce.DEBOUNCE, 0.5))
+        self.assertEqual(find_limit([throttled]), (debounce.THROTTLE, 1))
+
+    def test_server_side_debounce(self):
+        dep = self.block.input('slider', 'value', debounce=0.3)
+        self.assertEqual(find_limit([dep]), (debounce.DEBOUNCE, 0.3))
+
+    def test_throttle(self):
+        dep = self.block.input('query', 'value', throttle=1)
+        self.assertFalse(getattr(self.component('query'), 'debounce', False))
+        self.assertEqual(find_limit([dep]), (debounce.THROTTLE, 1))
+
+    def test_callback_wrapped(self):
+        func = mock.Mock(return_value='out')
+        func.__name__ = 'update'
+        self.block.callback(
+            self.block.output('results'),
+            [self.block.input('slider', 'value', debounce=0.01)]
+        )(func)
+        wrapped = self.app.callback.return_value.call_args[0][0]
+        self.assertIsNot(wrapped, func)
+        self.assertEqual(wrapped(1), 'out')
+
+    def test_callback_unwrapped(self):
+        register = self.block.callback(self.block.output('results'),
+                                       [self.block.input('slider', 'value')])
+        self.assertIs(register, self.app.callback.return_value)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def burst(self, wrapped, values, spacing):
+        results = {}
+
+        def call(value):
+            try:
+                results[value] = wrapped(value)
+            except PreventUpdate:
+                results[value] = None
+
+        threads = []
+        for value in values:
+            thread = threading.Thread(target=call, args=(value,))
+            thread.start()
+            threads.append(thread)
+            time.sleep(spacing)
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_debounce(self):
+        func = mock.Mock(side_effect=lambda value: value)
+        wrapped = RateLimiter(debounce.DEBOUNCE, 0.1).wrap('ns')(func)
+        results = self.burst(wrapped, [1, 2, 3], 0.01)
+        self.assertEqual(results, {1: None, 2: None, 3: 3})
+        func.assert_called_once_with(3)
+
+    def test_debounce_spaced(self):
+        wrapped = RateLimiter(debounce.DEBOUNCE, 0.01).wrap('ns')(
+            lambda value: value)
+        self.assertEqual(self.burst(wrapped, [1, 2], 0.1), {1: 1, 2: 2})
+
+    def test_throttle(self):
+        func = mock.Mock(side_effect=lambda value: value)
+        wrapped = RateLimiter(debounce.THROTTLE, 0.2).wrap('ns')(func)
+        results = self.burst(wrapped, [1, 2, 3], 0.02)
+        # leading call runs at once, the burst collapses to its last value
+        self.assertEqual(results, {1: 1, 2: None, 3: 3})
+
+    def test_namespaces_independent(self):
+        limiter = RateLimiter(debounce.DEBOUNCE, 0.05)
+        first = limiter.wrap('a')(lambda value: value)
+        second = limiter.wrap('b')(lambda value: value)
+        results = {}
+        thread = threading.Thread(
+            target=lambda: results.update(a=first('a')))
+        thread.start()
+        results['b'] = second('b')
+        thread.join(5)
+        self.assertEqual(results, {'a': 'a', 'b': 'b'})
+
+    def test_state_forgotten(self):
+        limiter = RateLimiter(debounce.THROTTLE, 0.01)
+        first = limiter.wrap('a')(lambda value: value)
+        second = limiter.wrap('b')(lambda value: value)
+        first(1)
+        time.sleep(0.02)
+        second(2)
+        self.assertEqual(len(limiter._generations), 0)
+        self.assertEqual(list(limiter._last_run), [('b', '')])
+
+
+if __name__ == '__main__':
+    unittest.main()
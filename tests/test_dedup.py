@@ -0,0 +1,111 @@
+import unittest
+
+import dash
+import dash_html_components as html
+from dash.dependencies import Output, State
+from dash.exceptions import PreventUpdate
+from dash_building_blocks.base import Block
+from dash_building_blocks.dedup import current_state, unchanged
+from dash_building_blocks.experimental.common import togglable
+
+from .test_graph import dispatch
+
+
+class Toggle(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div([html.Div(id=self.register('tabs')),
+                         html.Div(id=self.register('content')),
+                         html.Div(id=self.register('other'))])
+
+    def callbacks(self):
+        @self.callback([self.output('content', 'style'),
+                        self.output('other')],
+                       [self.input('tabs', 'title')],
+                       dedup=True)
+        def toggle(value):
+            style = {'display': 'block' if value == 'a' else 'none'}
+            return style, value
+
+
+class TestUnchanged(unittest.TestCase):
+
+    def test_single(self):
+        func = unchanged()(lambda value: value)
+        self.assertEqual(func('a', 'b'), 'a')
+        self.assertRaises(PreventUpdate, func, 'a', 'a')
+
+    def test_multi(self):
+        func = unchanged(2)(lambda: [1, 3])
+        self.assertEqual(func(1, 2), [dash.no_update, 3])
+        self.assertRaises(PreventUpdate, func, 1, 3)
+
+    def test_json_form(self):
+        func = unchanged()(lambda: (1, 2))
+        self.assertRaises(PreventUpdate, func, [1, 2])
+
+    def test_current_state(self):
+        state, = current_state([Output('content', 'style')])
+        self.assertIsInstance(state, State)
+        self.assertEqual(state.component_id, 'content')
+        self.assertEqual(state.component_property, 'style')
+
+
+class TestBlockDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.app = dash.Dash(__name__)
+        self.block = Toggle(self.app, id='dedup')
+        self.app.layout = self.block.layout
+        self.block.callbacks()
+        self.outputs = [(self.block.ids['content'], 'style'),
+                        (self.block.ids['other'], 'children')]
+
+    def request(self, value, current=(None, None), changed=None):
+        return dispatch(self.app, self.outputs,
+                        [(self.block.ids['tabs'], 'title', value)],
+                        state=[o + (c,) for o, c in zip(self.outputs, current)],
+                        changed=changed)
+
+    def test_dedup(self):
+        response = self.request('a')
+        self.assertEqual(response[self.block.ids['content']]['style'],
+                         {'display': 'block'})
+        response = self.request('c', current=({'display': 'block'}, 'a'))
+        self.assertIn(self.block.ids['content'], response)
+        response = self.request('b', current=({'display': 'none'}, 'c'))
+        self.assertNotIn(self.block.ids['content'], response)
+        self.assertEqual(response[self.block.ids['other']]['children'], 'b')
+        self.assertIsNone(
+            self.request('b', current=({'display': 'none'}, 'b')))
+
+    def test_clients(self):
+        # a second tab showing an older value still gets the new one
+        self.request('a', current=({'display': 'block'}, 'a'))
+        response = self.request('a', current=({'display': 'none'}, 'b'))
+        self.assertEqual(response[self.block.ids['content']]['style'],
+                         {'display': 'block'})
+        self.assertEqual(response[self.block.ids['other']]['children'], 'a')
+
+    def test_initial_call_sends(self):
+        response = self.request('a', current=({'display': 'block'}, 'a'),
+                                changed=[])
+        self.assertIn(self.block.ids['content'], response)
+
+
+class TestTogglable(unittest.TestCase):
+
+    def test_dedup(self):
+        app = dash.Dash(__name__)
+        app.layout = html.Div([html.Button(id='button'),
+                               html.Div(id='content')])
+        togglable(app, 'content', 'button', dependency='button', dedup=True)
+        response = dispatch(app, [('content', 'style')],
+                            [('button', 'n_clicks', 2)],
+                            state=[('content', 'style', {'display': 'none'})],
+                            single=True)
+        self.assertEqual(response['content']['style'], {'display': 'block'})
+        self.assertIsNone(dispatch(
+            app, [('content', 'style')], [('button', 'n_clicks', 4)],
+            state=[('content', 'style', {'display': 'block'})], single=True))
@@ -0,0 +1,229 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    import numpy as np
+    from dash_building_blocks.downsample import (
+        DownsampledGraph, Pyramid, PyramidGraph, lttb, minmax, visible_range)
+except ImportError:
+    np = None
+
+import dash
+from dash.exceptions import PreventUpdate
+
+from .test_graph import dispatch
+
+
+@unittest.skipIf(np is None, 'requires numpy')
+class TestAlgorithms(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.arange(10000, dtype='float64')
+        self.y = np.sin(self.x / 500)
+        self.y[4321] = 5  # spike
+        self.y[7777] = -5
+
+    def test_lttb(self):
+        selected = lttb(self.x, self.y, 100)
+        self.assertEqual(len(selected), 100)
+        self.assertEqual(selected[0], 0)
+        self.assertEqual(selected[-1], 9999)
+        self.assertTrue(np.all(np.diff(selected) > 0))
+        self.assertIn(4321, selected)
+        self.assertIn(7777, selected)
+
+    def test_minmax(self):
+        selected = minmax(self.x, self.y, 101)
+        self.assertLessEqual(len(selected), 101)
+        self.assertEqual(selected[0], 0)
+        self.assertEqual(selected[-1], 9999)
+        self.assertTrue(np.all(np.diff(selected) > 0))
+        self.assertIn(4321, selected)
+        self.assertIn(7777, selected)
+
+    def test_minmax_remainder(self):
+        y = np.zeros(103)
+        y[101] = 1
+        self.assertIn(101, minmax(np.arange(103), y, 12))
+
+    def test_short_series(self):
+        for algorithm in (lttb, minmax):
+            np.testing.assert_array_equal(
+                algorithm(self.x[:50], self.y[:50], 100), np.arange(50))
+
+    def test_datetime(self):
+        x = np.arange('2020-01-01', '2020-02-01', dtype='datetime64[m]')
+        y = np.random.RandomState(0).randn(len(x))
+        self.assertEqual(len(lttb(x, y, 500)), 500)
+
+
+@unittest.skipIf(np is None, 'requires numpy')
+class TestVisibleRange(unittest.TestCase):
+
+    def test_range(self):
+        self.assertEqual(
+            visible_range({'xaxis.range[0]': 1, 'xaxis.range[1]': 2}), (1, 2))
+        self.assertEqual(visible_range({'xaxis.range': [1, 2]}), (1, 2))
+
+    def test_autorange(self):
+        self.assertIsNone(visible_range(None))
+        self.assertIsNone(visible_range({'xaxis.autorange': True}))
+
+    def test_unrelated(self):
+        self.assertIs(visible_range({'dragmode': 'pan'}), False)
+
+
+@unittest.skipIf(np is None, 'requires numpy')
+class TestDownsampledGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.app = dash.Dash(__name__)
+        x = np.arange(100000, dtype='float64')
+        self.graph = DownsampledGraph(
+            self.app, id='prices', width=200, webgl_threshold=300,
+            traces=[{'x': x, 'y': np.cos(x / 1000), 'name': 'a'}],
+            figure_layout={'title': 'prices'})
+        self.app.layout = self.graph.layout
+        self.graph.callbacks()
+
+    def test_layout(self):
+        figure = self.graph.layout.figure
+        trace = figure['data'][0]
+        self.assertEqual(len(trace['x']), 200)
+        self.assertEqual(trace['type'], 'scatter')
+        self.assertEqual(trace['name'], 'a')
+        self.assertEqual(figure['layout'],
+                         {'title': 'prices', 'uirevision': True})
+
+    def test_resample_visible_range(self):
+        x, _ = self.graph.resample(self.graph.traces[0], 1000.5, 1100)
+        self.assertEqual(x[0], 1000)
+        self.assertEqual(x[-1], 1101)
+        self.assertEqual(len(x), 102)
+
+    def test_webgl(self):
+        self.graph.traces.append(dict(self.graph.traces[0], name='b'))
+        figure = self.graph.figure()
+        self.assertEqual([t['type'] for t in figure['data']],
+                         ['scattergl', 'scattergl'])
+        figure = self.graph.figure(0, 100)
+        self.assertEqual([t['type'] for t in figure['data']],
+                         ['scatter', 'scatter'])
+
+    def test_update(self):
+        self.assertRaises(PreventUpdate, self.graph.update,
+                          {'dragmode': 'zoom'})
+        figure = self.graph.update({'xaxis.range[0]': 5000,
+                                    'xaxis.range[1]': 6000})
+        x = figure['data'][0]['x']
+        self.assertEqual(len(x), 200)
+        self.assertTrue(4999 <= x[0] and x[-1] <= 6001)
+
+    def test_callback(self):
+        graph_id = self.graph('graph')
+        response = dispatch(
+            self.app, [(graph_id, 'figure')],
+            [(graph_id, 'relayoutData', {'xaxis.range': [10, 20]})],
+            single=True)
+        x = response[graph_id]['figure']['data'][0]['x']
+        self.assertEqual(x, list(range(9, 22)))
+
+
+@unittest.skipIf(np is None, 'requires numpy')
+class TestPyramid(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.arange(1000, dtype='float64')
+        self.y = np.random.RandomState(0).randn(1000)
+        self.pyramid = Pyramid.build(self.x, self.y, factor=4)
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_levels(self):
+        levels = self.pyramid.levels
+        self.assertEqual([len(level['x']) for level in levels],
+                         [1000, 250, 63, 16, 4, 1])
+        level = levels[2]
+        self.assertEqual(level['x'][1], 16)
+        self.assertEqual(level['min'][1], self.y[16:32].min())
+        self.assertEqual(level['max'][1], self.y[16:32].max())
+        self.assertAlmostEqual(level['mean'][1], self.y[16:32].mean())
+        self.assertAlmostEqual(level['mean'][-1], self.y[992:].mean())
+        self.assertAlmostEqual(levels[-1]['mean'][0], self.y.mean())
+        self.assertEqual(levels[-1]['max'][0], self.y.max())
+
+    def test_window(self):
+        number, window = self.pyramid.window(width=100)
+        self.assertEqual(number, 2)
+        self.assertEqual(len(window['x']), 63)
+        number, window = self.pyramid.window(100, 200, width=20)
+        self.assertEqual(number, 2)
+        self.assertEqual(window['x'][0], 96)
+        self.assertEqual(window['x'][-1], 208)
+        number, window = self.pyramid.window(100.5, 110, width=20)
+        self.assertEqual(number, 0)
+        np.testing.assert_array_equal(window['x'], np.arange(100, 112))
+
+    def test_open(self):
+        path = os.path.join(self.dir, 'series.pyramid')
+        pyramid = Pyramid.open(path, self.x, self.y, factor=4)
+        self.assertIsInstance(pyramid.levels[2]['min'], np.memmap)
+        self.assertEqual(pyramid.factor, 4)
+        with mock.patch.object(Pyramid, 'build') as build:
+            reopened = Pyramid.open(path)
+        build.assert_not_called()
+        for level, expected in zip(reopened.levels, self.pyramid.levels):
+            for name in ('x', 'min', 'max', 'mean'):
+                np.testing.assert_array_equal(level[name], expected[name])
+        with mock.patch.object(Pyramid, 'build') as build:
+            Pyramid.open(path, self.x, self.y, factor=4)
+        build.assert_not_called()
+        self.assertFalse([name for name in os.listdir(path)
+                          if name.endswith('.tmp')])
+
+    def test_open_stale(self):
+        path = os.path.join(self.dir, 'series.pyramid')
+        pyramid = Pyramid.open(path, self.x, self.y, factor=4)
+        mapped = np.array(pyramid.levels[1]['max'])
+        y = self.y.copy()
+        y[10] = 100
+        rebuilt = Pyramid.open(path, self.x, y, factor=4)
+        self.assertEqual(rebuilt.levels[1]['max'][2], 100)
+        # arrays mapped before the rebuild are left untouched
+        np.testing.assert_array_equal(pyramid.levels[1]['max'], mapped)
+
+
+@unittest.skipIf(np is None, 'requires numpy')
+class TestPyramidGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.app = dash.Dash(__name__)
+        x = np.arange(100000, dtype='float64')
+        self.y = np.sin(x / 1000)
+        self.graph = PyramidGraph(
+            self.app, id='levels', width=100,
+            traces=[{'x': x, 'y': self.y, 'name': 'a'}])
+        self.graph.callbacks()
+
+    def test_layout(self):
+        trace = self.graph.layout.figure['data'][0]
+        self.assertNotIn('pyramid', trace)
+        self.assertLessEqual(len(trace['x']), 100)
+        self.assertEqual(trace['x'][0], trace['x'][1])
+        self.assertEqual(max(trace['y']), self.y.max())
+        self.assertEqual(min(trace['y']), self.y.min())
+
+    def test_mean(self):
+        self.graph.aggregate = 'mean'
+        x, y = self.graph.resample(self.graph.traces[0], 0, 50000)
+        self.assertLessEqual(len(x), 100)
+        self.assertTrue(np.all(np.diff(x) > 0))
+
+    def test_zoom_to_points(self):
+        figure = self.graph.update({'xaxis.range': [10, 40]})
+        self.assertEqual(figure['data'][0]['x'].tolist(), list(range(9, 42)))
@@ -0,0 +1,188 @@
+import collections
+import datetime
+import json
+import unittest
+
+import dash
+import dash_html_components as html
+from dash.dependencies import Input
+from dash_building_blocks.graph import FigureTemplate, StreamingGraph
+
+
+def dispatch(app, outputs, inputs, state=(), changed=None, single=False):
+    """POST a callback request to *app* the way the Dash renderer does and
+    return the decoded response, or None for a 204. Pass *single* for
+    callbacks registered with a single, unlisted output. Requests to the
+    same app share one test client, and so its cookies, like one browser.
+    """
+    output = '..{}..'.format('...'.join(
+        '{}.{}'.format(*o) for o in outputs))
+    specs = [{'id': i, 'property': p} for i, p in outputs]
+    if single:
+        output, specs = '{}.{}'.format(*outputs[0]), specs[0]
+    body = {
+        'output': output,
+        'outputs': specs,
+        'inputs': [{'id': i, 'property': p, 'value': v}
+                   for i, p, v in inputs],
+        'state': [{'id': i, 'property': p, 'value': v}
+                  for i, p, v in state],
+        'changedPropIds': changed if changed is not None else
+        ['{}.{}'.format(inputs[0][0], inputs[0][1])]
+    }
+    if not hasattr(app, '_test_client'):
+        app._test_client = app.server.test_client()
+    response = app._test_client.post('/_dash-update-component', json=body)
+    if response.status_code == 204:
+        return None
+    return json.loads(response.data)['response']
+
+
+class TestStreamingGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.app = dash.Dash(__name__)
+        self.graph = StreamingGraph(self.app, id='live', max_points=4,
+                                    figure_layout={'title': 'live'})
+        self.app.layout = html.Div([self.graph.layout])
+        self.series = {'x': [0, 1], 'y': [10, 11]}
+
+        @self.graph.stream([Input('interval', 'n_intervals')],
+                           reset=[Input('reset', 'n_clicks')])
+        def update(n_intervals):
+            return [dict(self.series, name='trace')]
+
+        self.outputs = [(self.graph('graph'), 'extendData'),
+                        (self.graph('graph'), 'figure'),
+                        (self.graph('cursor'), 'children')]
+
+    def tick(self, cursor, changed=None):
+        return dispatch(
+            self.app, self.outputs,
+            [('interval', 'n_intervals', 1), ('reset', 'n_clicks', None)],
+            [(self.graph('cursor'), 'children', cursor)],
+            changed=changed)
+
+    def test_first_update_sends_figure(self):
+        response = self.tick('')
+        graph = response[self.graph('graph')]
+        self.assertNotIn('extendData', graph)
+        self.assertEqual(graph['figure']['data'][0]['y'], [10, 11])
+        self.assertEqual(graph['figure']['data'][0]['name'], 'trace')
+        self.assertEqual(graph['figure']['layout'], {'title': 'live'})
+        self.assertEqual(
+            json.loads(response[self.graph('cursor')]['children']), [1])
+
+    def test_update_extends(self):
+        self.series = {'x': [0, 1, 2, 3], 'y': [10, 11, 12, 13]}
+        response = self.tick('[1]')
+        graph = response[self.graph('graph')]
+        self.assertNotIn('figure', graph)
+        self.assertEqual(graph['extendData'],
+                         [{'x': [[2, 3]], 'y': [[12, 13]]}, [0], 4])
+        self.assertEqual(
+            json.loads(response[self.graph('cursor')]['children']), [3])
+
+    def test_extension_capped(self):
+        self.series = {'x': list(range(10)), 'y': list(range(10))}
+        extend = self.tick('[1]')[self.graph('graph')]['extendData']
+        self.assertEqual(extend[0]['x'], [[6, 7, 8, 9]])
+
+    def test_no_new_points(self):
+        self.assertIsNone(self.tick('[1]'))
+
+    def test_series_behind_cursor_resets(self):
+        graph = self.tick('[5]')[self.graph('graph')]
+        self.assertIn('figure', graph)
+
+    def test_sliding_window(self):
+        window = {'x': collections.deque(maxlen=3),
+                  'y': collections.deque(maxlen=3)}
+        cursor, sent = '', []
+        for x in range(8):
+            window['x'].append(x)
+            window['y'].append(x * 10)
+            self.series = {key: list(values)
+                           for key, values in window.items()}
+            response = self.tick(cursor)
+            graph = response[self.graph('graph')]
+            if 'figure' in graph:
+                sent.extend(graph['figure']['data'][0]['x'])
+            else:
+                sent.extend(graph['extendData'][0]['x'][0])
+            cursor = response[self.graph('cursor')]['children']
+        self.assertEqual(sent, list(range(8)))
+
+    def test_only_new_points(self):
+        self.series = {'x': [2, 3], 'y': [12, 13]}
+        graph = self.tick('[1]')[self.graph('graph')]
+        self.assertEqual(graph['extendData'][0]['x'], [[2, 3]])
+
+    def test_dates(self):
+        day = datetime.date(2020, 1, 1)
+        self.series = {'x': [day + datetime.timedelta(days=i)
+                             for i in range(3)], 'y': [0, 1, 2]}
+        graph = self.tick('["2020-01-02"]')[self.graph('graph')]
+        self.assertEqual(graph['extendData'][0]['x'], [['2020-01-03']])
+
+    def test_reset_input(self):
+        self.series = {'x': list(range(6)), 'y': list(range(6))}
+        graph = self.tick('[2]', changed=['reset.n_clicks'])[
+            self.graph('graph')]
+        self.assertNotIn('extendData', graph)
+        self.assertEqual(graph['figure']['data'][0]['x'], [2, 3, 4, 5])
+
+
+class TestFigureTemplate(unittest.TestCase):
+
+    def setUp(self):
+        self.static = {
+            'data': [
+                {'type': 'scattergeo', 'mode': 'markers',
+                 'marker': {'size': 8}},
+                {'type': 'scattergeo', 'mode': 'lines'}
+            ],
+            'layout': {'title': 'World Map'}
+        }
+        self.template = FigureTemplate(self.static, keys=('lon', 'lat'))
+
+    def test_render(self):
+        figure = self.template.render({'lon': [1], 'lat': [2]})
+        self.assertEqual(figure['layout'], {'title': 'World Map'})
+        self.assertEqual(figure['data'][0]['lon'], [1])
+        self.assertEqual(figure['data'][0]['marker'], {'size': 8})
+        self.assertEqual(figure['data'][1]['lat'], [])
+        self.assertNotIn('lon', self.static['data'][0])
+
+    def test_graph(self):
+        graph = self.template.graph(id='map')
+        self.assertEqual(graph.id, 'map')
+        self.assertEqual(graph.figure['data'][0]['lon'], [])
+
+    def test_property(self):
+        expected = 'figure' if hasattr(dash, 'Patch') else 'extendData'
+        self.assertEqual(self.template.property, expected)
+
+    @unittest.skipIf(hasattr(dash, 'Patch'), 'dash.Patch is available')
+    def test_update_extend_data(self):
+        update = self.template.update(None, {'lon': [1, 2], 'lat': [3, 4]})
+        self.assertEqual(update, [
+            {'lon': [[1, 2]], 'lat': [[3, 4]]},
+            [1],
+            {'lon': [2], 'lat': [2]}
+        ])
+
+    @unittest.skipIf(hasattr(dash, 'Patch'), 'dash.Patch is available')
+    def test_update_is_smaller(self):
+        data = {'lon': [1], 'lat': [2]}
+        self.assertLess(len(json.dumps(self.template.update(data))),
+                        len(json.dumps(self.template.render(data))))
+
+    @unittest.skipUnless(hasattr(dash, 'Patch'), 'requires dash.Patch')
+    def test_update_patch(self):
+        update = self.template.update({'lon': [1], 'lat': [2]})
+        self.assertIsInstance(update, dash.Patch)
+
+
+if __name__ == '__main__':
+    unittest.main()
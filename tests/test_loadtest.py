@@ -0,0 +1,122 @@
+import unittest
+from unittest import mock
+
+import dash
+import dash_core_components as dcc
+import dash_html_components as html
+from dash.dependencies import Input, Output
+from dash.exceptions import PreventUpdate
+from dash_building_blocks.base import Block, Store
+from dash_building_blocks.loadtest import LoadTest, Report, layout_values
+
+
+class Echo(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div([
+            dcc.Dropdown(id=self.register('dropdown'), value='a',
+                         options=[{'label': v, 'value': v} for v in 'abc']),
+            html.Div(id=self.register('out'))
+        ])
+
+    def callbacks(self, store):
+        @self.callback(self.output('out'),
+                       [self.input('dropdown', 'value')],
+                       [store.state('item')])
+        def echo(value, item):
+            if value == 'skip':
+                raise PreventUpdate
+            if value == 'fail':
+                raise ValueError(value)
+            return '{} {}'.format(value, item)
+
+
+class TestLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = dash.Dash(__name__)
+        self.block = Echo(self.app, id='echo')
+        self.store = Store(self.app, id='store')
+
+        @self.store.register('item', inputs=[Input('source', 'title')],
+                             initially='x')
+        def produce(title):
+            return title
+
+        self.block.callbacks(self.store)
+        self.app.layout = html.Div([html.Div(id='source', title='t'),
+                                    self.block.layout, self.store.layout])
+        self.app.server.testing = False
+
+    def test_layout_values(self):
+        values = layout_values(lambda: self.app.layout)
+        self.assertEqual(values[(self.block.ids['dropdown'], 'value')], 'a')
+        self.assertEqual(values[(self.store.ids['item'], 'children')], 'x')
+
+    def test_targets(self):
+        test = LoadTest(self.app, blocks=[self.block], stores=[self.store])
+        self.assertEqual(sorted(t.label for t in test.targets),
+                         ['echo-echo', 'store-item'])
+        target = [t for t in test.targets if t.label == self.block.id][0]
+        body = target.body(test.values)
+        self.assertEqual(body['inputs'][0]['value'], 'a')
+        self.assertEqual(body['state'][0]['value'], 'x')
+
+    def test_unlabeled_targets(self):
+        test = LoadTest(self.app)
+        self.assertEqual(sorted(t.label for t in test.targets),
+                         sorted(self.app.callback_map))
+
+    def test_run(self):
+        dropdown = (self.block.ids['dropdown'], 'value')
+        test = LoadTest(self.app, blocks=[self.block], stores=[self.store],
+                        values={dropdown: ['a', 'skip', 'fail']})
+        # failing requests are expected, keep their tracebacks quiet
+        self.app.server.logger.disabled = True
+        report = test.run(requests=60, concurrency=4)
+        stats = report.stats()
+        echo = stats[self.block.id]
+        self.assertEqual(echo['requests'] +
+                         stats['store-item']['requests'], 60)
+        self.assertGreater(echo['errors'], 0)
+        self.assertLess(echo['errors'], echo['requests'])
+        self.assertEqual(stats['store-item']['errors'], 0)
+        self.assertLessEqual(echo['p50'], echo['p99'])
+        self.assertGreater(echo['rps'], 0)
+        self.assertIn('store-item', str(report))
+
+    def test_client_prefix(self):
+        app = dash.Dash(__name__, requests_pathname_prefix='/app/')
+        app.layout = html.Div([html.Div(id='source', title='t'),
+                               html.Div(id='out')])
+        app.callback(Output('out', 'children'),
+                     [Input('source', 'title')])(lambda title: title)
+        report = LoadTest(app).run(requests=5, concurrency=1)
+        stats = report.stats()['out.children']
+        self.assertEqual(stats['requests'], 5)
+        self.assertEqual(stats['errors'], 0)
+
+    def test_url_prefix(self):
+        app = dash.Dash(__name__, requests_pathname_prefix='/app/')
+        app.layout = self.app.layout
+        test = LoadTest(app)
+        with mock.patch('urllib.request.urlopen') as urlopen:
+            urlopen.return_value.__enter__.return_value.status = 204
+            self.assertEqual(test._post_url('http://host:8050/', {}), 204)
+        request = urlopen.call_args[0][0]
+        self.assertEqual(request.full_url,
+                         'http://host:8050/app/_dash-update-component')
+
+
+class TestReport(unittest.TestCase):
+
+    def test_percentiles(self):
+        report = Report({'a': [i / 100 for i in range(1, 101)]}, {}, 2.0)
+        stats = report.stats()['a']
+        self.assertEqual(stats['requests'], 100)
+        self.assertEqual(stats['rps'], 50)
+        self.assertEqual(stats['p50'], 0.5)
+        self.assertEqual(stats['p90'], 0.9)
+        self.assertEqual(stats['p99'], 0.99)
+        self.assertEqual(stats['max'], 1.0)
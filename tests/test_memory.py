@@ -0,0 +1,77 @@
+import unittest
+from unittest import mock
+
+import dash_html_components as html
+from dash.dependencies import Input
+from dash_building_blocks import memory
+from dash_building_blocks.base import Block
+from dash_building_blocks.memory import MemoryTracker
+
+
+class Heavy(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        self.payload = [str(i) * 10 for i in range(10000)]
+        return html.Div(id=self.register('out'))
+
+
+class Light(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div(id=self.register('out'))
+
+
+class TestMemoryTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = MemoryTracker().install()
+        self.addCleanup(self.tracker.uninstall)
+
+    def test_uninstall(self):
+        self.tracker.uninstall()
+        self.assertIsNone(memory.active)
+        Light(id='untracked')
+        self.assertEqual(self.tracker.records, {})
+
+    def test_init_attribution(self):
+        heavy, light = Heavy(id='h'), Light(id='l')
+        report = self.tracker.report()
+        self.assertEqual([row['id'] for row in report], [heavy.id, light.id])
+        self.assertGreater(report[0]['init'], 100000)
+        self.assertLess(report[1]['init'], report[0]['init'] / 10)
+        self.assertTrue(report[0]['alive'])
+        self.assertEqual(self.tracker.report(top=1)[0]['class_id'], 'heavy')
+
+    def test_callback_attribution(self):
+        app = mock.Mock()
+        block = Light(app, id='cb')
+        retained = []
+
+        @block.callback(block.output('out'), [Input('in', 'value')])
+        def grow(value):
+            retained.append(bytearray(value))
+            return value
+
+        func = app.callback.return_value.call_args[0][0]
+        self.tracker.sample()
+        for _ in range(3):
+            func(100000)
+        self.tracker.sample()
+
+        row = self.tracker.report()[0]
+        self.assertEqual(row['id'], block.id)
+        self.assertEqual(row['calls'], 3)
+        self.assertGreater(row['callbacks'], 300000)
+        class_id, rate = self.tracker.growth()[0]
+        self.assertEqual(class_id, 'light')
+        self.assertGreater(rate, 0)
+
+    def test_leaks(self):
+        kept, dropped = Light(id='kept'), Light(id='dropped')
+        served = html.Div([Light(id='served').layout])
+        stale = html.Div([kept.layout, dropped.layout])
+        del stale, dropped
+        flagged = self.tracker.leaks(served)
+        self.assertEqual(flagged, [('light', kept.id)])
@@ -0,0 +1,74 @@
+import json
+import unittest
+
+import dash
+import dash_html_components as html
+from dash.dependencies import Output
+from dash_building_blocks.base import Block
+from dash_building_blocks.options import SharedOptions
+
+from .test_graph import dispatch
+
+
+OPTIONS = [{'label': 'Option {}'.format(i), 'value': i} for i in range(500)]
+
+
+class Graph(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div([
+            self.data.options.dropdown(id=self.register('dropdown'),
+                                       value=self.data.value),
+            html.Div(id=self.register('graph'))
+        ])
+
+
+class TestSharedOptions(unittest.TestCase):
+
+    def build(self, n_graphs, clientside=True):
+        app = dash.Dash(__name__)
+        options = SharedOptions(app, OPTIONS, clientside=clientside)
+        graphs = [Graph(app, {'options': options, 'value': 0})
+                  for _ in range(n_graphs)]
+        app.layout = html.Div([options.layout] +
+                              [graph.layout for graph in graphs])
+        options.callbacks()
+        return app, options, graphs
+
+    def layout_size(self, app):
+        return len(app.server.test_client().get('/_dash-layout').data)
+
+    def test_layout_size_does_not_scale_with_blocks(self):
+        one, _, _ = self.build(1)
+        ten, _, _ = self.build(10)
+        options_size = len(json.dumps(OPTIONS))
+        self.assertLess(self.layout_size(ten) - self.layout_size(one),
+                        options_size)
+
+    def test_single_clientside_callback(self):
+        app, options, graphs = self.build(3)
+        self.assertEqual(len(app._callback_list), 1)
+        callback = app._callback_list[0]
+        self.assertIsNotNone(callback['clientside_function'])
+        self.assertEqual(callback['inputs'],
+                         [{'id': options.id, 'property': 'data'}])
+        for graph in graphs:
+            self.assertIn(graph.ids['dropdown'], callback['output'])
+        self.assertIn('Array(3).fill(options)', app._inline_scripts[0])
+
+    def test_server_callback(self):
+        app, options, graphs = self.build(2, clientside=False)
+        outputs = [(graph.ids['dropdown'], 'options') for graph in graphs]
+        response = dispatch(app, outputs, [(options.id, 'data', OPTIONS)])
+        for graph in graphs:
+            self.assertEqual(response[graph.ids['dropdown']]['options'],
+                             OPTIONS)
+
+    def test_single_subscriber(self):
+        app = dash.Dash(__name__)
+        options = SharedOptions(app, OPTIONS, clientside=False)
+        options.subscribe(Output('only', 'options'))
+        options.callbacks()
+        self.assertEqual(app._callback_list[0]['output'], 'only.options')
+        self.assertIs(options._copies(OPTIONS), OPTIONS)
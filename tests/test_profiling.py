@@ -0,0 +1,118 @@
+import json
+import os
+import pstats
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import dash_html_components as html
+from dash.dependencies import Input
+from dash_building_blocks.base import Block
+from dash_building_blocks.profiling import SlowProfiler
+from dash_building_blocks.util import content_hash
+
+
+class Slow(Block):
+    profile_threshold = 0.01
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div(id=self.register('out'))
+
+
+class TestSlowProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.profiler = SlowProfiler(self.directory, threshold=0.01, keep=2,
+                                     arm=2)
+
+    def dumps(self, *path, ext='.prof'):
+        directory = os.path.join(self.directory, *path)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory)
+                      if name.endswith(ext))
+
+    def test_fast_calls_are_not_profiled(self):
+        func = self.profiler.wrap('block', 'fast')(lambda x: x)
+        with mock.patch('cProfile.Profile') as profile:
+            for i in range(5):
+                self.assertEqual(func(i), i)
+        profile.assert_not_called()
+        self.assertEqual(self.dumps('block', 'fast'), [])
+
+    def test_arm_on_slow(self):
+        delays = iter([0.02, 0.0, 0.02])
+
+        def work(x):
+            time.sleep(next(delays))
+            return x
+
+        func = self.profiler.wrap('block', 'work')(work)
+        func(1)
+        self.assertEqual(self.dumps('block', 'work'), [])
+        func(2)
+        self.assertEqual(self.dumps('block', 'work'), [])
+        self.assertEqual(len(self.dumps('block', 'work', ext='.json')), 1)
+        func(3)
+        dumps = self.dumps('block', 'work')
+        self.assertEqual(len(dumps), 1)
+
+        path = os.path.join(self.directory, 'block', 'work', dumps[0])
+        stats = pstats.Stats(path)
+        self.assertTrue(any(name == 'work'
+                            for _, _, name in stats.stats))
+        with open(path[:-5] + '.json') as file:
+            info = json.load(file)
+        self.assertEqual(info['callback'], 'work')
+        self.assertGreater(info['duration'], 0.01)
+        self.assertTrue(info['fingerprint'])
+        self.assertTrue(info['profiled'])
+
+    def test_arming_call_is_recorded(self):
+        def work(x):
+            time.sleep(0.02)
+            return x
+
+        self.profiler.wrap('block', 'work')(work)(1)
+        names = self.dumps('block', 'work', ext='.json')
+        self.assertEqual(len(names), 1)
+        with open(os.path.join(self.directory, 'block', 'work',
+                               names[0])) as file:
+            info = json.load(file)
+        self.assertFalse(info['profiled'])
+        self.assertGreater(info['duration'], 0.01)
+        self.assertEqual(info['fingerprint'], content_hash(((1,), {})))
+
+    def test_rotation(self):
+        self.profiler.arm = 10
+
+        def work():
+            time.sleep(0.02)
+
+        func = self.profiler.wrap('block', 'work')(work)
+        for _ in range(5):
+            func()
+        self.assertEqual(len(self.dumps('block', 'work')), 2)
+        self.assertEqual(len(os.listdir(
+            os.path.join(self.directory, 'block', 'work'))), 4)
+
+    def test_block_callback(self):
+        app = mock.Mock()
+        block = Slow(app, id='slow')
+        profiler = SlowProfiler(self.directory, threshold=60, arm=1)
+
+        @block.callback(block.output('out'), [Input('in', 'value')],
+                        profiler=profiler)
+        def update(value):
+            time.sleep(0.02)
+            return value
+
+        func = app.callback.return_value.call_args[0][0]
+        func(1)
+        func(2)
+        self.assertEqual(len(self.dumps(block.id, 'update')), 1)
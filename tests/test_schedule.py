@@ -0,0 +1,123 @@
+import time
+import unittest
+from unittest import mock
+
+import dash
+from dash.dependencies import Output, State
+from dash.exceptions import PreventUpdate
+from dash_building_blocks.schedule import Ticker
+
+
+class TestTicker(unittest.TestCase):
+
+    def setUp(self):
+        self.app = mock.Mock()
+        self.ticker = Ticker(self.app, id='', interval=10)
+        self.calls = []
+        self.schedules = {}
+
+    def tick(self, n_intervals, *state, client='a'):
+        values = self.ticker.tick(n_intervals, *state,
+                                  self.schedules.get(client))
+        self.schedules[client] = values[-1]
+        return values[:-1]
+
+    def subscribe(self, name, period=None, state=None, delay=0):
+        @self.ticker.subscribe(Output(name, 'children'), period=period,
+                               state=state)
+        def update(n_intervals, *state):
+            self.calls.append((name, n_intervals) + state)
+            time.sleep(delay)
+            return name
+
+    def test_layout(self):
+        interval, schedule = self.ticker.layout.children
+        self.assertEqual(interval.id, 'ticker-interval')
+        self.assertEqual(interval.interval, 10)
+        self.assertEqual(schedule.id, 'ticker-schedule')
+
+    def test_single_batched_callback(self):
+        self.subscribe('a')
+        self.subscribe('b', state=[State('s', 'value')])
+        self.ticker.callbacks()
+
+        self.app.callback.assert_called_once()
+        outputs, inputs, state = self.app.callback.call_args[0]
+        self.assertEqual([o.component_id for o in outputs],
+                         ['a', 'b', 'ticker-schedule'])
+        self.assertEqual(inputs[0].component_id, 'ticker-interval')
+        self.assertEqual([s.component_id for s in state],
+                         ['s', 'ticker-schedule'])
+
+    def test_no_subscribers(self):
+        self.ticker.callbacks()
+        self.app.callback.assert_not_called()
+
+    def test_periods(self):
+        self.subscribe('fast')
+        self.subscribe('slow', period=25, state=[State('s', 'value')])
+
+        self.assertEqual(self.tick(0, 'v'), ['fast', 'slow'])
+        self.assertEqual(self.tick(1, 'v'), ['fast', dash.no_update])
+        self.assertEqual(self.tick(2, 'v'), ['fast', dash.no_update])
+        self.assertEqual(self.tick(3, 'v'), ['fast', 'slow'])
+        self.assertEqual(self.calls[1], ('slow', 0, 'v'))
+
+    def test_prevent_update(self):
+        @self.ticker.subscribe(Output('a', 'children'))
+        def skip(n_intervals):
+            raise PreventUpdate
+
+        self.subscribe('b')
+        self.assertEqual(self.tick(0), [dash.no_update, 'b'])
+        self.assertEqual(self.schedules['a']['next'], [1, 1])
+
+    def test_nothing_due(self):
+        self.subscribe('slow', period=30)
+        self.tick(0)
+        with self.assertRaises(PreventUpdate):
+            self.tick(1)
+
+    def test_backoff(self):
+        self.subscribe('slow', delay=0.03)
+        subscriber = self.ticker.subscribers[0]
+
+        self.tick(0)
+        self.assertEqual(self.schedules['a']['backoff'], [2])
+        with self.assertRaises(PreventUpdate):
+            self.tick(1)
+        self.tick(2)
+        self.assertEqual(self.schedules['a']['backoff'], [4])
+        self.assertEqual(self.schedules['a']['next'], [6])
+
+        subscriber.func = lambda n: 'fast'
+        self.tick(6)
+        self.assertEqual(self.schedules['a']['backoff'], [2])
+
+    def test_max_backoff(self):
+        self.ticker.max_backoff = 2
+        self.subscribe('slow', delay=0.03)
+        for n in range(0, 8, 2):
+            self.tick(n)
+        self.assertEqual(self.schedules['a']['backoff'], [2])
+
+    def test_clients_scheduled_apart(self):
+        self.subscribe('slow', period=30)
+        self.tick(0, client='a')
+        self.tick(501, client='a')
+        self.assertEqual(self.schedules['a']['next'], [504])
+        # a new tab counts its ticks from 0
+        self.assertEqual(self.tick(0, client='b'), ['slow'])
+        self.assertEqual(self.schedules['b']['next'], [3])
+        with self.assertRaises(PreventUpdate):
+            self.tick(502, client='a')
+
+    def test_restarted_interval(self):
+        self.subscribe('slow', period=30)
+        self.tick(0)
+        self.tick(9)
+        self.assertEqual(self.tick(1), ['slow'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import time
+import unittest
+from unittest import mock
+
+import dash
+from dash.exceptions import PreventUpdate
+from dash_building_blocks.search import PrefixIndex, SearchableDropdown
+
+from .test_graph import dispatch
+
+
+def make_options(n):
+    return [{'label': 'Instrument {:06d}'.format(i), 'value': i}
+            for i in range(n)]
+
+
+OPTIONS = [{'label': label, 'value': label.upper()} for label in
+           ['Apple', 'Applied Materials', 'Pineapple', 'Banana', 'apex',
+            'Grape']]
+
+
+class TestPrefixIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PrefixIndex(OPTIONS)
+
+    def labels(self, query, k=20):
+        return [option['label'] for option in self.index.search(query, k)]
+
+    def test_prefix_first(self):
+        self.assertEqual(self.labels('app'),
+                         ['Apple', 'Applied Materials', 'Pineapple'])
+        self.assertEqual(self.labels('AP'),
+                         ['apex', 'Apple', 'Applied Materials'])
+
+    def test_k(self):
+        self.assertEqual(self.labels('ap', k=1), ['apex'])
+        self.assertEqual(self.labels('ple', k=1), ['Apple'])
+
+    def test_substring(self):
+        self.assertEqual(self.labels('nan'), ['Banana'])
+        self.assertEqual(self.labels('zz'), [])
+
+    def test_empty_query(self):
+        self.assertEqual(len(self.index.search('', 3)), 3)
+        self.assertEqual(len(self.index.search(None, 3)), 3)
+
+    def test_memoized(self):
+        self.index.search('app')
+        self.index.search('APP')
+        info = self.index._search.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_large(self):
+        index = PrefixIndex(make_options(200000))
+        start = time.perf_counter()
+        for i in range(100):
+            index._find('instrument 1{:02d}'.format(i), 20)
+        elapsed = (time.perf_counter() - start) / 100
+        self.assertLess(elapsed, 0.005)
+        start = time.perf_counter()
+        found = index.search('nt 19999', 3)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual([o['value'] for o in found],
+                         [199990, 199991, 199992])
+
+
+class TestSearchableDropdown(unittest.TestCase):
+
+    def test_layout_holds_selected_only(self):
+        block = SearchableDropdown(mock.Mock(), options=OPTIONS, value='APEX',
+                                   placeholder='Search')
+        self.assertEqual(block.layout.options,
+                         [{'label': 'apex', 'value': 'APEX'}])
+        self.assertEqual(block.layout.placeholder, 'Search')
+
+    def test_search_keeps_selection(self):
+        block = SearchableDropdown(mock.Mock(), options=OPTIONS, k=1)
+        self.assertEqual(block.search('gr', 'BANANA'),
+                         [{'label': 'Banana', 'value': 'BANANA'},
+                          {'label': 'Grape', 'value': 'GRAPE'}])
+        self.assertRaises(PreventUpdate, block.search, '', 'BANANA')
+
+    def test_callback(self):
+        app = dash.Dash(__name__)
+        block = SearchableDropdown(app, id='search', options=OPTIONS)
+        app.layout = block.layout
+        block.callbacks()
+        dropdown = block.ids['dropdown']
+        response = dispatch(app, [(dropdown, 'options')],
+                            [(dropdown, 'search_value', 'gra')],
+                            [(dropdown, 'value', None)], single=True)
+        self.assertEqual(response[dropdown]['options'],
+                         [{'label': 'Grape', 'value': 'GRAPE'}])
@@ -0,0 +1,222 @@
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    import numpy as np
+    from dash_building_blocks.shm import (
+        SegmentRegistry,
+        SharedMemoryStore,
+        is_handle
+    )
+except ImportError:
+    np = None
+
+from dash.dependencies import Input
+from dash.exceptions import PreventUpdate
+from dash_building_blocks.error import SegmentMissingError
+
+
+def _sum_in_child(path, handle, queue):
+    registry = SegmentRegistry(path)
+    queue.put(float(registry.attach(handle).sum()))
+
+
+@unittest.skipIf(np is None, 'requires numpy and multiprocessing.shared_memory')
+class TestSegmentRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'registry.sqlite')
+        self.registry = SegmentRegistry(self.path)
+
+    def tearDown(self):
+        self.registry.release_all()
+        self.registry.sweep(grace=0)
+        shutil.rmtree(self.dir)
+
+    def test_publish_attach(self):
+        array = np.arange(12, dtype='float32').reshape(3, 4)
+        handle = self.registry.publish(array, item='item')
+        self.assertTrue(is_handle(handle))
+        self.assertEqual(json.loads(handle)['item'], 'item')
+
+        view = self.registry.attach(handle)
+        np.testing.assert_array_equal(view, array)
+        self.assertEqual(view.dtype, array.dtype)
+        self.assertFalse(view.flags.writeable)
+
+    def test_reject_objects(self):
+        with self.assertRaises(ValueError):
+            self.registry.publish(np.array([{}, []], dtype=object))
+
+    def test_refcount(self):
+        handle = self.registry.publish(np.zeros(4))
+        name = json.loads(handle)['__shm__']
+        self.assertEqual(self.registry.refcount(name), 0)
+
+        view = self.registry.attach(handle)
+        self.registry.attach(handle)
+        self.assertEqual(self.registry.refcount(name), 1)
+
+        self.registry.release(handle)
+        self.assertEqual(self.registry.refcount(name), 0)
+        # the mapping outlives the release while a view uses it
+        self.assertEqual(view.sum(), 0)
+
+    def test_sweep(self):
+        referenced = self.registry.publish(np.zeros(4))
+        unreferenced = self.registry.publish(np.ones(4))
+        self.registry.attach(referenced)
+
+        self.assertEqual(self.registry.sweep(grace=60), [])
+        swept = self.registry.sweep(grace=0)
+        self.assertEqual(swept, [json.loads(unreferenced)['__shm__']])
+        with self.assertRaises(SegmentMissingError):
+            self.registry.attach(unreferenced)
+
+    def test_attach_from_other_process(self):
+        handle = self.registry.publish(np.arange(1000, dtype='int64'))
+        context = multiprocessing.get_context('spawn')
+        queue = context.Queue()
+        proc = context.Process(target=_sum_in_child,
+                               args=(self.path, handle, queue))
+        proc.start()
+        total = queue.get(timeout=30)
+        proc.join()
+        self.assertEqual(total, 999 * 1000 / 2)
+
+        # the reference of the exited process is dropped by the sweeper
+        self.assertEqual(len(self.registry.sweep(grace=0)), 1)
+
+
+@unittest.skipIf(np is None, 'requires numpy and multiprocessing.shared_memory')
+class TestSharedMemoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.app = mock.Mock()
+        self.store = SharedMemoryStore(
+            self.app, os.path.join(self.dir, 'registry.sqlite'),
+            threshold=1024)
+
+    def tearDown(self):
+        self.store.registry.release_all()
+        self.store.registry.sweep(grace=0)
+        shutil.rmtree(self.dir)
+
+    def _producer(self, result):
+        self.store.register('item', inputs=[Input('in', 'value')])(
+            lambda value: result)
+        return self.app.callback.return_value.call_args[0][0]
+
+    def test_large_array_handoff(self):
+        array = np.arange(1024, dtype='float64')
+        handle = self._producer(array)('x')
+        self.assertTrue(is_handle(handle))
+        np.testing.assert_array_equal(self.store.load(handle), array)
+
+    def test_small_array_inline(self):
+        value = self._producer(np.arange(3, dtype='int32'))('x')
+        self.assertFalse(is_handle(value))
+        array = self.store.load(value)
+        np.testing.assert_array_equal(array, [0, 1, 2])
+        self.assertEqual(array.dtype, np.dtype('int32'))
+        self.assertFalse(array.flags.writeable)
+
+    def test_other_values_unchanged(self):
+        self.assertEqual(self._producer('text')('x'), 'text')
+
+    def test_load_releases_previous(self):
+        producer = self._producer(np.zeros(1024))
+        first = producer('x')
+        self.store.load(first)
+        second = producer('y')
+        self.store.load(second)
+
+        registry = self.store.registry
+        self.assertEqual(registry.refcount(json.loads(first)['__shm__']), 0)
+        self.assertEqual(registry.refcount(json.loads(second)['__shm__']), 1)
+
+    def test_load_keeps_other_clients(self):
+        producer = self._producer(np.zeros(1024))
+        first, second = producer('x'), producer('y')
+        with mock.patch('dash_building_blocks.shm.client_key',
+                        return_value='a'):
+            self.store.load(first)
+        with mock.patch('dash_building_blocks.shm.client_key',
+                        return_value='b'):
+            self.store.load(first)
+            self.store.load(second)
+
+        registry = self.store.registry
+        name = json.loads(first)['__shm__']
+        self.assertEqual(registry.refcount(name), 1)
+        self.assertNotIn(name, registry.sweep(grace=0))
+        with mock.patch('dash_building_blocks.shm.client_key',
+                        return_value='a'):
+            np.testing.assert_array_equal(self.store.load(first), 0)
+
+    def test_load_expires_clients(self):
+        self.store.client_ttl = 0
+        producer = self._producer(np.zeros(1024))
+        first, second = producer('x'), producer('y')
+        with mock.patch('dash_building_blocks.shm.client_key',
+                        return_value='a'):
+            self.store.load(first)
+        with mock.patch('dash_building_blocks.shm.time.time',
+                        return_value=1e12), \
+                mock.patch('dash_building_blocks.shm.client_key',
+                           return_value='b'):
+            self.store.load(second)
+
+        registry = self.store.registry
+        self.assertEqual(registry.refcount(json.loads(first)['__shm__']), 0)
+        self.assertEqual(registry.refcount(json.loads(second)['__shm__']), 1)
+
+    def test_load_after_expiry(self):
+        self.store.client_ttl = 0
+        producer = self._producer(np.zeros(1024))
+        first, second = producer('x'), producer('y')
+        with mock.patch('dash_building_blocks.shm.client_key',
+                        return_value='a'):
+            self.store.load(first)
+        with mock.patch('dash_building_blocks.shm.time.time',
+                        return_value=1e12), \
+                mock.patch('dash_building_blocks.shm.client_key',
+                           return_value='b'):
+            self.store.load(second)
+        self.store.registry.sweep(grace=0)
+        # the idle client still holds the handle of the swept segment
+        with mock.patch('dash_building_blocks.shm.client_key',
+                        return_value='a'):
+            with self.assertRaises(PreventUpdate) as raised:
+                self.store.load(first)
+        self.assertIsInstance(raised.exception, SegmentMissingError)
+
+    def test_sweep_is_quiet(self):
+        # the resource tracker reports unbalanced unregistrations on stderr
+        script = (
+            'import numpy as np\n'
+            'from dash_building_blocks.shm import SegmentRegistry\n'
+            'registry = SegmentRegistry({!r})\n'
+            'registry.publish(np.zeros(4))\n'
+            'print(len(registry.sweep(grace=0)))\n'
+        ).format(self.store.registry.path)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=root,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True)
+        self.assertEqual(result.stdout.strip(), '1')
+        self.assertNotIn('KeyError', result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
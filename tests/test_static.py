@@ -0,0 +1,129 @@
+import json
+import unittest
+from unittest import mock
+
+import dash
+import dash_html_components as html
+from plotly.utils import PlotlyJSONEncoder
+from dash_building_blocks.base import Block, Store
+from dash_building_blocks.static import (
+    SplicingEncoder,
+    is_static,
+    mark_static,
+    serve_static_layout,
+    static_json
+)
+
+
+class Header(Block):
+    static = True
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.H1(self.data.title, id=self.register('title'))
+
+
+class Counter(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div(str(self.data.count), id=self.register('count'))
+
+
+class TestStaticJson(unittest.TestCase):
+
+    def test_mark_static(self):
+        div = html.Div('static')
+        self.assertFalse(is_static(div))
+        self.assertIs(mark_static(div), div)
+        self.assertTrue(is_static(div))
+
+    def test_static_json_cached(self):
+        div = mark_static(html.Div('static'))
+        serialized = static_json(div)
+        self.assertEqual(json.loads(serialized),
+                         json.loads(json.dumps(div, cls=PlotlyJSONEncoder)))
+        div.children = 'changed'
+        self.assertIs(static_json(div), serialized)
+
+    def test_splicing_encoder(self):
+        layout = html.Div([
+            mark_static(html.Div('static', id='a')),
+            html.Div('dynamic', id='b'),
+            mark_static(html.Span('other', id='c'))
+        ])
+        expected = json.dumps(layout, cls=PlotlyJSONEncoder)
+        spliced = SplicingEncoder().encode(layout)
+        self.assertEqual(json.loads(spliced), json.loads(expected))
+
+
+class TestStaticBlocks(unittest.TestCase):
+
+    def test_block_static(self):
+        self.assertTrue(is_static(Header(data={'title': 'hi'}).layout))
+        self.assertFalse(is_static(Counter(data={'count': 1}).layout))
+        self.assertTrue(is_static(Counter(data={'count': 1},
+                                          static=True).layout))
+
+    def test_store_static(self):
+        store = Store(mock.Mock(), static=True)
+        store.register('a')
+        layout = store.layout
+        self.assertTrue(is_static(layout))
+        self.assertIs(store.layout, layout)
+
+        store.register('b')
+        self.assertIsNot(store.layout, layout)
+        self.assertEqual(len(store.layout.children), 2)
+
+    def test_store_dynamic(self):
+        store = Store(mock.Mock())
+        store.register('a')
+        self.assertFalse(is_static(store.layout))
+        self.assertIsNot(store.layout, store.layout)
+
+
+class TestServeStaticLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.app = dash.Dash(__name__)
+        self.header = Header(self.app, {'title': 'hello'})
+        self.count = 0
+
+        def layout():
+            self.count += 1
+            counter = Counter(self.app, {'count': self.count}, id='')
+            return html.Div([self.header.layout, counter.layout])
+
+        self.app.layout = layout
+        serve_static_layout(self.app)
+        self.client = self.app.server.test_client()
+
+    def test_layout_response(self):
+        response = self.client.get('/_dash-layout')
+        self.assertEqual(response.status_code, 200)
+        layout = json.loads(response.data)
+        header, counter = layout['props']['children']
+        self.assertEqual(header['props']['children'], 'hello')
+        self.assertEqual(counter['props']['children'], str(self.count))
+        self.assertTrue(response.headers['ETag'])
+
+    def test_not_modified(self):
+        self.app.layout = html.Div(self.header.layout)
+        first = self.client.get('/_dash-layout')
+        etag = first.headers['ETag']
+        second = self.client.get('/_dash-layout',
+                                 headers={'If-None-Match': etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.data, b'')
+
+    def test_modified(self):
+        first = self.client.get('/_dash-layout')
+        second = self.client.get(
+            '/_dash-layout', headers={'If-None-Match': first.headers['ETag']})
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(first.headers['ETag'], second.headers['ETag'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    import numpy as np
+    from dash_building_blocks.dataset import Dataset
+    from dash_building_blocks.table import TableBlock, parse_filter
+except ImportError:
+    np = None
+
+import dash
+from dash.exceptions import PreventUpdate
+
+from .test_graph import dispatch
+
+
+@unittest.skipIf(np is None, 'requires numpy and dash_table')
+class TestParseFilter(unittest.TestCase):
+
+    def test_clauses(self):
+        self.assertEqual(
+            parse_filter('{price} >= 3 && {name} contains "ab" && '
+                         '{time} lt 2.5 && {name} eq \'x\''),
+            [('price', 'ge', 3), ('name', 'contains', 'ab'),
+             ('time', 'lt', 2.5), ('name', 'eq', 'x')])
+        self.assertEqual(parse_filter(''), [])
+
+    def test_unsupported(self):
+        self.assertRaises(ValueError, parse_filter, '{price} between 1')
+        self.assertRaises(ValueError, parse_filter, 'price > 1')
+
+
+@unittest.skipIf(np is None, 'requires numpy and dash_table')
+class TestTableBlock(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'trades')
+        self.n = 1000
+        self.time = np.arange(self.n, dtype='int64')
+        self.price = (self.time * 7919 % 1000).astype('float64')
+        self.name = np.array(['n{}'.format(i % 13) for i in range(self.n)])
+        Dataset.write(self.path, time=self.time, price=self.price,
+                      name=self.name)
+        self.table = TableBlock(mock.Mock(), {'dataset': self.path},
+                                page_size=10, id='trades')
+
+    def tearDown(self):
+        Dataset._opened.pop(os.path.abspath(self.path), None)
+        shutil.rmtree(self.dir)
+
+    def page(self, page=0, sort_by=None, filter_query=''):
+        records, count = self.table.page(page, 10, sort_by, filter_query)
+        return records, count
+
+    def test_layout_holds_one_page(self):
+        layout = self.table.layout
+        self.assertEqual(len(layout.data), 10)
+        self.assertEqual(layout.page_count, 100)
+        self.assertEqual(layout.page_action, 'custom')
+        self.assertEqual([c['id'] for c in layout.columns],
+                         ['name', 'price', 'time'])
+
+    def test_pages(self):
+        records, count = self.page(3)
+        self.assertEqual(count, 100)
+        self.assertEqual([r['time'] for r in records], list(range(30, 40)))
+
+    def test_sort(self):
+        order = np.argsort(self.price, kind='stable')
+        records, _ = self.page(2, [{'column_id': 'price',
+                                    'direction': 'asc'}])
+        self.assertEqual([r['time'] for r in records], order[20:30].tolist())
+        records, _ = self.page(0, [{'column_id': 'price',
+                                    'direction': 'desc'}])
+        self.assertEqual([r['price'] for r in records],
+                         sorted(self.price, reverse=True)[:10])
+
+    def test_sorted_range_uses_permutation(self):
+        order = self.table.rows('{price} > 100 && {price} <= 200',
+                                [{'column_id': 'price', 'direction': 'asc'}])
+        self.assertIsNone(order.rows)
+        self.assertEqual(len(order), 100)
+        records, count = self.page(0, [{'column_id': 'price',
+                                        'direction': 'asc'}],
+                                   '{price} > 100 && {price} <= 200')
+        self.assertEqual(count, 10)
+        self.assertEqual(records[0]['price'], 101)
+
+    def test_filter_and_sort(self):
+        query = '{name} = "n3" && {time} >= 500'
+        expected = [t for t in self.time if self.name[t] == 'n3' and t >= 500]
+        expected.sort(key=lambda t: (-self.price[t]))
+        records, count = self.page(0, [{'column_id': 'price',
+                                        'direction': 'desc'}], query)
+        self.assertEqual(count, -(-len(expected) // 10))
+        self.assertEqual([r['time'] for r in records], expected[:10])
+
+    def test_contains_and_ne(self):
+        records, _ = self.page(0, None, '{name} contains "12"')
+        self.assertTrue(all(r['name'] == 'n12' for r in records))
+        order = self.table.rows('{name} ne "n0"')
+        self.assertEqual(len(order), self.n - len(range(0, self.n, 13)))
+
+    def test_cached(self):
+        sort_by = [{'column_id': 'price', 'direction': 'asc'}]
+        self.assertIs(self.table.rows('{time} < 5', sort_by),
+                      self.table.rows('{time} < 5', sort_by))
+
+    def test_update_prevents_invalid(self):
+        self.assertRaises(PreventUpdate, self.table.update, 0, 10, None,
+                          '{missing} > 1')
+        self.assertRaises(PreventUpdate, self.table.update, 0, 10, None,
+                          '{price} between 1')
+
+    def test_callback(self):
+        app = dash.Dash(__name__)
+        table = TableBlock(app, {'dataset': self.path}, page_size=5,
+                           id='served')
+        app.layout = table.layout
+        table.callbacks()
+        table_id = table.ids['table']
+        response = dispatch(
+            app, [(table_id, 'data'), (table_id, 'page_count')],
+            [(table_id, 'page_current', 1), (table_id, 'page_size', 5),
+             (table_id, 'sort_by', []),
+             (table_id, 'filter_query', '{time} < 8')])
+        self.assertEqual([r['time'] for r in response[table_id]['data']],
+                         [5, 6, 7])
+        self.assertEqual(response[table_id]['page_count'], 2)
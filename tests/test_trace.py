@@ -0,0 +1,123 @@
+import json
+import os
+import tempfile
+import unittest
+
+import dash
+import dash_html_components as html
+from dash.dependencies import Input
+from dash.exceptions import PreventUpdate
+from dash_building_blocks.base import Block, Store
+from dash_building_blocks.trace import (
+    FileExporter,
+    MemoryExporter,
+    Tracer,
+    current_span,
+    is_traced,
+    unwrap,
+    wrap
+)
+
+from .test_graph import dispatch
+
+
+class Consumer(Block):
+
+    # pylint: disable=E0202
+    def layout(self):
+        return html.Div(id=self.register('out'))
+
+
+class TestTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.exporter = MemoryExporter()
+        self.tracer = Tracer(self.exporter)
+
+    def test_nested_spans(self):
+        outer = self.tracer.start('outer')
+        inner = self.tracer.start('inner')
+        self.assertIs(current_span(), inner)
+        self.tracer.finish(inner)
+        self.tracer.finish(outer)
+        self.assertIsNone(current_span())
+        self.assertEqual(inner.trace_id, outer.trace_id)
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(self.exporter.spans, [inner, outer])
+
+    def test_traced_status(self):
+        @self.tracer.traced('prevented')
+        def prevented():
+            raise PreventUpdate
+
+        @self.tracer.traced('failed')
+        def failed():
+            raise ValueError('boom')
+
+        self.assertRaises(PreventUpdate, prevented)
+        self.assertRaises(ValueError, failed)
+        self.assertEqual([span.status for span in self.exporter.spans],
+                         ['prevented', 'error'])
+        self.assertIsNone(current_span())
+
+    def test_envelope(self):
+        span = self.tracer.start('span')
+        self.tracer.finish(span)
+        value = wrap({'a': 1}, span)
+        self.assertTrue(is_traced(value))
+        self.assertEqual(unwrap(value), (span.context, {'a': 1}))
+        self.assertEqual(unwrap('plain'), (None, 'plain'))
+        self.assertIs(wrap(dash.no_update, span), dash.no_update)
+
+    def test_file_exporter(self):
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        tracer = Tracer(FileExporter(path))
+        tracer.finish(tracer.start('span', attributes={'k': 'v'}))
+        with open(path) as file:
+            record = json.loads(file.readline())
+        self.assertEqual(record['name'], 'span')
+        self.assertEqual(record['attributes'], {'k': 'v'})
+
+
+class TestStoreChain(unittest.TestCase):
+
+    def setUp(self):
+        self.exporter = MemoryExporter()
+        tracer = Tracer(self.exporter)
+        self.app = dash.Dash(__name__)
+        self.store = Store(self.app, id='store')
+        self.block = Consumer(self.app, id='consumer')
+
+        @self.store.register('item', inputs=[Input('action', 'title')],
+                             tracer=tracer)
+        def produce(title):
+            return title.upper()
+
+        @self.block.callback(self.block.output('out'),
+                             [self.store.input('item')], tracer=tracer)
+        def consume(item):
+            return item + '!'
+
+        self.app.layout = html.Div([html.Div(id='action'),
+                                    self.store.layout, self.block.layout])
+
+    def test_single_trace(self):
+        item_id = self.store.ids['item']
+        response = dispatch(self.app, [(item_id, 'children')],
+                            [('action', 'title', 'go')], single=True)
+        value = response[item_id]['children']
+        self.assertTrue(is_traced(value))
+
+        out_id = self.block.ids['out']
+        response = dispatch(self.app, [(out_id, 'children')],
+                            [(item_id, 'children', value)], single=True)
+        self.assertEqual(response[out_id]['children'], 'GO!')
+
+        store_span, block_span = self.exporter.spans
+        self.assertEqual(block_span.trace_id, store_span.trace_id)
+        self.assertEqual(block_span.parent_id, store_span.span_id)
+        self.assertEqual(store_span.attributes, {'store.item': item_id})
+        self.assertEqual(block_span.attributes['block.id'], self.block.id)
+        self.assertEqual(block_span.attributes['block.class_id'], 'consumer')
@@ -1,8 +1,22 @@
 import unittest
+from unittest import mock
+
+import flask
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
 
 from dash_building_blocks.util import (
+    SESSION_COOKIE,
+    SESSION_FIELD,
     camelify,
-    decamelify
+    client_key,
+    content_hash,
+    decamelify,
+    enable_sessions
 )
 
 class TestCamelify(unittest.TestCase):
@@ -40,5 +54,98 @@ class TestDeCamelify(unittest.TestCase):
             self.assertEqual(decamelify(camel, delim=delim), decam)
 
 
+class TestClientKey(unittest.TestCase):
+
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+
+        @self.app.route('/key', methods=['GET', 'POST'])
+        def key():
+            return client_key()
+
+    def test_outside_request(self):
+        self.assertEqual(client_key(), '')
+
+    def test_session_cookie(self):
+        client = self.app.test_client()
+        first = client.get('/key')
+        self.assertIn(SESSION_COOKIE, first.headers['Set-Cookie'])
+        second = client.get('/key')
+        self.assertNotIn('Set-Cookie', second.headers)
+        self.assertEqual(first.data, second.data)
+
+    def test_same_address_and_agent(self):
+        # e.g. users behind a NAT or a reverse proxy
+        keys = {self.app.test_client().get(
+                    '/key', headers={'User-Agent': 'agent'},
+                    environ_base={'REMOTE_ADDR': '127.0.0.1'}).data
+                for _ in range(2)}
+        self.assertEqual(len(keys), 2)
+
+    def test_tab(self):
+        client = self.app.test_client()
+        first = client.post('/key', json={SESSION_FIELD: 'one'}).data
+        second = client.post('/key', json={SESSION_FIELD: 'two'}).data
+        self.assertEqual(first, b'tab one')
+        self.assertEqual(second, b'tab two')
+
+    def test_enable_sessions(self):
+        app = mock.Mock()
+        self.assertIs(enable_sessions(app), app)
+        self.assertIn('request_pre', app.renderer)
+        self.assertIn(SESSION_FIELD, app.renderer)
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
+
+
+class TestContentHash(unittest.TestCase):
+
+    def test_stable(self):
+        self.assertEqual(content_hash({'a': 1, 'b': [1, 2]}),
+                         content_hash({'b': [1, 2], 'a': 1}))
+
+    def test_distinct(self):
+        self.assertNotEqual(content_hash([1, 2]), content_hash([2, 1]))
+        self.assertNotEqual(content_hash(''), content_hash(None))
+        self.assertNotEqual(content_hash((1,)), content_hash(('1',)))
+        self.assertNotEqual(content_hash({'a': 'b'}), content_hash(['a', 'b']))
+
+    def test_json_form(self):
+        self.assertEqual(content_hash((1, 'a')), content_hash([1, 'a']))
+        self.assertNotEqual(content_hash({'a': 1}), content_hash({'a': 1.0}))
+        self.assertNotEqual(content_hash({'a': True}), content_hash({'a': 1}))
+
+    @unittest.skipIf(np is None, 'requires numpy and pandas')
+    def test_mixed_buffers(self):
+        array = np.arange(10)
+        self.assertEqual(content_hash({'a': 1, 'y': array}),
+                         content_hash({'y': array.copy(), 'a': 1}))
+        self.assertNotEqual(content_hash({'a': 1, 'y': array}),
+                            content_hash({'a': 1, 'y': array[::-1]}))
+        self.assertNotEqual(content_hash({'y': array}),
+                            content_hash({'y': array.tolist()}))
+
+    def test_mixed_keys(self):
+        self.assertEqual(content_hash({1: 'a', 'b': 2}),
+                         content_hash({'b': 2, 1: 'a'}))
+
+    def test_components(self):
+        import dash_html_components as html
+        self.assertEqual(content_hash(html.Div('a', id='x')),
+                         content_hash(html.Div('a', id='x')))
+        self.assertNotEqual(content_hash(html.Div('a')),
+                            content_hash(html.Div('b')))
+
+    @unittest.skipIf(np is None, 'requires numpy and pandas')
+    def test_buffers(self):
+        array = np.arange(1000, dtype=float)
+        self.assertEqual(content_hash(array), content_hash(array.copy()))
+        self.assertNotEqual(content_hash(array),
+                            content_hash(array.astype('float32')))
+        self.assertNotEqual(content_hash(array), content_hash(array[::-1]))
+        frame = pd.DataFrame({'a': array, 'b': array * 2})
+        self.assertEqual(content_hash(frame), content_hash(frame.copy()))
+        self.assertNotEqual(content_hash(frame),
+                            content_hash(frame.rename(columns={'b': 'c'})))